@@ -27,6 +27,13 @@ import agate
 
 class BigQueryAdapter(PostgresAdapter):
 
+    # tests run as legacy sql, which has no scalar subqueries and only an
+    # approximate count(distinct)
+    SUPPORTS_FUSED_TESTS = False
+
+    # tables are deleted through the API, which never touches other tables
+    DROP_CASCADES = False
+
     context_functions = [
         # deprecated -- use versions that take relations instead
         "query_for_existing",
@@ -187,7 +194,7 @@ class BigQueryAdapter(PostgresAdapter):
         return connection
 
     @classmethod
-    def list_relations(cls, profile, project_cfg, schema, model_name=None):
+    def _list_relations(cls, profile, project_cfg, schema, model_name=None):
         connection = cls.get_connection(profile, model_name)
         client = connection.get('handle')
 
@@ -231,7 +238,7 @@ class BigQueryAdapter(PostgresAdapter):
             model_name)
 
     @classmethod
-    def drop_relation(cls, profile, project_cfg, relation, model_name=None):
+    def _drop_relation(cls, profile, project_cfg, relation, model_name=None):
         conn = cls.get_connection(profile, model_name)
         client = conn.get('handle')
 
@@ -247,8 +254,8 @@ class BigQueryAdapter(PostgresAdapter):
             '`rename` is not implemented for this adapter!')
 
     @classmethod
-    def rename_relation(cls, profile, project_cfg, from_relation, to_relation,
-                        model_name=None):
+    def _rename_relation(cls, profile, project_cfg, from_relation,
+                         to_relation, model_name=None):
         raise dbt.exceptions.NotImplementedException(
             '`rename_relation` is not implemented for this adapter!')
 
@@ -459,7 +466,7 @@ class BigQueryAdapter(PostgresAdapter):
         pass
 
     @classmethod
-    def create_schema(cls, profile, project_cfg, schema, model_name=None):
+    def _create_schema(cls, profile, project_cfg, schema, model_name=None):
         logger.debug('Creating schema "%s".', schema)
 
         conn = cls.get_connection(profile, model_name)
@@ -483,7 +490,7 @@ class BigQueryAdapter(PostgresAdapter):
             client.delete_table(table.reference)
 
     @classmethod
-    def drop_schema(cls, profile, project_cfg, schema, model_name=None):
+    def _drop_schema(cls, profile, project_cfg, schema, model_name=None):
         logger.debug('Dropping schema "%s".', schema)
 
         if not cls.check_schema_exists(profile, project_cfg,
@@ -498,6 +505,10 @@ class BigQueryAdapter(PostgresAdapter):
             cls.drop_tables_in_schema(profile, project_cfg, dataset)
             client.delete_dataset(dataset)
 
+    @classmethod
+    def _create_schemas(cls, profile, project_cfg, schemas):
+        cls._create_schemas_concurrently(profile, project_cfg, schemas)
+
     @classmethod
     def get_existing_schemas(cls, profile, project_cfg, model_name=None):
         conn = cls.get_connection(profile, model_name)
@@ -543,8 +554,8 @@ class BigQueryAdapter(PostgresAdapter):
         return columns
 
     @classmethod
-    def check_schema_exists(cls, profile, project_cfg,
-                            schema, model_name=None):
+    def _check_schema_exists(cls, profile, project_cfg,
+                             schema, model_name=None):
         conn = cls.get_connection(profile, model_name)
         client = conn.get('handle')
 
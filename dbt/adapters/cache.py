@@ -0,0 +1,310 @@
+import re
+import threading
+
+from dbt.logger import GLOBAL_LOGGER as logger
+
+
+def _schema_key(schema):
+    # list_relations matches schemas case-insensitively
+    if schema is None:
+        return None
+    return schema.lower()
+
+
+class RelationsCache(object):
+    """A thread-safe cache of the relations in each schema, scoped to a single
+    run.
+
+    Schemas are listed at most once per run. After that, the cached lists are
+    kept up to date as relations are dropped, renamed and created, so
+    materializations don't have to query the catalog again. Every change to a
+    schema bumps its version, so a listing that raced with a change to the
+    same schema is not cached.
+
+    The cache also remembers which schemas are known to exist (by their exact
+    name in the database), so they don't have to be checked or created again.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.enabled = False
+        self.schemas = {}
+        self.versions = {}
+        self.existing_schemas = set()
+        self.generation = 0
+
+    def enable(self):
+        with self.lock:
+            self.enabled = True
+
+    def clear(self):
+        with self.lock:
+            self.enabled = False
+            self.schemas = {}
+            self.versions = {}
+            self.existing_schemas = set()
+            self.generation += 1
+
+    def _touch(self, key):
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def _get_version(self, key):
+        return (self.generation, self.versions.get(key, 0))
+
+    def get_version(self, schema):
+        with self.lock:
+            return self._get_version(_schema_key(schema))
+
+    def get_relations(self, schema):
+        """Return a list of the cached relations in the schema, or None if the
+        schema isn't cached.
+        """
+        with self.lock:
+            if not self.enabled:
+                return None
+
+            relations = self.schemas.get(_schema_key(schema))
+            if relations is None:
+                return None
+            return list(relations.values())
+
+    def set_relations(self, schema, relations, version=None):
+        """Cache the result of listing the relations in the schema. If version
+        is given and the schema changed since then, the listing may be out of
+        date, so it isn't cached.
+        """
+        with self.lock:
+            if not self.enabled:
+                return
+
+            key = _schema_key(schema)
+            if version is not None and self._get_version(key) != version:
+                logger.debug('Schema "{}" changed while it was being listed, '
+                             'not caching it.'.format(schema))
+                return
+
+            self.schemas[key] = {
+                relation.identifier: relation for relation in relations
+            }
+
+    def add(self, relation):
+        with self.lock:
+            key = _schema_key(relation.schema)
+            self._touch(key)
+
+            if key in self.schemas:
+                self.schemas[key][relation.identifier] = relation
+
+    def drop(self, relation, cascade=False):
+        """Forget the relation. Dropping with cascade also drops the views
+        that depend on it, which can be in any schema, so unless the relation
+        is known not to have existed, every schema is listed again the next
+        time it's needed.
+        """
+        with self.lock:
+            key = _schema_key(relation.schema)
+            self._touch(key)
+
+            relations = self.schemas.get(key)
+            if relations is not None:
+                if relations.pop(relation.identifier, None) is None:
+                    return
+
+            if cascade:
+                self.generation += 1
+                self.schemas = {}
+
+    def rename(self, from_relation, to_relation):
+        with self.lock:
+            self.drop(from_relation)
+            self.add(to_relation)
+
+    def invalidate(self, schema):
+        """Forget everything about the schema. It will be listed again the
+        next time it's needed.
+        """
+        with self.lock:
+            key = _schema_key(schema)
+            self._touch(key)
+            self.schemas.pop(key, None)
+
+    def invalidate_all(self):
+        with self.lock:
+            self.generation += 1
+            self.schemas = {}
+            self.existing_schemas = set()
+
+    def add_schemas(self, schemas):
+        with self.lock:
+            if self.enabled:
+                self.existing_schemas.update(schemas)
+
+    def schema_exists(self, schema):
+        """Return True if the schema is known to exist. False means it's
+        not known, not that it doesn't exist.
+        """
+        with self.lock:
+            return self.enabled and schema in self.existing_schemas
+
+
+# DDL that can change the columns of the relation it names. The relation
+# named in `alter table ... rename to <name>` is covered too, since a stale
+# relation by that name may have been described earlier in the run.
+_DDL_KEYWORDS = re.compile(r'\b(create|alter|drop|rename)\b', re.IGNORECASE)
+_RELATION_NAME = r'((?:"[^"]+"|[\w$]+)(?:\s*\.\s*(?:"[^"]+"|[\w$]+))*)'
+_DDL_TARGETS = re.compile(
+    r'\b(?:(?:create|alter|drop)\s+(?:or\s+replace\s+)?'
+    r'(?:(?:local|global|temporary|temp|transient|unlogged)\s+)*'
+    r'(?:table|view|materialized\s+view)\s+(?:if\s+(?:not\s+)?exists\s+)?'
+    r'|rename\s+to\s+)' + _RELATION_NAME,
+    re.IGNORECASE)
+_NAME_PARTS = re.compile(r'"([^"]+)"|([\w$]+)')
+
+
+_DROP_SCHEMA = re.compile(r'\bdrop\s+(schema|database)\b', re.IGNORECASE)
+
+
+def drops_schema(sql):
+    return _DROP_SCHEMA.search(sql) is not None
+
+
+def _table_key(table):
+    # unquoted and quoted references to the same table can differ in case, so
+    # invalidation is deliberately case-insensitive
+    return table.lower()
+
+
+def get_ddl_targets(sql):
+    """Return the set of table names whose columns the sql may change. An
+    empty set means the sql isn't DDL. None means the sql is DDL, but it's
+    not clear which tables it changes, so every table should be considered
+    changed.
+    """
+    if _DDL_KEYWORDS.search(sql) is None:
+        return set()
+
+    # dropping with cascade can take dependent views down with it
+    if re.search(r'\bcascade\b', sql, re.IGNORECASE):
+        return None
+
+    targets = set()
+    for name in _DDL_TARGETS.findall(sql):
+        quoted, unquoted = _NAME_PARTS.findall(name)[-1]
+        targets.add(_table_key(quoted or unquoted))
+
+    if not targets:
+        return None
+
+    return targets
+
+
+class ColumnsCache(object):
+    """A thread-safe cache of the columns in each table, scoped to a single
+    run.
+
+    Entries are keyed by (database, schema, table), exactly as they were
+    described. DDL run through the adapter invalidates the tables it names,
+    and again when its transaction ends, so no connection can cache columns
+    that were changed by a transaction it couldn't see yet. Every
+    invalidation bumps the version of the tables it names (or the generation,
+    for all of them), so a description that raced with DDL on the same table
+    is not cached.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.enabled = False
+        self.columns = {}
+        self.versions = {}
+        self.generation = 0
+        self.pending = {}
+
+    def enable(self):
+        with self.lock:
+            self.enabled = True
+
+    def clear(self):
+        with self.lock:
+            self.enabled = False
+            self.columns = {}
+            self.pending = {}
+            self.versions = {}
+            self.generation += 1
+
+    def _get_version(self, key):
+        return (self.generation, self.versions.get(key, 0))
+
+    def get_version(self, table):
+        with self.lock:
+            return self._get_version(_table_key(table))
+
+    def get_columns(self, database, schema, table):
+        """Return a list of the cached columns in the table, or None if the
+        table isn't cached.
+        """
+        with self.lock:
+            if not self.enabled:
+                return None
+
+            columns = self.columns.get((database, schema, table))
+            if columns is None:
+                return None
+            return list(columns)
+
+    def set_columns(self, database, schema, table, columns, version):
+        with self.lock:
+            if not self.enabled or \
+               self._get_version(_table_key(table)) != version:
+                return
+
+            self.columns[(database, schema, table)] = list(columns)
+
+    def invalidate(self, tables=None):
+        """Forget the columns of the named tables, in any schema, or of every
+        table if tables is None.
+        """
+        with self.lock:
+            if tables is None:
+                self.generation += 1
+                self.versions = {}
+                self.columns = {}
+                return
+
+            tables = {_table_key(table) for table in tables}
+            for table in tables:
+                self.versions[table] = self.versions.get(table, 0) + 1
+
+            for key in list(self.columns):
+                if _table_key(key[2]) in tables:
+                    del self.columns[key]
+
+    def invalidate_for_sql(self, sql, connection_name=None,
+                           in_transaction=False):
+        """Invalidate the tables that the sql may have changed. If the sql
+        ran inside a transaction on the named connection, invalidate them
+        again when that transaction ends (see end_transaction).
+        """
+        tables = get_ddl_targets(sql)
+        if tables is not None and not tables:
+            return
+
+        with self.lock:
+            self.invalidate(tables)
+
+            if not in_transaction:
+                return
+
+            if connection_name in self.pending:
+                pending = self.pending[connection_name]
+                if pending is None or tables is None:
+                    self.pending[connection_name] = None
+                else:
+                    pending.update(tables)
+            else:
+                self.pending[connection_name] = \
+                    None if tables is None else set(tables)
+
+    def end_transaction(self, connection_name):
+        with self.lock:
+            if connection_name not in self.pending:
+                return
+
+            self.invalidate(self.pending.pop(connection_name))
@@ -1,9 +1,11 @@
 import copy
-import multiprocessing
+import json
+import threading
 import time
 import agate
 
 from contextlib import contextmanager
+from multiprocessing.dummy import Pool as ThreadPool
 
 import dbt.exceptions
 import dbt.flags
@@ -15,18 +17,45 @@ from dbt.logger import GLOBAL_LOGGER as logger
 from dbt.schema import Column
 from dbt.utils import filter_null_values
 
+from dbt.adapters.cache import ColumnsCache, RelationsCache, drops_schema
 from dbt.adapters.default.relation import DefaultRelation
+from dbt.adapters.pool import ConnectionPool
 
 GET_CATALOG_OPERATION_NAME = 'get_catalog_data'
 
-lock = multiprocessing.Lock()
-connections_in_use = {}
-connections_available = []
+pools_lock = threading.Lock()
+connection_pools = {}
+relations_cache = RelationsCache()
+columns_cache = ColumnsCache()
+
+
+def _profile_key(profile):
+    """Return a key for the connection pool of the profile. Every runner gets
+    its own copy of the profile, so the key comes from its contents. That is
+    computed on every query, so it's the sorted items when they're all
+    hashable (they usually are), and only serialized when they aren't.
+    """
+    key = tuple(sorted(item for item in profile.items()
+                       if item[0] not in ('type', 'threads')))
+    try:
+        hash(key)
+    except TypeError:
+        credentials = dict(key)
+        key = json.dumps(credentials, sort_keys=True, default=str)
+    return key
 
 
 class DefaultAdapter(object):
     DEFAULT_QUOTE = True
 
+    # whether schema tests can be fused into a query per model (see
+    # dbt.fused_tests)
+    SUPPORTS_FUSED_TESTS = True
+
+    # whether dropping a relation also drops the views that depend on it
+    # (see _drop_relation), which the relations cache has to forget too
+    DROP_CASCADES = True
+
     requires = {}
 
     context_functions = [
@@ -52,6 +81,9 @@ class DefaultAdapter(object):
         "drop_relation",
         "rename_relation",
         "truncate_relation",
+
+        # seeds
+        "bulk_load_csv_rows",
     ]
 
     profile_functions = [
@@ -122,7 +154,8 @@ class DefaultAdapter(object):
             '`get_existing_schemas` is not implemented for this adapter!')
 
     @classmethod
-    def check_schema_exists(cls, profile, project_cfg, schema):
+    def _check_schema_exists(cls, profile, project_cfg, schema,
+                             model_name=None):
         raise dbt.exceptions.NotImplementedException(
             '`check_schema_exists` is not implemented for this adapter!')
 
@@ -160,6 +193,12 @@ class DefaultAdapter(object):
 
     @classmethod
     def drop_relation(cls, profile, project_cfg, relation, model_name=None):
+        cls._drop_relation(profile, project_cfg, relation, model_name)
+        relations_cache.drop(cls._cache_relation(project_cfg, relation),
+                             cascade=cls.DROP_CASCADES)
+
+    @classmethod
+    def _drop_relation(cls, profile, project_cfg, relation, model_name=None):
         if relation.type is None:
             dbt.exceptions.raise_compiler_error(
                 'Tried to drop relation {}, but its type is null.'
@@ -201,6 +240,20 @@ class DefaultAdapter(object):
     @classmethod
     def rename_relation(cls, profile, project_cfg, from_relation,
                         to_relation, model_name=None):
+        cls._rename_relation(profile, project_cfg, from_relation,
+                             to_relation, model_name)
+
+        from_relation = cls._cache_relation(project_cfg, from_relation)
+        # renames never move relations between schemas, and to_relation often
+        # doesn't have one
+        to_relation = cls._cache_relation(project_cfg, to_relation,
+                                          schema=from_relation.schema,
+                                          relation_type=from_relation.type)
+        relations_cache.rename(from_relation, to_relation)
+
+    @classmethod
+    def _rename_relation(cls, profile, project_cfg, from_relation,
+                         to_relation, model_name=None):
         sql = 'alter table {} rename to {}'.format(
             from_relation, to_relation.include(schema=False))
 
@@ -259,6 +312,20 @@ class DefaultAdapter(object):
     @classmethod
     def get_columns_in_table(cls, profile, project_cfg, schema_name,
                              table_name, database=None, model_name=None):
+        cached = columns_cache.get_columns(database, schema_name, table_name)
+        if cached is not None:
+            return cached
+
+        version = columns_cache.get_version(table_name)
+        columns = cls._get_columns_in_table(profile, project_cfg, schema_name,
+                                            table_name, database, model_name)
+        columns_cache.set_columns(database, schema_name, table_name, columns,
+                                  version)
+        return columns
+
+    @classmethod
+    def _get_columns_in_table(cls, profile, project_cfg, schema_name,
+                              table_name, database=None, model_name=None):
         sql = cls._get_columns_in_table_sql(schema_name, table_name, database)
         connection, cursor = cls.add_query(
             profile, sql, model_name)
@@ -314,9 +381,88 @@ class DefaultAdapter(object):
     ###
     @classmethod
     def list_relations(cls, profile, project_cfg, schema, model_name=None):
+        cached = relations_cache.get_relations(schema)
+        if cached is not None:
+            return cached
+
+        version = relations_cache.get_version(schema)
+        relations = cls._list_relations(profile, project_cfg, schema,
+                                        model_name)
+        relations_cache.set_relations(schema, relations, version)
+
+        return relations
+
+    @classmethod
+    def _list_relations(cls, profile, project_cfg, schema, model_name=None):
         raise dbt.exceptions.NotImplementedException(
             '`list_relations` is not implemented for this adapter!')
 
+    @classmethod
+    def _cache_relation(cls, project_cfg, relation, schema=None,
+                        relation_type=None):
+        """Return the relation the way list_relations would report it, so it
+        can be stored in the relations cache. Unquoted names are folded the
+        same way the database folds them.
+        """
+        if schema is None:
+            schema = relation.schema
+
+        if relation_type is None or relation.type is not None:
+            relation_type = relation.type
+
+        path = cls._make_match_kwargs(project_cfg, schema,
+                                      relation.identifier)
+        return relation.incorporate(path=path, type=relation_type)
+
+    @classmethod
+    def enable_relations_cache(cls):
+        relations_cache.enable()
+
+    @classmethod
+    def clear_relations_cache(cls):
+        relations_cache.clear()
+
+    @classmethod
+    def populate_relations_cache(cls, profile, project_cfg, schemas,
+                                 empty_schemas=()):
+        """List the relations in each of the given schemas into the relations
+        cache. empty_schemas are known to have no relations in them (because
+        they were just created), so they don't have to be queried.
+        """
+        if not relations_cache.enabled:
+            return
+
+        for schema in empty_schemas:
+            relations_cache.set_relations(schema, [])
+
+        for schema in schemas:
+            if schema not in empty_schemas:
+                cls.list_relations(profile, project_cfg, schema)
+
+    @classmethod
+    def cache_new_relation(cls, profile, project_cfg, relation):
+        """Record that a relation was created outside of the adapter methods
+        that keep the relations cache up to date, usually by a
+        materialization. If relation has no type, anything cached about its
+        schema is dropped instead.
+        """
+        if relation.type is None:
+            relations_cache.invalidate(relation.schema)
+        else:
+            relations_cache.add(cls._cache_relation(project_cfg, relation))
+
+    @classmethod
+    def enable_columns_cache(cls):
+        columns_cache.enable()
+
+    @classmethod
+    def clear_columns_cache(cls):
+        columns_cache.clear()
+
+    @classmethod
+    def invalidate_relations_cache(cls, schema):
+        relations_cache.invalidate(schema)
+
     @classmethod
     def _make_match_kwargs(cls, project_cfg, schema, identifier):
         if identifier is not None and \
@@ -385,16 +531,48 @@ class DefaultAdapter(object):
         return profile.get('schema')
 
     @classmethod
-    def get_connection(cls, profile, name=None, recache_if_missing=True):
-        global connections_in_use
+    def get_connection_pool(cls, profile):
+        key = (cls.type(), _profile_key(profile))
 
+        # connections keep a copy of the profile (without the type and the
+        # number of threads) as their credentials, and the limit is only
+        # known from the full profile
+        max_connections = None
+        if 'threads' in profile:
+            # we add a magic number, 2 because there are overhead
+            # connections, one for pre- and post-run hooks and other misc
+            # operations that occur before the run starts, and one for
+            # integration tests.
+            max_connections = profile.get('threads', 1) + 2
+
+        with pools_lock:
+            pool = connection_pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(max_connections or 3)
+                connection_pools[key] = pool
+            elif max_connections is not None:
+                pool.max_connections = max_connections
+
+        return pool
+
+    @classmethod
+    def get_connection_pools(cls):
+        with pools_lock:
+            return [pool for (key, pool) in connection_pools.items()
+                    if key[0] == cls.type()]
+
+    @classmethod
+    def get_connection(cls, profile, name=None, recache_if_missing=True):
         if name is None:
             # if a name isn't specified, we'll re-use a single handle
             # named 'master'
             name = 'master'
 
-        if connections_in_use.get(name):
-            return connections_in_use.get(name)
+        pool = cls.get_connection_pool(profile)
+        connection = pool.get(name)
+
+        if connection is not None:
+            return connection
 
         if not recache_if_missing:
             raise dbt.exceptions.InternalException(
@@ -405,15 +583,13 @@ class DefaultAdapter(object):
                      .format(cls.type(), name))
 
         connection = cls.acquire_connection(profile, name)
-        connections_in_use[name] = connection
-
-        return cls.get_connection(profile, name)
+        return pool.put(name, connection)
 
     @classmethod
     def cancel_open_connections(cls, profile):
-        global connections_in_use
+        pool = cls.get_connection_pool(profile)
 
-        for name, connection in connections_in_use.items():
+        for name, connection in pool.in_use_items():
             if name == 'master':
                 continue
 
@@ -422,94 +598,101 @@ class DefaultAdapter(object):
 
     @classmethod
     def total_connections_allocated(cls):
-        global connections_in_use, connections_available
+        return sum(pool.allocated for pool in cls.get_connection_pools())
 
-        return len(connections_in_use) + len(connections_available)
+    @classmethod
+    def get_connection_stats(cls):
+        """Return the counters of every connection pool for this adapter,
+        added together.
+        """
+        totals = {}
+        for pool in cls.get_connection_pools():
+            for key, value in pool.stats().items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
 
     @classmethod
-    def acquire_connection(cls, profile, name):
-        global connections_available, lock
+    def is_connection_alive(cls, connection):
+        """Cheaply check (without a round trip to the database) that an idle
+        connection can still be used.
+        """
+        return connection.get('state') == 'open'
 
-        # we add a magic number, 2 because there are overhead connections,
-        # one for pre- and post-run hooks and other misc operations that occur
-        # before the run starts, and one for integration tests.
-        max_connections = profile.get('threads', 1) + 2
+    @classmethod
+    def _open_new_connection(cls, profile, name):
+        credentials = copy.deepcopy(profile)
 
-        try:
-            lock.acquire()
-            num_allocated = cls.total_connections_allocated()
-
-            if len(connections_available) > 0:
-                logger.debug('Re-using an available connection from the pool.')
-                to_return = connections_available.pop()
-                to_return['name'] = name
-                return to_return
-
-            elif num_allocated >= max_connections:
-                raise dbt.exceptions.InternalException(
-                    'Tried to request a new connection "{}" but '
-                    'the maximum number of connections are already '
-                    'allocated!'.format(name))
-
-            logger.debug('Opening a new connection ({} currently allocated)'
-                         .format(num_allocated))
-
-            credentials = copy.deepcopy(profile)
-
-            credentials.pop('type', None)
-            credentials.pop('threads', None)
-
-            result = {
-                'type': cls.type(),
-                'name': name,
-                'state': 'init',
-                'transaction_open': False,
-                'handle': None,
-                'credentials': credentials
-            }
-
-            if dbt.flags.STRICT_MODE:
-                Connection(**result)
-
-            return cls.open_connection(result)
-        finally:
-            lock.release()
+        credentials.pop('type', None)
+        credentials.pop('threads', None)
+
+        result = {
+            'type': cls.type(),
+            'name': name,
+            'state': 'init',
+            'transaction_open': False,
+            'handle': None,
+            'credentials': credentials
+        }
+
+        if dbt.flags.STRICT_MODE:
+            Connection(**result)
+
+        return cls.open_connection(result)
 
     @classmethod
-    def release_connection(cls, profile, name='master'):
-        global connections_in_use, connections_available, lock
+    def acquire_connection(cls, profile, name):
+        pool = cls.get_connection_pool(profile)
 
-        if connections_in_use.get(name) is None:
-            return
+        return pool.acquire(
+            name,
+            lambda name: cls._open_new_connection(profile, name),
+            cls.is_connection_alive,
+            cls.close)
 
-        to_release = cls.get_connection(profile, name,
-                                        recache_if_missing=False)
+    @classmethod
+    def warm_up_connections(cls, profile, count):
+        """Open up to count connections concurrently, ahead of the nodes
+        that will use them. Return the time it took, in seconds.
+        """
+        pool = cls.get_connection_pool(profile)
 
-        try:
-            lock.acquire()
+        started = time.time()
+        opened = pool.warm_up(
+            count, lambda name: cls._open_new_connection(profile, name))
+        elapsed = time.time() - started
+
+        logger.debug('Warmed up {} {} connections in {:0.2f}s'
+                     .format(opened, cls.type(), elapsed))
+        return elapsed
+
+    @classmethod
+    def release_connection(cls, profile, name='master'):
+        pool = cls.get_connection_pool(profile)
+        to_release = pool.get(name)
 
-            if to_release.get('state') == 'open':
+        if to_release is None:
+            return
 
-                if to_release.get('transaction_open') is True:
-                    cls.rollback(to_release)
+        if to_release.get('state') == 'open' and \
+           to_release.get('transaction_open') is True:
+            cls.rollback(to_release)
 
-                to_release['name'] = None
-                connections_available.append(to_release)
-            else:
-                cls.close(to_release)
+        to_close = pool.release(name)
 
-            del connections_in_use[name]
-        finally:
-            lock.release()
+        if to_close is not None:
+            cls.close(to_close)
+            pool.discard(to_close)
 
     @classmethod
     def cleanup_connections(cls):
-        global connections_in_use, connections_available, lock
+        with pools_lock:
+            keys = [key for key in connection_pools if key[0] == cls.type()]
+            pools = [connection_pools.pop(key) for key in keys]
 
-        try:
-            lock.acquire()
+        for pool in pools:
+            in_use, idle = pool.drain()
 
-            for name, connection in connections_in_use.items():
+            for name, connection in in_use.items():
                 if connection.get('state') != 'closed':
                     logger.debug("Connection '{}' was left open."
                                  .format(name))
@@ -517,16 +700,13 @@ class DefaultAdapter(object):
                     logger.debug("Connection '{}' was properly closed."
                                  .format(name))
 
-            conns_in_use = list(connections_in_use.values())
-            for conn in conns_in_use + connections_available:
+            for conn in list(in_use.values()) + idle:
                 cls.close(conn)
 
-            # garbage collect these connections
-            connections_in_use = {}
-            connections_available = []
-
-        finally:
-            lock.release()
+            stats = pool.stats()
+            logger.debug('Connection pool: {opens} opened, {reuses} reused, '
+                         '{closes} closed, {acquire_wait:0.2f}s spent '
+                         'acquiring connections.'.format(**stats))
 
     @classmethod
     def reload(cls, connection):
@@ -543,7 +723,6 @@ class DefaultAdapter(object):
 
     @classmethod
     def begin(cls, profile, name='master'):
-        global connections_in_use
         connection = cls.get_connection(profile, name)
 
         if dbt.flags.STRICT_MODE:
@@ -557,18 +736,15 @@ class DefaultAdapter(object):
         cls.add_begin_query(profile, name)
 
         connection['transaction_open'] = True
-        connections_in_use[name] = connection
 
         return connection
 
     @classmethod
     def commit_if_has_connection(cls, profile, name):
-        global connections_in_use
-
         if name is None:
             name = 'master'
 
-        if connections_in_use.get(name) is None:
+        if cls.get_connection_pool(profile).get(name) is None:
             return
 
         connection = cls.get_connection(profile, name, False)
@@ -577,8 +753,6 @@ class DefaultAdapter(object):
 
     @classmethod
     def commit(cls, profile, connection):
-        global connections_in_use
-
         if dbt.flags.STRICT_MODE:
             Connection(**connection)
 
@@ -591,9 +765,9 @@ class DefaultAdapter(object):
 
         logger.debug('On {}: COMMIT'.format(connection.get('name')))
         cls.add_commit_query(profile, connection.get('name'))
+        columns_cache.end_transaction(connection.get('name'))
 
         connection['transaction_open'] = False
-        connections_in_use[connection.get('name')] = connection
 
         return connection
 
@@ -611,9 +785,9 @@ class DefaultAdapter(object):
 
         logger.debug('On {}: ROLLBACK'.format(connection.get('name')))
         connection.get('handle').rollback()
+        columns_cache.end_transaction(connection.get('name'))
 
         connection['transaction_open'] = False
-        connections_in_use[connection.get('name')] = connection
 
         return connection
 
@@ -647,7 +821,14 @@ class DefaultAdapter(object):
             pre = time.time()
 
             cursor = connection.get('handle').cursor()
-            cursor.execute(sql, bindings)
+            try:
+                cursor.execute(sql, bindings)
+            finally:
+                columns_cache.invalidate_for_sql(
+                    sql, connection_name,
+                    connection['transaction_open'] is True)
+                if drops_schema(sql):
+                    relations_cache.invalidate_all()
 
             logger.debug("SQL status: %s in %0.2f seconds",
                          cls.get_status(cursor), (time.time() - pre))
@@ -697,8 +878,34 @@ class DefaultAdapter(object):
 
         return connection
 
+    @classmethod
+    def _database_schema_name(cls, project_cfg, schema):
+        # the name the database will store the schema under
+        return cls._make_match_kwargs(project_cfg, schema, None)['schema']
+
+    @classmethod
+    def check_schema_exists(cls, profile, project_cfg, schema,
+                            model_name=None):
+        if relations_cache.schema_exists(
+                cls._database_schema_name(project_cfg, schema)):
+            return True
+
+        return cls._check_schema_exists(profile, project_cfg, schema,
+                                        model_name)
+
     @classmethod
     def create_schema(cls, profile, project_cfg, schema, model_name=None):
+        name = cls._database_schema_name(project_cfg, schema)
+        if relations_cache.schema_exists(name):
+            logger.debug('Schema "%s" already exists.', schema)
+            return
+
+        res = cls._create_schema(profile, project_cfg, schema, model_name)
+        relations_cache.add_schemas([name])
+        return res
+
+    @classmethod
+    def _create_schema(cls, profile, project_cfg, schema, model_name=None):
         logger.debug('Creating schema "%s".', schema)
         sql = cls.get_create_schema_sql(project_cfg, schema)
         res = cls.add_query(profile, sql, model_name)
@@ -707,8 +914,65 @@ class DefaultAdapter(object):
 
         return res
 
+    @classmethod
+    def create_schemas(cls, profile, project_cfg, schemas):
+        """Create the schemas that don't exist yet, and return them. The
+        existing schemas are remembered in the relations cache, so they
+        aren't checked or created again during the run.
+        """
+        existing_schemas = set(cls.get_existing_schemas(profile, project_cfg))
+        relations_cache.add_schemas(existing_schemas)
+
+        missing_schemas = set(
+            schema for schema in schemas
+            if cls._database_schema_name(project_cfg, schema)
+            not in existing_schemas)
+
+        if missing_schemas:
+            cls._create_schemas(profile, project_cfg, sorted(missing_schemas))
+            relations_cache.add_schemas(
+                cls._database_schema_name(project_cfg, schema)
+                for schema in missing_schemas)
+
+        return missing_schemas
+
+    @classmethod
+    def _create_schemas(cls, profile, project_cfg, schemas):
+        # create all of the schemas in one transaction
+        logger.debug('Creating schemas %s.', ', '.join(schemas))
+        sql = ';\n'.join([cls.get_create_schema_sql(project_cfg, schema)
+                          for schema in schemas])
+        cls.add_query(profile, sql)
+        cls.commit_if_has_connection(profile, None)
+
+    @classmethod
+    def _create_schemas_concurrently(cls, profile, project_cfg, schemas):
+        """Create each schema on its own connection, for adapters that can't
+        create schemas in a single transaction.
+        """
+        def create_schema(schema):
+            name = 'create_schema_{}'.format(schema)
+            try:
+                cls._create_schema(profile, project_cfg, schema, name)
+            finally:
+                cls.release_connection(profile, name)
+
+        pool = ThreadPool(max(min(profile.get('threads', 1), len(schemas)),
+                              1))
+        try:
+            pool.map(create_schema, schemas)
+        finally:
+            pool.close()
+            pool.join()
+
     @classmethod
     def drop_schema(cls, profile, project_cfg, schema, model_name=None):
+        res = cls._drop_schema(profile, project_cfg, schema, model_name)
+        relations_cache.invalidate_all()
+        return res
+
+    @classmethod
+    def _drop_schema(cls, profile, project_cfg, schema, model_name=None):
         logger.debug('Dropping schema "%s".', schema)
         sql = cls.get_drop_schema_sql(project_cfg, schema)
         return cls.add_query(profile, sql, model_name)
@@ -775,6 +1039,23 @@ class DefaultAdapter(object):
         raise dbt.exceptions.NotImplementedException(
             '`convert_time_type` is not implemented for this adapter!')
 
+    @classmethod
+    def bulk_load_csv_rows(cls, profile, project_cfg, relation, agate_table,
+                           model_name=None):
+        """Load the rows of a seed into the (existing) relation using the
+        fastest method the database offers, and return the sql used. Return
+        None if the adapter has no such method, or if it failed, in which
+        case the rows are inserted in batches instead.
+        """
+        return None
+
+    @classmethod
+    def log_rows_loaded(cls, relation, num_rows, method, elapsed):
+        rate = num_rows / elapsed if elapsed > 0 else float(num_rows)
+        logger.debug('Loaded {} rows into {} with {} in {:0.2f}s '
+                     '({:0.0f} rows/s)'.format(num_rows, relation, method,
+                                               elapsed, rate))
+
     @classmethod
     def convert_type(cls, agate_table, col_idx):
         return cls.convert_agate_type(agate_table, col_idx)
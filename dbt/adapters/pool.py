@@ -0,0 +1,267 @@
+import threading
+import time
+
+import dbt.exceptions
+
+from dbt.logger import GLOBAL_LOGGER as logger
+
+
+def _current_thread():
+    return threading.current_thread().ident
+
+
+class ConnectionPool(object):
+    """A thread-safe pool of the connections for one adapter and profile.
+
+    Connections in use are keyed by name (usually the name of the node being
+    run), so materializations can keep looking their connection up by
+    model_name. Released connections are pinned to the thread that released
+    them, and that thread gets the same connection back the next time it
+    needs one. Connections opened ahead of time by warm_up() go to the first
+    threads that need one. Idle connections are only handed to another thread
+    when no new connection can be opened.
+
+    The pool doesn't know how to open, check or close connections itself;
+    the adapter passes those functions in. Counters for opens, reuses,
+    closes and the time spent acquiring connections are kept in stats().
+    """
+    def __init__(self, max_connections):
+        self.lock = threading.RLock()
+        self.warmed = threading.Condition(self.lock)
+        self.max_connections = max_connections
+        self.in_use = {}
+        self.idle = {}
+        self.warm = []
+        self.warming = 0
+        self.allocated = 0
+
+        self.opens = 0
+        self.reuses = 0
+        self.closes = 0
+        self.acquires = 0
+        self.acquire_wait = 0.0
+
+    def get(self, name):
+        with self.lock:
+            return self.in_use.get(name)
+
+    def put(self, name, connection):
+        """Mark the connection as in use under the given name, and return it.
+        If another thread already put a connection under that name, return
+        that one instead, and keep the given connection for later.
+        """
+        with self.lock:
+            existing = self.in_use.get(name)
+            if existing is not None:
+                self._add_idle(connection)
+                return existing
+
+            self.in_use[name] = connection
+            return connection
+
+    def in_use_items(self):
+        with self.lock:
+            return list(self.in_use.items())
+
+    def _add_idle(self, connection):
+        connection['name'] = None
+        self.idle.setdefault(_current_thread(), []).append(connection)
+
+    def _pop_warm(self):
+        if self.warm:
+            return self.warm.pop()
+        return None
+
+    def _pop_idle(self, thread=None):
+        if thread is not None:
+            connections = self.idle.get(thread)
+            if connections:
+                return connections.pop()
+            return None
+
+        for connections in self.idle.values():
+            if connections:
+                return connections.pop()
+        return None
+
+    def _discard(self, connection, close):
+        try:
+            close(connection)
+        except Exception as e:
+            logger.debug('Error closing connection: {}'.format(e))
+
+        with self.lock:
+            self.allocated -= 1
+            self.closes += 1
+
+    def _reuse(self, pop, is_alive, close):
+        while True:
+            with self.lock:
+                connection = pop()
+            if connection is None:
+                return None
+
+            if is_alive(connection):
+                with self.lock:
+                    self.reuses += 1
+                return connection
+
+            logger.debug('Discarding a connection that is no longer open.')
+            self._discard(connection, close)
+
+    def _reserve(self, count):
+        """Reserve up to count connection slots, so connections can be opened
+        without holding the lock, and return the number reserved.
+        """
+        with self.lock:
+            reserved = max(min(count,
+                               self.max_connections - self.allocated), 0)
+            self.allocated += reserved
+            return reserved
+
+    def _open(self, name, open_connection):
+        try:
+            connection = open_connection(name)
+        except Exception:
+            with self.lock:
+                self.allocated -= 1
+            raise
+
+        with self.lock:
+            self.opens += 1
+
+        return connection
+
+    def warm_up(self, count, open_connection):
+        """Open connections concurrently until count of them are idle, and
+        keep them for whichever threads ask for a connection first. Return
+        the number of connections opened. Errors are logged, not raised:
+        the connection will be opened (and fail) again when it's needed.
+        """
+        with self.lock:
+            idle = len(self.warm) + sum(
+                len(connections) for connections in self.idle.values())
+            reserved = self._reserve(count - idle)
+            self.warming += reserved
+
+        opened = []
+
+        def open_one():
+            connection = None
+            try:
+                connection = self._open(None, open_connection)
+                connection['name'] = None
+            except Exception as e:
+                logger.debug('Error opening a connection during warm-up: '
+                             '{}'.format(e))
+            finally:
+                with self.lock:
+                    if connection is not None:
+                        self.warm.append(connection)
+                        opened.append(connection)
+                    self.warming -= 1
+                    self.warmed.notify_all()
+
+        threads = [threading.Thread(target=open_one)
+                   for _ in range(reserved)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return len(opened)
+
+    def acquire(self, name, open_connection, is_alive, close):
+        """Return a connection for the given name. It is not marked as in use
+        until it's passed to put(). If the pool is full, but warm_up() is
+        still opening connections, wait for one of those.
+        """
+        started = time.time()
+        thread = _current_thread()
+
+        try:
+            while True:
+                connection = self._reuse(lambda: self._pop_idle(thread),
+                                         is_alive, close)
+
+                if connection is None:
+                    connection = self._reuse(self._pop_warm, is_alive, close)
+
+                if connection is None and self._reserve(1):
+                    logger.debug('Opening a new connection ({} currently '
+                                 'allocated)'.format(self.allocated - 1))
+                    connection = self._open(name, open_connection)
+
+                if connection is None:
+                    connection = self._reuse(self._pop_idle, is_alive, close)
+
+                if connection is not None:
+                    connection['name'] = name
+                    return connection
+
+                with self.lock:
+                    if self.warming == 0 and not self.warm:
+                        raise dbt.exceptions.InternalException(
+                            'Tried to request a new connection "{}" but '
+                            'the maximum number of connections are already '
+                            'allocated!'.format(name))
+
+                    if not self.warm:
+                        self.warmed.wait(1.0)
+
+        finally:
+            with self.lock:
+                self.acquires += 1
+                self.acquire_wait += time.time() - started
+
+    def release(self, name):
+        """Stop using the named connection. If it can be reused, keep it for
+        the current thread and return None. Otherwise return it, so the
+        caller can close it.
+        """
+        with self.lock:
+            connection = self.in_use.pop(name, None)
+            if connection is None:
+                return None
+
+            if connection.get('state') == 'open':
+                self._add_idle(connection)
+                return None
+
+        return connection
+
+    def discard(self, connection):
+        with self.lock:
+            self.allocated -= 1
+            self.closes += 1
+
+    def drain(self):
+        """Remove every connection from the pool, and return the connections
+        in use (by name) and the idle connections, so they can be closed.
+        """
+        with self.lock:
+            in_use = self.in_use
+            idle = [connection
+                    for connections in self.idle.values()
+                    for connection in connections] + self.warm
+
+            self.in_use = {}
+            self.idle = {}
+            self.warm = []
+            self.closes += self.allocated
+            self.allocated = 0
+
+            return in_use, idle
+
+    def stats(self):
+        with self.lock:
+            return {
+                'allocated': self.allocated,
+                'in_use': len(self.in_use),
+                'opens': self.opens,
+                'reuses': self.reuses,
+                'closes': self.closes,
+                'acquires': self.acquires,
+                'acquire_wait': self.acquire_wait,
+            }
@@ -1,8 +1,10 @@
 import psycopg2
+import time
 
 from contextlib import contextmanager
 
 import dbt.adapters.default
+import dbt.clients.agate_helper
 import dbt.compat
 import dbt.exceptions
 import agate
@@ -56,6 +58,12 @@ class PostgresAdapter(dbt.adapters.default.DefaultAdapter):
     def get_credentials(cls, credentials):
         return credentials
 
+    @classmethod
+    def is_connection_alive(cls, connection):
+        handle = connection.get('handle')
+        return connection.get('state') == 'open' and \
+            handle is not None and handle.closed == 0
+
     @classmethod
     def open_connection(cls, connection):
         if connection.get('state') == 'open':
@@ -112,6 +120,45 @@ class PostgresAdapter(dbt.adapters.default.DefaultAdapter):
 
         logger.debug("Cancel query '{}': {}".format(connection_name, res))
 
+    @classmethod
+    def bulk_load_csv_rows(cls, profile, project_cfg, relation, agate_table,
+                           model_name=None):
+        """Stream the rows into the relation with COPY. The copy runs in a
+        savepoint, so if the database rejects any of the values, it can be
+        rolled back and the rows inserted instead.
+        """
+        connection = cls.get_connection(profile, model_name)
+        connection_name = connection.get('name')
+
+        if connection['transaction_open'] is False:
+            cls.begin(profile, connection_name)
+
+        sql = 'copy {} ({}) from stdin with csv'.format(
+            relation.render(False), ', '.join(agate_table.column_names))
+
+        with cls.exception_handler(profile, sql, model_name,
+                                   connection_name):
+            logger.debug('On %s: %s', connection_name, sql)
+            pre = time.time()
+
+            cursor = connection.get('handle').cursor()
+            cursor.execute('savepoint dbt_copy_csv_rows')
+
+            try:
+                cursor.copy_expert(
+                    sql, dbt.clients.agate_helper.CsvRowsReader(agate_table))
+            except psycopg2.DatabaseError as e:
+                logger.debug('Copy into {} failed, inserting rows instead: '
+                             '{}'.format(relation, str(e).strip()))
+                cursor.execute('rollback to savepoint dbt_copy_csv_rows')
+                return None
+
+            cursor.execute('release savepoint dbt_copy_csv_rows')
+
+        cls.log_rows_loaded(relation, len(agate_table.rows), 'copy',
+                            time.time() - pre)
+        return sql
+
     # DATABASE INSPECTION FUNCTIONS
     # These require the profile AND project, as they need to know
     # database-specific configs at the project level.
@@ -146,7 +193,7 @@ class PostgresAdapter(dbt.adapters.default.DefaultAdapter):
         return connection, cursor
 
     @classmethod
-    def list_relations(cls, profile, project, schema, model_name=None):
+    def _list_relations(cls, profile, project, schema, model_name=None):
         sql = """
         select tablename as name, schemaname as schema, 'table' as type from pg_tables
         where schemaname ilike '{schema}'
@@ -182,7 +229,7 @@ class PostgresAdapter(dbt.adapters.default.DefaultAdapter):
         return [row[0] for row in results]
 
     @classmethod
-    def check_schema_exists(cls, profile, project, schema, model_name=None):
+    def _check_schema_exists(cls, profile, project, schema, model_name=None):
         sql = """
         select count(*) from pg_namespace where nspname = '{schema}'
         """.format(schema=schema).strip()  # noqa
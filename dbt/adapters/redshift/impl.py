@@ -1,4 +1,7 @@
 import multiprocessing
+import time
+
+import psycopg2
 
 from dbt.adapters.postgres import PostgresAdapter
 from dbt.logger import GLOBAL_LOGGER as logger  # noqa
@@ -12,6 +15,9 @@ class RedshiftAdapter(PostgresAdapter):
 
     DEFAULT_TCP_KEEPALIVE = 240
 
+    # statements are limited to 16MB, so leave plenty of room
+    MAX_INSERT_BYTES = 8 * 1024 * 1024
+
     @classmethod
     def type(cls):
         return 'redshift'
@@ -197,6 +203,58 @@ class RedshiftAdapter(PostgresAdapter):
         finally:
             drop_lock.release()
 
+    @classmethod
+    def bulk_load_csv_rows(cls, profile, project_cfg, relation, agate_table,
+                           model_name=None):
+        """Redshift can't COPY from the client, so insert the rows in
+        multi-row statements instead, each holding as many rows as fit in
+        MAX_INSERT_BYTES rather than a fixed number of rows.
+
+        Redshift doesn't support savepoints, so the statements are all built
+        before any of them are run: if a value can't be bound, nothing has
+        been sent yet and the rows can be inserted the default way instead.
+        """
+        connection = cls.get_connection(profile, model_name)
+        cursor = connection.get('handle').cursor()
+
+        prefix = 'insert into {} ({}) values\n'.format(
+            relation.render(False), ', '.join(agate_table.column_names))
+        placeholders = '({})'.format(
+            ', '.join(['%s'] * len(agate_table.column_names)))
+
+        pre = time.time()
+        statements = []
+        values = []
+        size = len(prefix)
+
+        try:
+            for row in agate_table.rows:
+                value = cursor.mogrify(placeholders, tuple(row))
+
+                if values and size + len(value) > cls.MAX_INSERT_BYTES:
+                    statements.append(prefix + ',\n'.join(values))
+                    values = []
+                    size = len(prefix)
+
+                values.append(value.decode('utf-8'))
+                size += len(value) + 2
+        except psycopg2.DatabaseError as e:
+            logger.debug('Batching inserts into {} failed, inserting rows '
+                         'instead: {}'.format(relation, str(e).strip()))
+            return None
+
+        if values:
+            statements.append(prefix + ',\n'.join(values))
+
+        for sql in statements:
+            cls.add_query(profile, sql, model_name, abridge_sql_log=True)
+
+        cls.log_rows_loaded(relation, len(agate_table.rows),
+                            '{} inserts'.format(len(statements)),
+                            time.time() - pre)
+
+        return prefix + placeholders
+
     @classmethod
     def convert_text_type(cls, agate_table, col_idx):
         column = agate_table.columns[col_idx]
@@ -1,6 +1,10 @@
 from __future__ import absolute_import
 
+import os
 import re
+import shutil
+import tempfile
+import time
 from io import StringIO
 
 import snowflake.connector
@@ -8,6 +12,7 @@ import snowflake.connector.errors
 
 from contextlib import contextmanager
 
+import dbt.clients.agate_helper
 import dbt.compat
 import dbt.exceptions
 
@@ -71,6 +76,12 @@ class SnowflakeAdapter(PostgresAdapter):
 
         return "{} {}".format(state, cursor.rowcount)
 
+    @classmethod
+    def is_connection_alive(cls, connection):
+        handle = connection.get('handle')
+        return connection.get('state') == 'open' and \
+            handle is not None and not handle.is_closed()
+
     @classmethod
     def open_connection(cls, connection):
         if connection.get('state') == 'open':
@@ -107,7 +118,7 @@ class SnowflakeAdapter(PostgresAdapter):
         return result
 
     @classmethod
-    def list_relations(cls, profile, project_cfg, schema, model_name=None):
+    def _list_relations(cls, profile, project_cfg, schema, model_name=None):
         sql = """
         select
           table_name as name, table_schema as schema, table_type as type
@@ -137,8 +148,8 @@ class SnowflakeAdapter(PostgresAdapter):
                 for (name, _schema, type) in results]
 
     @classmethod
-    def rename_relation(cls, profile, project_cfg, from_relation,
-                        to_relation, model_name=None):
+    def _rename_relation(cls, profile, project_cfg, from_relation,
+                         to_relation, model_name=None):
         sql = 'alter table {} rename to {}'.format(
             from_relation, to_relation)
 
@@ -148,6 +159,12 @@ class SnowflakeAdapter(PostgresAdapter):
     def add_begin_query(cls, profile, name):
         return cls.add_query(profile, 'BEGIN', name, auto_begin=False)
 
+    @classmethod
+    def _create_schemas(cls, profile, project_cfg, schemas):
+        # each DDL statement is its own transaction on snowflake, so there's
+        # nothing to gain from sending them all down one connection
+        cls._create_schemas_concurrently(profile, project_cfg, schemas)
+
     @classmethod
     def get_existing_schemas(cls, profile, project_cfg, model_name=None):
         sql = "select distinct schema_name from information_schema.schemata"
@@ -159,8 +176,8 @@ class SnowflakeAdapter(PostgresAdapter):
         return [row[0] for row in results]
 
     @classmethod
-    def check_schema_exists(cls, profile, project_cfg,
-                            schema, model_name=None):
+    def _check_schema_exists(cls, profile, project_cfg,
+                             schema, model_name=None):
         sql = """
         select count(*)
         from information_schema.schemata
@@ -220,6 +237,80 @@ class SnowflakeAdapter(PostgresAdapter):
 
         return connection, cursor
 
+    @classmethod
+    def _write_csv_rows(cls, agate_table, path):
+        reader = dbt.clients.agate_helper.CsvRowsReader(agate_table)
+
+        with open(path, 'wb') as fp:
+            while True:
+                chunk = reader.read(64 * 1024)
+                if not chunk:
+                    break
+                if dbt.compat.WHICH_PYTHON == 3:
+                    chunk = chunk.encode('utf-8')
+                fp.write(chunk)
+
+    @classmethod
+    def bulk_load_csv_rows(cls, profile, project_cfg, relation, agate_table,
+                           model_name=None):
+        """Write the rows to a csv file, PUT it (compressed) into the stage of
+        the relation, and load it with a single COPY INTO, which purges the
+        staged file once it's loaded.
+        """
+        connection = cls.get_connection(profile, model_name)
+        connection_name = connection.get('name')
+
+        if connection['transaction_open'] is False:
+            cls.begin(profile, connection_name)
+
+        stage = '@{}.%{}'.format(
+            relation.quote_if(relation.schema,
+                              relation.should_quote('schema')),
+            relation.quote_if(relation.identifier,
+                              relation.should_quote('identifier')))
+
+        sql = ("copy into {} ({}) from {} files = ('dbt_seed.csv.gz') "
+               "file_format = (type = csv "
+               "field_optionally_enclosed_by = '\"' "
+               "empty_field_as_null = true null_if = ()) "
+               "purge = true").format(relation.render(False),
+                                      ', '.join(agate_table.column_names),
+                                      stage)
+
+        tmpdir = tempfile.mkdtemp()
+        path = os.path.join(tmpdir, 'dbt_seed.csv')
+
+        try:
+            pre = time.time()
+            cls._write_csv_rows(agate_table, path)
+
+            put_sql = "put 'file://{}' {} auto_compress = true " \
+                      "overwrite = true".format(path.replace('\\', '/'),
+                                                stage)
+
+            with cls.exception_handler(profile, sql, model_name,
+                                       connection_name):
+                cursor = connection.get('handle').cursor()
+
+                logger.debug('On %s: %s', connection_name, put_sql)
+                cursor.execute(put_sql)
+
+                logger.debug('On %s: %s', connection_name, sql)
+                try:
+                    cursor.execute(sql)
+                except snowflake.connector.errors.DatabaseError as e:
+                    logger.debug('Copy into {} failed, inserting rows '
+                                 'instead: {}'.format(relation, e))
+                    cursor.execute('remove {}'.format(stage))
+                    return None
+
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+        cls.log_rows_loaded(relation, len(agate_table.rows), 'copy into',
+                            time.time() - pre)
+        return sql
+
     @classmethod
     def _make_match_kwargs(cls, project_cfg, schema, identifier):
         if identifier is not None and \
@@ -2,6 +2,8 @@ import copy
 from collections import Mapping
 from jsonschema import Draft4Validator
 
+import dbt.flags
+
 from dbt.exceptions import JSONValidationException
 from dbt.utils import deep_merge
 
@@ -36,6 +38,34 @@ class APIObject(Mapping):
         self._contents = deep_merge(self.DEFAULTS, kwargs)
         self.validate()
 
+    @classmethod
+    def from_trusted(cls, **kwargs):
+        """
+        Create an instance from contents that dbt built itself out of objects
+        that were already validated. The contents are not validated again
+        unless dbt is running in strict mode, and not deep copied: top-level
+        dicts and lists are copied, so setting and appending to them doesn't
+        change the caller's, but everything below them (and any APIObject,
+        like a result's node) is shared. Keys given here replace the
+        DEFAULTS rather than being merged into them.
+
+        This doesn't call __init__, so subclasses that do more than pass
+        kwargs through should override it too. Anything read from a project
+        or from disk should use the constructor instead.
+        """
+        obj = cls.__new__(cls)
+        obj._contents = copy.deepcopy(cls.DEFAULTS)
+
+        for key, value in kwargs.items():
+            if isinstance(value, (dict, list)):
+                value = copy.copy(value)
+            obj._contents[key] = value
+
+        if dbt.flags.STRICT_MODE:
+            obj.validate()
+
+        return obj
+
     def __str__(self):
         return '{}(**{})'.format(self.__class__.__name__, self._contents)
 
@@ -56,6 +86,13 @@ class APIObject(Mapping):
         """
         return copy.deepcopy(self._contents)
 
+    def serialize_json(self, encode):
+        """
+        Return the json encoding of the dict representation of this object,
+        using the encode function. Unlike serialize, this doesn't copy it.
+        """
+        return encode(self._contents)
+
     @classmethod
     def deserialize(cls, settings):
         """
@@ -64,17 +101,35 @@ class APIObject(Mapping):
         """
         return cls(**settings)
 
+    @classmethod
+    def get_validator(cls):
+        """
+        Return a validator for the SCHEMA property. Building one is costly,
+        so it's built once per class. Contents are validated without being
+        serialized, so nested APIObjects count as objects.
+        """
+        validator = cls.__dict__.get('_validator')
+        if validator is None or validator.schema is not cls.SCHEMA:
+            validator = Draft4Validator(cls.SCHEMA,
+                                        types={'object': (dict, Mapping)})
+            cls._validator = validator
+        return validator
+
     def validate(self):
         """
         Using the SCHEMA property, validate the attributes
         of this instance. If any attributes are missing or
-        invalid, raise a ValidationException.
+        invalid, raise a ValidationException. The contents are validated as
+        they are, without being copied.
         """
-        validator = Draft4Validator(self.SCHEMA)
+        self._validate(self._contents)
+
+    def _validate(self, contents):
+        validator = self.get_validator()
 
         errors = set()  # make errors a set to avoid duplicates
 
-        for error in validator.iter_errors(self.serialize()):
+        for error in validator.iter_errors(contents):
             errors.add('.'.join(
                 list(map(str, error.path)) + [error.message]
             ))
@@ -1,6 +1,11 @@
 
+import datetime
+import re
+
 import agate
 
+import dbt.compat
+
 DEFAULT_TYPE_TESTER = agate.TypeTester(types=[
     agate.data_types.Boolean(true_values=('true',),
                              false_values=('false',),
@@ -40,5 +45,178 @@ def as_matrix(table):
     return [r.values() for r in table.rows.values()]
 
 
-def from_csv(abspath):
-    return agate.Table.from_csv(abspath, column_types=DEFAULT_TYPE_TESTER)
+# The number of values in a column that are tested against a type before the
+# rest of the column is (see infer_column_type)
+DEFAULT_SAMPLE_SIZE = 1000
+
+# Each pattern matches a whole column of values (joined by newlines) that all
+# cast to the type, though not every such column. Nulls match too.
+_NULL = r'[^\S\n]*[Nn][Uu][Ll][Ll][^\S\n]*'
+
+_ISO_DATE = (
+    r'\d{4}-(?:'
+    r'(?:0[1-9]|1[0-2])-(?:0[1-9]|1\d|2\d)|'
+    r'(?:0[13-9]|1[0-2])-30|'
+    r'(?:0[13578]|1[02])-31'
+    r')'
+)
+
+
+def _column_pattern(value_pattern):
+    value = r'(?:{}|{})'.format(_NULL, value_pattern)
+    return re.compile(r'{value}(?:\n{value})*\Z'.format(value=value))
+
+
+BOOLEAN_COLUMN = _column_pattern(r'[Tt][Rr][Uu][Ee]|[Ff][Aa][Ll][Ss][Ee]')
+NUMBER_COLUMN = _column_pattern(
+    r'-?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?')
+ISO_DATE_COLUMN = _column_pattern(_ISO_DATE)
+
+ISO_DATE_FORMAT = '%Y-%m-%d'
+
+
+def _is_iso_date(value):
+    try:
+        datetime.datetime.strptime(value.strip(), ISO_DATE_FORMAT)
+    except ValueError:
+        return False
+    return True
+
+
+def _confirm_column_type(column_type, values, joined):
+    """Check the whole column (joined by newlines) against a pattern for the
+    type, without casting its values one by one. Return the type to use for
+    the column, or None if the values didn't all match (they might still all
+    cast).
+    """
+    if joined is None:
+        return None
+
+    if isinstance(column_type, agate.data_types.Boolean):
+        if BOOLEAN_COLUMN.match(joined):
+            return column_type
+
+    elif isinstance(column_type, agate.data_types.Number):
+        if NUMBER_COLUMN.match(joined):
+            return column_type
+
+    elif isinstance(column_type, agate.data_types.Date):
+        # the pattern can't tell which years are leap years
+        if ISO_DATE_COLUMN.match(joined) and \
+           all(_is_iso_date(v) for v in values if '-02-29' in v):
+            # let agate cast the dates with strptime, too
+            return agate.data_types.Date(date_format=ISO_DATE_FORMAT,
+                                         null_values=column_type.null_values)
+
+    return None
+
+
+def infer_column_type(values, sample_size=DEFAULT_SAMPLE_SIZE,
+                      type_tester=DEFAULT_TYPE_TESTER):
+    """Infer the type of a column of csv values, with the same outcome as
+    type_tester: the first of its types that every value casts to.
+
+    Each type is first checked against the whole column at once with a
+    regex where there's one for it. Failing that, the first sample_size
+    values are cast to the type, which rules most types out after a value or
+    two, and only if they all cast is the rest of the column cast too.
+    """
+    joined = '\n'.join(values)
+    # a value with a newline in it would look like two values
+    if joined.count('\n') != len(values) - 1:
+        joined = None
+
+    possible_types = list(type_tester._possible_types)
+    fallback = possible_types.pop()
+
+    for column_type in possible_types:
+        confirmed = _confirm_column_type(column_type, values, joined)
+        if confirmed is not None:
+            return confirmed
+
+        if not all(column_type.test(v) for v in values[:sample_size]):
+            continue
+
+        if all(column_type.test(v) for v in values[sample_size:]):
+            return column_type
+
+    return fallback
+
+
+def _read_csv_rows(abspath):
+    if dbt.compat.WHICH_PYTHON == 2:
+        with open(abspath, 'rb') as fp:
+            return list(agate.csv.reader(fp, encoding='utf-8'))
+    else:
+        with open(abspath, encoding='utf-8') as fp:
+            return list(agate.csv.reader(fp))
+
+
+def from_csv(abspath, column_types=None, sample_size=DEFAULT_SAMPLE_SIZE):
+    """Load a csv file as an agate table, inferring the types of its columns
+    with infer_column_type. Columns in column_types (the column_types config
+    of a seed) are left as text without being tested, as the database will
+    be casting them anyway.
+    """
+    rows = _read_csv_rows(abspath)
+    if not rows:
+        return agate.Table([], column_names=[])
+
+    column_names = rows.pop(0)
+    column_types = column_types or {}
+    text = agate.data_types.Text(null_values=('null',))
+
+    types = []
+    for index, name in enumerate(column_names):
+        if name in column_types:
+            types.append(text)
+            continue
+
+        values = [row[index] for row in rows if len(row) > index]
+        types.append(infer_column_type(values, sample_size))
+
+    return agate.Table(rows, column_names, types)
+
+
+class CsvRowsReader(object):
+    """A file-like object that reads the rows of an agate table as csv,
+    rendering them as they're read rather than all at once. Nulls are written
+    as unquoted empty fields and every other value is quoted, so that nulls
+    and empty strings can be told apart.
+    """
+    def __init__(self, table):
+        self.rows = iter(table.rows)
+        self.pending = ''
+
+    def _format(self, value):
+        if value is None:
+            return ''
+
+        value = dbt.compat.to_string(value)
+        return '"' + value.replace('"', '""') + '"'
+
+    def _render_row(self, row):
+        rendered = ','.join(self._format(value) for value in row) + '\n'
+        if dbt.compat.WHICH_PYTHON == 2:
+            rendered = rendered.encode('utf-8')
+        return rendered
+
+    def read(self, size=-1):
+        chunks = [self.pending]
+        length = len(self.pending)
+
+        while size < 0 or length < size:
+            row = next(self.rows, None)
+            if row is None:
+                break
+            rendered = self._render_row(row)
+            chunks.append(rendered)
+            length += len(rendered)
+
+        data = ''.join(chunks)
+        if size < 0:
+            self.pending = ''
+            return data
+
+        self.pending = data[size:]
+        return data[:size]
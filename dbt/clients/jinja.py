@@ -1,5 +1,12 @@
+import glob
+import os
+import threading
+import time
+from collections import OrderedDict
+
 import jinja2
 import jinja2._compat
+import jinja2.bccache
 import jinja2.ext
 import jinja2.nodes
 import jinja2.parser
@@ -7,6 +14,9 @@ import jinja2.sandbox
 
 import dbt.compat
 import dbt.exceptions
+import dbt.utils
+import dbt.version
+import dbt.clients.system
 
 from dbt.node_types import NodeType
 from dbt.utils import AttrDict
@@ -38,19 +48,78 @@ class MacroFuzzEnvironment(jinja2.sandbox.SandboxedEnvironment):
         ).parse()
 
 
+class MacroContext(dict):
+    """A node context that counts the changes made to it, so that macros
+    bound to it know when the template module they were built from is out of
+    date (see macro_generator).
+    """
+    def __init__(self, *args, **kwargs):
+        super(MacroContext, self).__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        self.version += 1
+        super(MacroContext, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.version += 1
+        super(MacroContext, self).__delitem__(key)
+
+    def update(self, *args, **kwargs):
+        self.version += 1
+        super(MacroContext, self).update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        self.version += 1
+        return super(MacroContext, self).setdefault(key, default)
+
+    def pop(self, *args):
+        self.version += 1
+        return super(MacroContext, self).pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super(MacroContext, self).popitem()
+
+    def clear(self):
+        self.version += 1
+        super(MacroContext, self).clear()
+
+
 def macro_generator(template, node):
     def apply_context(context):
-        def call(*args, **kwargs):
+        # executing the template module runs the whole macro file and copies
+        # the context, so for a MacroContext, only do it again when the
+        # context has changed. Other contexts can't tell, so the module is
+        # built on every call.
+        bound = {}
+
+        def get_macro():
+            version = getattr(context, 'version', None)
+            if version is not None and bound.get('version') == version:
+                return bound['macro']
+
             name = node.get('name')
             module = template.make_module(
                 context, False, context)
 
             if node['resource_type'] == NodeType.Operation:
-                macro = module.__dict__[dbt.utils.get_dbt_operation_name(name)]
+                macro_name = dbt.utils.get_dbt_operation_name(name)
             else:
-                macro = module.__dict__[dbt.utils.get_dbt_macro_name(name)]
+                macro_name = dbt.utils.get_dbt_macro_name(name)
+
+            macro = module.__dict__[macro_name]
             module.__dict__.update(context)
 
+            if version is not None:
+                bound['macro'] = macro
+                bound['version'] = version
+
+            return macro
+
+        def call(*args, **kwargs):
+            macro = get_macro()
+
             try:
                 return macro(*args, **kwargs)
             except dbt.exceptions.MacroReturn as e:
@@ -141,54 +210,202 @@ class DocumentationExtension(jinja2.ext.Extension):
         return node
 
 
-def create_macro_capture_env(node):
+class ParserMacroCapture(jinja2.Undefined):
+    """
+    This class sets up the parser to capture macros.
+    """
+    def __init__(self, hint=None, obj=None, name=None,
+                 exc=None):
+        super(jinja2.Undefined, self).__init__()
 
-    class ParserMacroCapture(jinja2.Undefined):
-        """
-        This class sets up the parser to capture macros.
-        """
-        def __init__(self, hint=None, obj=None, name=None,
-                     exc=None):
-            super(jinja2.Undefined, self).__init__()
+        self.name = name
+        self.package_name = None
 
-            self.node = node
-            self.name = name
-            self.package_name = node.get('package_name')
+    def __getattr__(self, name):
 
-        def __getattr__(self, name):
+        # jinja uses these for safety, so we have to override them.
+        # see https://github.com/pallets/jinja/blob/master/jinja2/sandbox.py#L332-L339 # noqa
+        if name in ['unsafe_callable', 'alters_data']:
+            return False
 
-            # jinja uses these for safety, so we have to override them.
-            # see https://github.com/pallets/jinja/blob/master/jinja2/sandbox.py#L332-L339 # noqa
-            if name in ['unsafe_callable', 'alters_data']:
-                return False
+        self.package_name = self.name
+        self.name = name
 
-            self.package_name = self.name
-            self.name = name
+        return self
 
-            return self
+    def __call__(self, *args, **kwargs):
+        return True
 
-        def __call__(self, *args, **kwargs):
-            return True
 
-    return ParserMacroCapture
+# Environments are stateless apart from their configuration, so we keep one
+# per undefined mode and share it across every template we build.
+_environments = {}
 
 
-def get_template(string, ctx, node=None, capture_macros=False):
-    try:
+class CompiledCodeCache(object):
+    """A thread-safe cache of compiled template code that holds at most
+    max_size entries, dropping the least recently used ones first.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            code = self.entries.pop(key, None)
+            if code is not None:
+                self.entries[key] = code
+            return code
+
+    def set(self, key, code):
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = code
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+# Compiled template code, keyed by undefined mode and template source.
+_compiled_code = CompiledCodeCache(max_size=4096)
+
+# An optional on-disk cache of compiled templates, so that repeated
+# invocations can skip jinja compilation too. See initialize_bytecode_cache.
+_bytecode_cache = None
+
+# Entries in the on-disk cache that haven't been used for this long are
+# removed when the cache is initialized.
+BYTECODE_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+# Compiled code depends on the dbt and jinja versions as well as the source,
+# so both are part of every entry's name and file name.
+_VERSIONS_HASH = dbt.utils.md5('{}-{}'.format(
+    dbt.version.__version__, jinja2.__version__))[:12]
+
+
+def get_environment(capture_macros=False):
+    env = _environments.get(capture_macros)
+
+    if env is None:
         args = {
-            'extensions': []
+            'extensions': [
+                MaterializationExtension,
+                OperationExtension,
+                DocumentationExtension,
+            ]
         }
 
         if capture_macros:
-            args['undefined'] = create_macro_capture_env(node)
-
-        args['extensions'].append(MaterializationExtension)
-        args['extensions'].append(OperationExtension)
-        args['extensions'].append(DocumentationExtension)
+            args['undefined'] = ParserMacroCapture
 
         env = MacroFuzzEnvironment(**args)
+        _environments[capture_macros] = env
+
+    return env
+
+
+def initialize_bytecode_cache(path):
+    """Store compiled templates under the given directory. Entries are keyed
+    by a hash of their source and of the dbt and jinja versions, so stale
+    entries are never used. Entries from other versions, and entries that
+    haven't been used recently, are removed.
+    """
+    global _bytecode_cache
+
+    dbt.clients.system.make_directory(path)
+    _bytecode_cache = jinja2.bccache.FileSystemBytecodeCache(
+        path, '__jinja2_{}_%s.cache'.format(_VERSIONS_HASH))
+    _prune_bytecode_cache(path)
+
+
+def _prune_bytecode_cache(path):
+    current_prefix = os.path.join(path, '__jinja2_{}_'.format(_VERSIONS_HASH))
+    expires = time.time() - BYTECODE_CACHE_MAX_AGE
+
+    for filename in glob.glob(os.path.join(path, '__jinja2_*.cache')):
+        try:
+            if not filename.startswith(current_prefix) or \
+               os.path.getmtime(filename) < expires:
+                os.remove(filename)
+        except (IOError, OSError) as e:
+            logger.debug('Could not prune the jinja bytecode cache: {}'
+                         .format(e))
+
+
+def _get_bytecode_name(env, source, capture_macros):
+    mode = 'capture' if capture_macros else 'strict'
+    extensions = ','.join(sorted(env.extensions))
+
+    return '{}-{}-{}-{}'.format(mode, _VERSIONS_HASH,
+                                dbt.utils.md5(extensions),
+                                dbt.utils.md5(source))
+
+
+def _load_bucket(env, source, capture_macros):
+    name = _get_bytecode_name(env, source, capture_macros)
+
+    try:
+        bucket = _bytecode_cache.get_bucket(env, name, None, source)
+        if bucket.code is not None:
+            # mark the entry as used, so it isn't pruned
+            os.utime(os.path.join(_bytecode_cache.directory,
+                                  _bytecode_cache.pattern % bucket.key),
+                     None)
+        return bucket
+    except (IOError, OSError) as e:
+        logger.debug('Could not read from the jinja bytecode cache: {}'
+                     .format(e))
+        return None
+
+
+def _store_bucket(bucket):
+    try:
+        _bytecode_cache.set_bucket(bucket)
+    except (IOError, OSError) as e:
+        logger.debug('Could not write to the jinja bytecode cache: {}'
+                     .format(e))
+
+
+def compile_source(env, source, capture_macros=False):
+    """Compile the given template source to python code, reusing the result
+    of a previous compilation of the same source when one is available.
+    """
+    cache_key = (capture_macros, source)
+    code = _compiled_code.get(cache_key)
+
+    if code is not None:
+        return code
+
+    bucket = None
+
+    if _bytecode_cache is not None:
+        bucket = _load_bucket(env, source, capture_macros)
+
+    if bucket is not None and bucket.code is not None:
+        code = bucket.code
+    else:
+        code = env.compile(source)
+
+        if bucket is not None:
+            bucket.code = code
+            _store_bucket(bucket)
+
+    _compiled_code.set(cache_key, code)
+    return code
+
+
+def get_template(string, ctx, node=None, capture_macros=False):
+    try:
+        env = get_environment(capture_macros)
+        source = dbt.compat.to_string(string)
+        code = compile_source(env, source, capture_macros)
 
-        return env.from_string(dbt.compat.to_string(string), globals=ctx)
+        return env.template_class.from_code(env, code,
+                                            env.make_globals(ctx), None)
 
     except (jinja2.exceptions.TemplateSyntaxError,
             jinja2.exceptions.UndefinedError) as e:
@@ -123,6 +123,16 @@ def write_json(path, data):
     return write_file(path, json.dumps(data, cls=dbt.utils.JSONEncoder))
 
 
+def write_file_chunks(path, chunks):
+    """Write the chunks of text to path one at a time, so the contents of
+    the file never have to be held in memory all at once.
+    """
+    make_directory(os.path.dirname(path))
+    dbt.compat.write_file_chunks(path, chunks)
+
+    return True
+
+
 def _windows_rmdir_readonly(func, path, exc):
     exception_val = exc[1]
     if exception_val.errno == errno.EACCES:
@@ -18,8 +18,12 @@ else:
 
 if WHICH_PYTHON == 2:
     from SimpleHTTPServer import SimpleHTTPRequestHandler
+    from collections import Mapping
+    import Queue as queue
 else:
     from http.server import SimpleHTTPRequestHandler
+    from collections.abc import Mapping
+    import queue
 
 
 def to_unicode(s):
@@ -51,3 +55,14 @@ def write_file(path, s):
     else:
         with open(path, 'w') as f:
             return f.write(to_string(s))
+
+
+def write_file_chunks(path, chunks):
+    if WHICH_PYTHON == 2:
+        f = codecs.open(path, 'w', encoding='utf-8')
+    else:
+        f = open(path, 'w')
+
+    with f:
+        for chunk in chunks:
+            f.write(to_string(chunk))
@@ -13,6 +13,7 @@ from dbt.utils import get_materialization, NodeType, is_type
 
 from dbt.linker import Linker
 
+import dbt.clients.jinja
 import dbt.compat
 import dbt.context.runtime
 import dbt.contracts.project
@@ -21,11 +22,12 @@ import dbt.flags
 import dbt.loader
 from dbt.contracts.graph.compiled import CompiledNode, CompiledGraph
 
-from dbt.clients.system import write_json
+from dbt.clients.system import write_file_chunks
 from dbt.logger import GLOBAL_LOGGER as logger
 
 graph_file_name = 'graph.gpickle'
 manifest_file_name = 'manifest.json'
+jinja_cache_dir_name = 'jinja_cache'
 
 
 def print_compile_stats(stats):
@@ -102,6 +104,8 @@ class Compiler(object):
     def initialize(self):
         dbt.clients.system.make_directory(self.project['target-path'])
         dbt.clients.system.make_directory(self.project['modules-path'])
+        dbt.clients.jinja.initialize_bytecode_cache(
+            os.path.join(self.project['target-path'], jinja_cache_dir_name))
 
     def compile_node(self, node, manifest):
         logger.debug("Compiling {}".format(node.get('unique_id')))
@@ -114,7 +118,7 @@ class Compiler(object):
             'extra_ctes': [],
             'injected_sql': None,
         })
-        compiled_node = CompiledNode(**data)
+        compiled_node = CompiledNode.from_trusted(**data)
 
         context = dbt.context.runtime.generate(
             compiled_node, self.project, manifest)
@@ -163,7 +167,8 @@ class Compiler(object):
         """
         filename = manifest_file_name
         manifest_path = os.path.join(self.project['target-path'], filename)
-        write_json(manifest_path, manifest.serialize())
+        write_file_chunks(manifest_path, manifest.serialize_chunks(
+            dbt.utils.get_json_encoder()))
 
     def write_graph_file(self, linker):
         filename = graph_file_name
@@ -173,9 +178,7 @@ class Compiler(object):
     def link_node(self, linker, node, manifest):
         linker.add_node(node.unique_id)
 
-        linker.update_node_data(
-            node.unique_id,
-            node.to_dict())
+        linker.update_node_data(node.unique_id, node)
 
         for dependency in node.depends_on_nodes:
             if manifest.nodes.get(dependency):
@@ -2,7 +2,7 @@ import json
 import os
 
 from dbt.adapters.factory import get_adapter
-from dbt.compat import basestring
+from dbt.compat import basestring, Mapping
 from dbt.node_types import NodeType
 from dbt.contracts.graph.parsed import ParsedMacro, ParsedNode
 
@@ -72,33 +72,69 @@ class DatabaseWrapper(object):
             self.profile, self.model.get('name'))
 
 
-def _add_macros(context, model, manifest):
-    macros_to_add = {'global': [], 'local': []}
+class MacroNamespace(Mapping):
+    """A package's macros, as seen from a single context. Macros are bound to
+    the context the first time they are looked up, and the bound function is
+    reused for every later lookup.
+    """
+    def __init__(self, macros, context):
+        self._macros = macros
+        self._context = context
+        self._bound = {}
+
+    def __getitem__(self, name):
+        bound = self._bound.get(name)
+
+        if bound is None:
+            bound = self._macros[name].generator(self._context)
+            self._bound[name] = bound
+
+        return bound
+
+    def __iter__(self):
+        return iter(self._macros)
+
+    def __len__(self):
+        return len(self._macros)
 
-    for unique_id, macro in manifest.macros.items():
-        if macro.resource_type != NodeType.Macro:
-            continue
-        package_name = macro.package_name
 
-        macro_map = {
-            macro.name: macro.generator(context)
-        }
+class LazyMacro(object):
+    """An unprefixed macro in the context. The underlying macro is only bound
+    when it is first called.
+    """
+    def __init__(self, namespace, name):
+        self.namespace = namespace
+        self.name = name
+
+    def __call__(self, *args, **kwargs):
+        return self.namespace[self.name](*args, **kwargs)
 
-        if context.get(package_name) is None:
-            context[package_name] = {}
 
-        context.get(package_name, {}) \
-               .update(macro_map)
+def _add_macros(context, model, manifest):
+    macros_by_package = manifest.get_macros_by_package()
+    namespaces = {}
+
+    for package_name, package_macros in macros_by_package.items():
+        namespace = MacroNamespace(package_macros, context)
+        namespaces[package_name] = namespace
 
-        if package_name == model.package_name:
-            macros_to_add['local'].append(macro_map)
-        elif package_name == dbt.include.GLOBAL_PROJECT_NAME:
-            macros_to_add['global'].append(macro_map)
+        existing = context.get(package_name)
+        if existing is None:
+            context[package_name] = namespace
+        else:
+            existing.update(
+                (name, namespace[name]) for name in package_macros
+            )
 
     # Load global macros before local macros -- local takes precedence
-    unprefixed_macros = macros_to_add['global'] + macros_to_add['local']
-    for macro_map in unprefixed_macros:
-        context.update(macro_map)
+    for package_name in (dbt.include.GLOBAL_PROJECT_NAME,
+                         model.package_name):
+        namespace = namespaces.get(package_name)
+        if namespace is None:
+            continue
+
+        for name in namespace:
+            context[name] = LazyMacro(namespace, name)
 
     return context
 
@@ -426,6 +462,9 @@ def modify_generated_context(context, model, model_dict, project_cfg,
 
     # we make a copy of the context for each of these ^^
 
+    # from here on, the context is changed in place, and bound macros have to
+    # see the changes
+    context = dbt.clients.jinja.MacroContext(context)
     context = _add_macros(context, model, manifest)
 
     context["write"] = write(model_dict, project_cfg.get('target-path'), 'run')
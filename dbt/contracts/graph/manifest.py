@@ -3,10 +3,11 @@ from dbt.contracts.graph.unparsed import UNPARSED_NODE_CONTRACT
 from dbt.contracts.graph.parsed import PARSED_NODE_CONTRACT, \
     PARSED_MACRO_CONTRACT, PARSED_DOCUMENTATION_CONTRACT, ParsedNode
 from dbt.contracts.graph.compiled import COMPILED_NODE_CONTRACT, CompiledNode
-from dbt.exceptions import ValidationException
+from dbt.exceptions import ValidationException, raise_duplicate_resource_name
 from dbt.node_types import NodeType
 from dbt.logger import GLOBAL_LOGGER as logger
 from dbt import tracking
+import dbt.exceptions
 import dbt.utils
 
 # We allow either parsed or compiled nodes, as some 'compile()' calls in the
@@ -153,6 +154,59 @@ def build_edges(nodes):
     return _sort_values(forward_edges), _sort_values(backward_edges)
 
 
+class NameIndex(object):
+    """An index of a manifest subgraph by name, and by (package, name).
+
+    Each entry is a list of (resource_type, unique_id) pairs in the order they
+    were added, so lookups return the same match a scan over the subgraph
+    would. Unique IDs are resolved against the subgraph at lookup time, which
+    means nodes can be replaced in the subgraph without touching the index.
+    """
+    def __init__(self, has_resource_type=True):
+        self.has_resource_type = has_resource_type
+        self.by_name = {}
+        self.by_package = {}
+        self.size = 0
+
+    def _split_unique_id(self, unique_id, value):
+        parts = unique_id.split('.')
+
+        if not self.has_resource_type:
+            if len(parts) != 2:
+                msg = "documentation names cannot contain '.' characters"
+                dbt.exceptions.raise_compiler_error(msg, value)
+            return (None,) + tuple(parts)
+
+        if len(parts) != 3:
+            node_type = value.get('resource_type', 'node')
+            msg = "{} names cannot contain '.' characters".format(node_type)
+            dbt.exceptions.raise_compiler_error(msg, value)
+        return tuple(parts)
+
+    def add(self, unique_id, value):
+        resource_type, package_name, name = self._split_unique_id(unique_id,
+                                                                  value)
+        entry = (resource_type, unique_id)
+        self.by_name.setdefault(name, []).append(entry)
+        self.by_package.setdefault((package_name, name), []).append(entry)
+        self.size += 1
+
+    def find(self, subgraph, name, package=None, nodetypes=None):
+        """Find the first entry in the subgraph with the given name, in the
+        given package (or any package, if package is None), with one of the
+        given resource types (or any type, if nodetypes is None).
+        """
+        if package is None:
+            candidates = self.by_name.get(name, ())
+        else:
+            candidates = self.by_package.get((package, name), ())
+
+        for resource_type, unique_id in candidates:
+            if nodetypes is None or resource_type in nodetypes:
+                return subgraph[unique_id]
+        return None
+
+
 class Manifest(APIObject):
     SCHEMA = PARSED_MANIFEST_CONTRACT
     """The manifest for the full graph, after parsing and during compilation.
@@ -172,6 +226,9 @@ class Manifest(APIObject):
         self.docs = docs
         self.generated_at = generated_at
         self.metadata = metadata
+        # indexes are built on first use, see _get_name_index
+        self._name_indexes = {}
+        self._macros_by_package = None
         super(Manifest, self).__init__()
 
     @staticmethod
@@ -193,6 +250,10 @@ class Manifest(APIObject):
             'send_anonymous_usage_stats': send_anonymous_usage_stats,
         }
 
+    def validate(self):
+        # the manifest's contents are its attributes, not _contents
+        self._validate(self.serialize())
+
     def serialize(self):
         """Convert the parsed manifest to a nested dict structure that we can
         safely serialize to JSON.
@@ -209,6 +270,61 @@ class Manifest(APIObject):
             'metadata': self.metadata,
         }
 
+    def serialize_chunks(self, encode):
+        """Generate the json encoding of serialize() in pieces, using encode
+        to encode each value. Nodes, macros and docs are encoded one at a time
+        without being copied, so the manifest is never held in memory twice.
+        """
+        forward_edges, backward_edges = build_edges(self.nodes.values())
+
+        yield '{'
+        for key in ('nodes', 'macros', 'docs'):
+            yield '{}: {{'.format(encode(key))
+            for i, (unique_id, value) in enumerate(
+                    getattr(self, key).items()):
+                if i > 0:
+                    yield ', '
+                yield '{}: {}'.format(encode(unique_id),
+                                      value.serialize_json(encode))
+            yield '}, '
+
+        yield ', '.join('{}: {}'.format(encode(key), encode(value))
+                        for key, value in (
+                            ('parent_map', backward_edges),
+                            ('child_map', forward_edges),
+                            ('generated_at', self.generated_at),
+                            ('metadata', self.metadata),
+                        ))
+        yield '}'
+
+    def _get_subgraph(self, subgraph):
+        if subgraph == 'nodes':
+            return self.nodes
+        elif subgraph == 'macros':
+            return self.macros
+        elif subgraph == 'docs':
+            return self.docs
+        raise NotImplementedError(
+            'subgraph search for {} not implemented'.format(subgraph)
+        )
+
+    def _get_name_index(self, subgraph):
+        """Get the name index for the given subgraph, building it if it does
+        not exist yet. add_nodes keeps the nodes index up to date, but some
+        callers add entries to the subgraphs directly, so the index is also
+        rebuilt if its size no longer matches.
+        """
+        search = self._get_subgraph(subgraph)
+        index = self._name_indexes.get(subgraph)
+
+        if index is None or index.size != len(search):
+            index = NameIndex(has_resource_type=(subgraph != 'docs'))
+            for unique_id, value in search.items():
+                index.add(unique_id, value)
+            self._name_indexes[subgraph] = index
+
+        return index
+
     def _find_by_name(self, name, package, subgraph, nodetype):
         """
 
@@ -216,32 +332,12 @@ class Manifest(APIObject):
         None, all pacakges will be searched.
         nodetype should be a list of NodeTypes to accept.
         """
-        if subgraph == 'nodes':
-            search = self.nodes
-        elif subgraph == 'macros':
-            search = self.macros
-        else:
-            raise NotImplementedError(
-                'subgraph search for {} not implemented'.format(subgraph)
-            )
-        return dbt.utils.find_in_subgraph_by_name(
-            search,
-            name,
-            package,
-            nodetype)
+        index = self._get_name_index(subgraph)
+        return index.find(self._get_subgraph(subgraph), name, package,
+                          nodetype)
 
     def find_docs_by_name(self, name, package=None):
-        for unique_id, doc in self.docs.items():
-            parts = unique_id.split('.')
-            if len(parts) != 2:
-                msg = "documentation names cannot contain '.' characters"
-                dbt.exceptions.raise_compiler_error(msg, doc)
-
-            found_package, found_node = parts
-
-            if (name == found_node and package in {None, found_package}):
-                return doc
-        return None
+        return self._find_by_name(name, package, 'docs', None)
 
     def find_operation_by_name(self, name, package):
         """Find a macro in the graph by its name and package name, or None for
@@ -262,6 +358,26 @@ class Manifest(APIObject):
         """
         return self._find_by_name(name, package, 'nodes', NodeType.refable())
 
+    def get_macros_by_package(self):
+        """Return the macros (but not operations) grouped by package, as a
+        dict of package name to a dict of macro name to macro. The grouping
+        is built on first use: macros aren't added to a manifest after it's
+        built.
+        """
+        if self._macros_by_package is None:
+            macros_by_package = {}
+            for macro in self.macros.values():
+                if macro.resource_type != NodeType.Macro:
+                    continue
+
+                package_macros = macros_by_package.setdefault(
+                    macro.package_name, {})
+                package_macros[macro.name] = macro
+
+            self._macros_by_package = macros_by_package
+
+        return self._macros_by_package
+
     def get_materialization_macro(self, materialization_name,
                                   adapter_type=None):
         macro_name = dbt.utils.get_materialization_macro_name(
@@ -324,18 +440,21 @@ class Manifest(APIObject):
                 raise_duplicate_resource_name(node, self.nodes[unique_id])
             self.nodes[unique_id] = node
 
+            index = self._name_indexes.get('nodes')
+            if index is not None:
+                index.add(unique_id, node)
+
     def patch_nodes(self, patches):
         """Patch nodes with the given dict of patches. Note that this consumes
         the input!
         """
-        # because we don't have any mapping from node _names_ to nodes, and we
-        # only have the node name in the patch, we have to iterate over all the
-        # nodes looking for matching names. We could use _find_by_name if we
-        # were ok with doing an O(n*m) search (one nodes scan per patch)
-        for node in self.nodes.values():
-            if node.resource_type != NodeType.Model:
+        # patches only have the node name, so look them up by name in any
+        # package
+        for name in list(patches):
+            node = self._find_by_name(name, None, 'nodes', [NodeType.Model])
+            if node is None:
                 continue
-            patch = patches.pop(node.name, None)
+            patch = patches.pop(name)
             if not patch:
                 continue
             node.patch(patch)
@@ -232,6 +232,13 @@ PARSED_NODE_CONTRACT = deep_merge(
                     'In seeds, the path to the source file used during build.'
                 ),
             },
+            'seed_hash': {
+                'type': 'string',
+                'description': (
+                    'In seeds, the sha256 hash of the contents of the csv '
+                    'file.'
+                ),
+            },
             'column_name': {
                 'type': 'string',
                 'description': (
@@ -257,6 +264,14 @@ class ParsedNode(APIObject):
         kwargs.setdefault('description', '')
         super(ParsedNode, self).__init__(**kwargs)
 
+    @classmethod
+    def from_trusted(cls, agate_table=None, **kwargs):
+        kwargs.setdefault('columns', {})
+        kwargs.setdefault('description', '')
+        node = super(ParsedNode, cls).from_trusted(**kwargs)
+        node.agate_table = agate_table
+        return node
+
     @property
     def depends_on_nodes(self):
         """Return the list of node IDs that this node depends on."""
@@ -1,3 +1,5 @@
+import dbt.flags
+
 from dbt.api.object import APIObject
 from dbt.utils import deep_merge
 from dbt.contracts.graph.manifest import COMPILE_RESULT_NODE_CONTRACT
@@ -44,7 +46,8 @@ def named_property(name, doc=None):
 
     def set_prop(self, value):
         self._contents[name] = value
-        self.validate()
+        if dbt.flags.STRICT_MODE:
+            self.validate()
 
     return property(get_prop, set_prop, doc=doc)
 
@@ -58,6 +61,13 @@ class RunModelResult(APIObject):
                                              status=status, fail=failed,
                                              execution_time=execution_time)
 
+    @classmethod
+    def from_trusted(cls, node, error=None, skip=False, status=None,
+                     failed=None, execution_time=0):
+        return super(RunModelResult, cls).from_trusted(
+            node=node, error=error, skip=skip, status=status, fail=failed,
+            execution_time=execution_time)
+
     # these all get set after the fact, generally
     error = named_property('error',
                            'If there was an error, the text of that error')
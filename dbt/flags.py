@@ -1,11 +1,16 @@
 STRICT_MODE = False
 NON_DESTRUCTIVE = False
 FULL_REFRESH = False
+PARTIAL_PARSE = False
+USE_RELATIONS_CACHE = True
 
 
 def reset():
-    global STRICT_MODE, NON_DESTRUCTIVE, FULL_REFRESH
+    global STRICT_MODE, NON_DESTRUCTIVE, FULL_REFRESH, PARTIAL_PARSE, \
+        USE_RELATIONS_CACHE
 
     STRICT_MODE = False
     NON_DESTRUCTIVE = False
     FULL_REFRESH = False
+    PARTIAL_PARSE = False
+    USE_RELATIONS_CACHE = True
@@ -0,0 +1,226 @@
+import ast
+import re
+import threading
+
+import dbt.exceptions
+import dbt.utils
+
+from dbt.compat import basestring
+from dbt.logger import GLOBAL_LOGGER as logger
+from dbt.node_types import NodeType
+
+
+FUSABLE_TESTS = ('not_null', 'unique', 'accepted_values')
+
+# schema tests are rendered by dbt.parser.schemas.build_test_raw_sql
+SCHEMA_TEST_SQL = re.compile(r'^\{\{ test_(\w+)\((.*)\) \}\}$', re.DOTALL)
+
+
+def parse_schema_test(raw_sql):
+    """Parse the raw sql of a built-in schema test into its type and its
+    arguments (other than the model). Return None if the test can't be
+    parsed, or if any of its arguments aren't literals.
+    """
+    match = SCHEMA_TEST_SQL.match(raw_sql.strip())
+    if match is None:
+        return None
+
+    test_type, args = match.groups()
+
+    try:
+        call = ast.parse('test({})'.format(args), mode='eval').body
+    except SyntaxError:
+        return None
+
+    kwargs = {}
+    for keyword in call.keywords:
+        if keyword.arg == 'model':
+            continue
+
+        try:
+            kwargs[keyword.arg] = ast.literal_eval(keyword.value)
+        except ValueError:
+            return None
+
+    return test_type, kwargs
+
+
+def get_fusable_test(node):
+    """Return a dict describing the schema test node if it can be fused with
+    the other tests on its model, or None.
+    """
+    if 'schema' not in node.get('tags', []):
+        return None
+
+    model_ids = node.get('depends_on', {}).get('nodes', [])
+    if len(model_ids) != 1:
+        return None
+
+    parsed = parse_schema_test(node.get('raw_sql', ''))
+    if parsed is None:
+        return None
+
+    test_type, kwargs = parsed
+    if test_type not in FUSABLE_TESTS:
+        return None
+
+    if test_type == 'accepted_values':
+        column_name = kwargs.get('column_name', kwargs.get('field'))
+        values = kwargs.get('values')
+        if not isinstance(values, (list, tuple)) or \
+           not all(isinstance(v, (basestring, int, float)) for v in values):
+            return None
+    else:
+        column_name = kwargs.get('column_name', kwargs.get('arg'))
+        values = None
+
+    if not isinstance(column_name, basestring):
+        return None
+
+    return {
+        'test_type': test_type,
+        'model_id': model_ids[0],
+        'column_name': column_name,
+        'values': values,
+    }
+
+
+def get_failures_sql(test, relation):
+    """Return a sql expression that counts the failures of the test. Tests
+    that need their own pass over the model are wrapped in a subquery.
+    """
+    column_name = test['column_name']
+
+    if test['test_type'] == 'not_null':
+        return 'count(case when {column} is null then 1 end)'.format(
+            column=column_name)
+
+    elif test['test_type'] == 'accepted_values':
+        values = ', '.join("'{}'".format(value) for value in test['values'])
+        return ('count(distinct case when {column} not in ({values}) '
+                'then {column} end)'.format(column=column_name,
+                                            values=values))
+
+    elif test['test_type'] == 'unique':
+        return ('(select count(*) from ('
+                'select {column} from {relation} '
+                'where {column} is not null '
+                'group by {column} '
+                'having count(*) > 1'
+                ') validation_errors)'.format(column=column_name,
+                                              relation=relation))
+
+    raise dbt.exceptions.InternalException(
+        'Cannot fuse a "{}" test'.format(test['test_type']))
+
+
+def get_fused_sql(tests, relation):
+    """Return a single query over the relation that selects the number of
+    failures of each test, in order.
+    """
+    columns = []
+    scans_relation = False
+
+    for i, test in enumerate(tests):
+        columns.append('{} as dbt_test_{}'.format(
+            get_failures_sql(test, relation), i))
+        if test['test_type'] != 'unique':
+            scans_relation = True
+
+    sql = 'select\n    {}'.format(',\n    '.join(columns))
+    if scans_relation:
+        sql += '\nfrom {}'.format(relation)
+
+    return sql
+
+
+class FusedTests(object):
+    """The schema tests in a run, grouped by the model they test, so that each
+    group can be run as a single query.
+
+    Tests still run (and report their results) one by one. The first test in
+    a group to run executes the query for the whole group, and the rest of
+    the group picks up their failure counts from its result. If the fused
+    query fails, every test in the group runs on its own instead, so errors
+    are reported against the test that caused them.
+    """
+    def __init__(self, adapter, profile, manifest, nodes):
+        self.groups = {}
+        self.tests = {}
+        self.results = {}
+        self.locks = {}
+
+        overridden = self.get_overridden_tests(manifest)
+
+        by_model = {}
+        for node in nodes:
+            if node.get('resource_type') != NodeType.Test:
+                continue
+
+            test = get_fusable_test(node)
+            if test is None or test['test_type'] in overridden:
+                continue
+
+            model = manifest.nodes.get(test['model_id'])
+            if model is None or \
+               dbt.utils.get_materialization(model) == 'ephemeral':
+                continue
+
+            test['relation'] = adapter.Relation.create_from_node(profile,
+                                                                 model)
+            by_model.setdefault(test['model_id'], []).append(
+                (node.get('unique_id'), test))
+
+        for model_id, tests in by_model.items():
+            # a test on its own gains nothing from fusing
+            if len(tests) < 2:
+                continue
+
+            self.groups[model_id] = [unique_id for unique_id, _ in tests]
+            self.locks[model_id] = threading.Lock()
+            for unique_id, test in tests:
+                self.tests[unique_id] = test
+
+        logger.debug('Fused {} schema tests into {} queries'.format(
+            len(self.tests), len(self.groups)))
+
+    @staticmethod
+    def get_overridden_tests(manifest):
+        # projects can override the built-in test macros, in which case the
+        # fused sql wouldn't match what the test is supposed to do
+        overridden = set()
+        for macro in manifest.macros.values():
+            for test_type in FUSABLE_TESTS:
+                if macro.get('name') == 'test_{}'.format(test_type) and \
+                   macro.get('package_name') != 'dbt':
+                    overridden.add(test_type)
+        return overridden
+
+    def get_fused_sql(self, model_id):
+        tests = [self.tests[unique_id] for unique_id in self.groups[model_id]]
+        return get_fused_sql(tests, tests[0]['relation'])
+
+    def get_status(self, unique_id, execute):
+        """Return the number of failures of the test, by executing the fused
+        query for its group (with execute(sql), which returns the row of
+        results) if no other test in the group has yet. Return None if the
+        test isn't fused, or if the fused query failed.
+        """
+        test = self.tests.get(unique_id)
+        if test is None:
+            return None
+
+        model_id = test['model_id']
+
+        with self.locks[model_id]:
+            if model_id not in self.results:
+                try:
+                    row = execute(self.get_fused_sql(model_id))
+                    self.results[model_id] = dict(
+                        zip(self.groups[model_id], row))
+                except dbt.exceptions.RuntimeException as e:
+                    logger.debug('Fused tests on "{}" failed, running them '
+                                 'one by one: {}'.format(model_id, e))
+                    self.results[model_id] = {}
+
+        return self.results[model_id].get(unique_id)
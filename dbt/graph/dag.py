@@ -0,0 +1,225 @@
+from array import array
+
+import dbt.exceptions
+
+
+def _build_csr(num_nodes, pairs):
+    """Given (source, target) pairs of integer node ids, return the offsets
+    and targets arrays of the adjacency lists in compressed sparse row form:
+    the targets of node i are targets[offsets[i]:offsets[i + 1]].
+    """
+    offsets = array('l', [0] * (num_nodes + 1))
+    for source, _ in pairs:
+        offsets[source + 1] += 1
+
+    for i in range(num_nodes):
+        offsets[i + 1] += offsets[i]
+
+    targets = array('l', [0] * offsets[num_nodes])
+    positions = offsets[:num_nodes]
+    for source, target in pairs:
+        targets[positions[source]] = target
+        positions[source] += 1
+
+    return offsets, targets
+
+
+class CompactDAG(object):
+    """A read-only copy of the structure of a graph, for answering
+    reachability queries quickly. Nodes are numbered in the order they're
+    given, and the parents and children of each node are stored in flat
+    integer arrays. Only unique ids are kept here: node data stays in the
+    manifest (or the Linker) and is looked up by unique id.
+
+    The closure of a single node is memoized the first time it's asked for,
+    so repeated queries (like skipping the children of failed nodes) only
+    walk the graph once.
+    """
+    def __init__(self, unique_ids, edges):
+        self.unique_ids = list(unique_ids)
+        self.ids = {unique_id: i for i, unique_id
+                    in enumerate(self.unique_ids)}
+
+        pairs = [(self.ids[source], self.ids[target])
+                 for source, target in edges]
+
+        num_nodes = len(self.unique_ids)
+        self.child_offsets, self.children = _build_csr(num_nodes, pairs)
+        self.parent_offsets, self.parents = _build_csr(
+            num_nodes, [(target, source) for source, target in pairs])
+
+        self._ancestors = {}
+        self._descendants = {}
+        self._topological_order = None
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Build a CompactDAG from a networkx DiGraph."""
+        return cls(graph.nodes(), graph.edges())
+
+    def __len__(self):
+        return len(self.unique_ids)
+
+    def __contains__(self, unique_id):
+        return unique_id in self.ids
+
+    def nodes(self):
+        return list(self.unique_ids)
+
+    def edges(self):
+        return [(self.unique_ids[i], self.unique_ids[j])
+                for i in range(len(self))
+                for j in self.child_ids(i)]
+
+    def parent_ids(self, i):
+        return self.parents[self.parent_offsets[i]:self.parent_offsets[i + 1]]
+
+    def child_ids(self, i):
+        return self.children[self.child_offsets[i]:self.child_offsets[i + 1]]
+
+    def _to_ids(self, unique_ids):
+        return [self.ids[unique_id] for unique_id in unique_ids]
+
+    def _to_unique_ids(self, ids):
+        return set(map(self.unique_ids.__getitem__, ids))
+
+    def _closure(self, ids, offsets, targets):
+        """Return the ids reachable from any of the given ids by following
+        at least one edge.
+        """
+        seen = bytearray(len(self))
+        reached = []
+        stack = list(ids)
+        push = stack.append
+
+        while stack:
+            i = stack.pop()
+            for j in targets[offsets[i]:offsets[i + 1]]:
+                if not seen[j]:
+                    seen[j] = 1
+                    reached.append(j)
+                    push(j)
+
+        return reached
+
+    def get_ancestors(self, unique_id):
+        """Return the set of ancestors of the node, like nx.ancestors."""
+        i = self.ids[unique_id]
+        if i not in self._ancestors:
+            self._ancestors[i] = frozenset(self._to_unique_ids(
+                self._closure([i], self.parent_offsets, self.parents)))
+        return set(self._ancestors[i])
+
+    def get_descendants(self, unique_id):
+        """Return the set of descendants of the node, like nx.descendants."""
+        i = self.ids[unique_id]
+        if i not in self._descendants:
+            self._descendants[i] = frozenset(self._to_unique_ids(
+                self._closure([i], self.child_offsets, self.children)))
+        return set(self._descendants[i])
+
+    def get_all_ancestors(self, unique_ids):
+        """Return the union of the ancestors of the nodes, in one pass."""
+        ids = self._to_ids(unique_ids)
+        return self._to_unique_ids(
+            self._closure(ids, self.parent_offsets, self.parents))
+
+    def get_all_descendants(self, unique_ids):
+        """Return the union of the descendants of the nodes, in one pass."""
+        ids = self._to_ids(unique_ids)
+        return self._to_unique_ids(
+            self._closure(ids, self.child_offsets, self.children))
+
+    def get_all_children(self, unique_ids):
+        """Return the union of the direct children of the nodes."""
+        children = set()
+        for i in self._to_ids(unique_ids):
+            children.update(self.child_ids(i))
+        return self._to_unique_ids(children)
+
+    def find_cycle(self):
+        """Return the unique ids along a cycle in the graph, starting from
+        the node it was entered at, or None if there are no cycles. This is a
+        depth-first search that stops at the first edge back to a node on
+        the current path, so it's linear in the size of the graph.
+        """
+        # 0: not visited yet, 1: on the current path, 2: done
+        states = bytearray(len(self))
+        offsets = self.child_offsets
+        children = self.children
+
+        for root in range(len(self)):
+            if states[root]:
+                continue
+
+            states[root] = 1
+            path = [root]
+            # for each node on the path, the position of its next child
+            positions = [offsets[root]]
+
+            while path:
+                i = path[-1]
+                k = positions[-1]
+
+                if k == offsets[i + 1]:
+                    states[i] = 2
+                    path.pop()
+                    positions.pop()
+                    continue
+
+                positions[-1] = k + 1
+                j = children[k]
+
+                if states[j] == 1:
+                    cycle = path[path.index(j):]
+                    return [self.unique_ids[c] for c in cycle]
+
+                elif states[j] == 0:
+                    states[j] = 1
+                    path.append(j)
+                    positions.append(offsets[j])
+
+        return None
+
+    def topological_order(self):
+        """Return the node ids in an order where every node comes after all
+        of its parents.
+        """
+        if self._topological_order is not None:
+            return self._topological_order
+
+        in_degrees = array('l', [
+            self.parent_offsets[i + 1] - self.parent_offsets[i]
+            for i in range(len(self))
+        ])
+        order = [i for i in range(len(self)) if in_degrees[i] == 0]
+
+        # order doubles as the queue of nodes whose parents are all done
+        for i in order:
+            for j in self.child_ids(i):
+                in_degrees[j] -= 1
+                if in_degrees[j] == 0:
+                    order.append(j)
+
+        if len(order) != len(self):
+            raise dbt.exceptions.InternalException(
+                'Cannot sort a graph with cycles topologically')
+
+        self._topological_order = order
+        return order
+
+    def subgraph(self, unique_ids):
+        """Return a CompactDAG of just the given nodes and the edges between
+        them.
+        """
+        keep = bytearray(len(self))
+        for i in self._to_ids(unique_ids):
+            keep[i] = 1
+
+        kept_ids = [i for i in range(len(self)) if keep[i]]
+        edges = [(self.unique_ids[i], self.unique_ids[j])
+                 for i in kept_ids
+                 for j in self.child_ids(i)
+                 if keep[j]]
+
+        return CompactDAG([self.unique_ids[i] for i in kept_ids], edges)
@@ -1,9 +1,11 @@
-import networkx as nx
+from collections import defaultdict
+
 from dbt.logger import GLOBAL_LOGGER as logger
 
 from dbt.utils import is_enabled, get_materialization, coalesce
 from dbt.node_types import NodeType
 from dbt.contracts.graph.parsed import ParsedNode
+from dbt.graph.dag import CompactDAG
 
 SELECTOR_PARENTS = '+'
 SELECTOR_CHILDREN = '+'
@@ -74,60 +76,158 @@ def is_selected_node(real_node, node_selector):
     return True
 
 
-def get_nodes_by_qualified_name(graph, qualified_name):
-    """ returns a node if matched, else throws a CompilerError. qualified_name
-    should be either 1) a node name or 2) a dot-notation qualified selector"""
+class FqnTrieNode(object):
+    __slots__ = ('children', 'nodes')
+
+    def __init__(self):
+        self.children = {}
+        # every node whose fqn starts with the path to this trie node
+        self.nodes = set()
+
+
+class SelectionIndex(object):
+    """An index of the nodes in a graph for resolving selection specs: a trie
+    of their fqns, and maps of their names, packages, resource types and
+    tags. Build it once per graph, and each spec resolves by walking the trie
+    instead of testing every node against it. The graph can be a networkx
+    graph or a Linker.
+    """
+    def __init__(self, graph):
+        self.root = FqnTrieNode()
+        self.names = defaultdict(set)
+        self.packages = defaultdict(set)
+        self.resource_types = defaultdict(set)
+        self.tags = defaultdict(set)
+
+        for node, node_data in graph.nodes(data=True):
+            fqn = node_data['fqn']
+
+            self.names[fqn[-1]].add(node)
+            self.packages[node.split(".")[1]].add(node)
+            self.resource_types[node_data.get('resource_type')].add(node)
+            for tag in node_data.get('tags') or []:
+                self.tags[tag].add(node)
+
+            trie_node = self.root
+            trie_node.nodes.add(node)
+            for part in fqn:
+                trie_node = trie_node.children.setdefault(part,
+                                                          FqnTrieNode())
+                trie_node.nodes.add(node)
+
+    def get_package_names(self, nodes=None):
+        if nodes is None:
+            return set(self.packages)
+
+        return set(package_name
+                   for package_name, package_nodes in self.packages.items()
+                   if not package_nodes.isdisjoint(nodes))
+
+    def get_nodes_by_tags(self, tags):
+        selected = set()
+        for tag in tags:
+            selected.update(self.tags.get(tag, ()))
+        return selected
+
+    def get_nodes_by_resource_types(self, resource_types):
+        selected = set()
+        for resource_type in resource_types:
+            selected.update(self.resource_types.get(resource_type, ()))
+        return selected
+
+    def _match(self, trie_node, node_selector, start):
+        """Return the nodes under trie_node (which already match the first
+        `start` parts of the selector) that is_selected_node would select.
+        """
+        selected = set()
+
+        for i in range(start, len(node_selector)):
+            selector_part = node_selector[i]
+
+            if selector_part == SELECTOR_GLOB:
+                selected.update(trie_node.nodes)
+                return selected
+
+            # match package.node_name or package.dir.node_name
+            if i == len(node_selector) - 1:
+                selected.update(trie_node.nodes &
+                                self.names.get(selector_part, set()))
+
+            trie_node = trie_node.children.get(selector_part)
+            if trie_node is None:
+                return selected
+
+        selected.update(trie_node.nodes)
+        return selected
+
+    def get_nodes_by_qualified_name(self, qualified_name, package_names):
+        """Return the nodes matched by the qualified name, which should be
+        either 1) a node name or 2) a dot-notation qualified selector, where
+        package_names are the packages a selector can start with.
+        """
+        selected = set()
+
+        if len(qualified_name) == 1:
+            selected.update(self.names.get(qualified_name[0], ()))
+
+        if qualified_name[0] in package_names:
+            selected.update(self._match(self.root, qualified_name, 0))
 
-    package_names = get_package_names(graph)
+        else:
+            for package_name in package_names:
+                trie_node = self.root.children.get(package_name)
+                if trie_node is not None:
+                    selected.update(self._match(
+                        trie_node, [package_name] + qualified_name, 1))
 
-    for node in graph.nodes():
-        fqn_ish = graph.node[node]['fqn']
+        return selected
 
-        if len(qualified_name) == 1 and fqn_ish[-1] == qualified_name[0]:
-            yield node
 
-        elif qualified_name[0] in package_names:
-            if is_selected_node(fqn_ish, qualified_name):
-                yield node
+def get_nodes_by_qualified_name(graph, qualified_name):
+    """ returns the nodes matched by qualified_name, which should be either
+    1) a node name or 2) a dot-notation qualified selector"""
 
-        else:
-            for package_name in package_names:
-                local_qualified_node_name = [package_name] + qualified_name
-                if is_selected_node(fqn_ish, local_qualified_node_name):
-                    yield node
-                    break
+    index = SelectionIndex(graph)
+    return index.get_nodes_by_qualified_name(qualified_name,
+                                             index.get_package_names())
 
 
-def get_nodes_from_spec(graph, spec):
+def get_nodes_from_spec(graph, spec, index=None, package_names=None):
+    """Return the nodes in the graph matched by the spec. The graph can be a
+    networkx graph, or a CompactDAG if an index is given.
+    """
     select_parents = spec['select_parents']
     select_children = spec['select_children']
     qualified_node_name = spec['qualified_node_name']
 
-    selected_nodes = set(get_nodes_by_qualified_name(graph,
-                                                     qualified_node_name))
+    if index is None:
+        index = SelectionIndex(graph)
+
+    if package_names is None:
+        package_names = index.get_package_names(set(graph.nodes()))
+
+    if not isinstance(graph, CompactDAG):
+        graph = CompactDAG.from_graph(graph)
+
+    selected_nodes = index.get_nodes_by_qualified_name(qualified_node_name,
+                                                       package_names)
+    # the index can cover more of the graph than we're selecting from
+    selected_nodes = set(node for node in selected_nodes if node in graph)
 
     additional_nodes = set()
-    test_nodes = set()
 
     if select_parents:
-        for node in selected_nodes:
-            parent_nodes = nx.ancestors(graph, node)
-            additional_nodes.update(parent_nodes)
+        additional_nodes.update(graph.get_all_ancestors(selected_nodes))
 
     if select_children:
-        for node in selected_nodes:
-            child_nodes = nx.descendants(graph, node)
-            additional_nodes.update(child_nodes)
+        additional_nodes.update(graph.get_all_descendants(selected_nodes))
 
     model_nodes = selected_nodes | additional_nodes
 
-    for node in model_nodes:
-        # include tests that depend on this node. if we aren't running tests,
-        # they'll be filtered out later.
-        child_tests = [n for n in graph.successors(node)
-                       if graph.node.get(n).get('resource_type') ==
-                       NodeType.Test]
-        test_nodes.update(child_tests)
+    # include tests that depend on these nodes. if we aren't running tests,
+    # they'll be filtered out later.
+    test_nodes = graph.get_all_children(model_nodes) & \
+        index.get_nodes_by_resource_types([NodeType.Test])
 
     return model_nodes | test_nodes
 
@@ -142,9 +242,22 @@ def warn_if_useless_spec(spec, nodes):
     )
 
 
-def select_nodes(graph, raw_include_specs, raw_exclude_specs):
+def select_nodes(graph, raw_include_specs, raw_exclude_specs, index=None):
+    """Select the nodes in the graph matched by the include specs and not by
+    the exclude specs. The graph can be a networkx graph, or a CompactDAG if
+    an index is given. The index can be built from a graph that graph is a
+    subgraph of.
+    """
     selected_nodes = set()
 
+    if index is None:
+        index = SelectionIndex(graph)
+
+    package_names = index.get_package_names(set(graph.nodes()))
+
+    if not isinstance(graph, CompactDAG):
+        graph = CompactDAG.from_graph(graph)
+
     split_include_specs = split_specs(raw_include_specs)
     split_exclude_specs = split_specs(raw_exclude_specs)
 
@@ -152,12 +265,14 @@ def select_nodes(graph, raw_include_specs, raw_exclude_specs):
     exclude_specs = [parse_spec(spec) for spec in split_exclude_specs]
 
     for spec in include_specs:
-        included_nodes = get_nodes_from_spec(graph, spec)
+        included_nodes = get_nodes_from_spec(graph, spec, index,
+                                             package_names)
         warn_if_useless_spec(spec, included_nodes)
         selected_nodes = selected_nodes | included_nodes
 
     for spec in exclude_specs:
-        excluded_nodes = get_nodes_from_spec(graph, spec)
+        excluded_nodes = get_nodes_from_spec(graph, spec, index,
+                                             package_names)
         warn_if_useless_spec(spec, excluded_nodes)
         selected_nodes = selected_nodes - excluded_nodes
 
@@ -168,37 +283,30 @@ class NodeSelector(object):
     def __init__(self, linker, manifest):
         self.linker = linker
         self.manifest = manifest
+        self.index = SelectionIndex(linker)
 
-    def get_valid_nodes(self, graph):
+    def get_valid_nodes(self):
         valid = []
-        for node_name in graph.nodes():
-            node = graph.node.get(node_name)
-
+        for node_name, node in self.linker.nodes(data=True):
             if not node.get('empty') and is_enabled(node):
                 valid.append(node_name)
         return valid
 
     def get_selected(self, include, exclude, resource_types, tags):
-        graph = self.linker.graph
-
         include = coalesce(include, ['*'])
         exclude = coalesce(exclude, [])
         tags = coalesce(tags, [])
 
-        to_run = self.get_valid_nodes(graph)
-        filtered_graph = graph.subgraph(to_run)
-        selected_nodes = select_nodes(filtered_graph, include, exclude)
-
-        filtered_nodes = set()
-        for node_name in selected_nodes:
-            node = graph.node.get(node_name)
+        to_run = self.get_valid_nodes()
+        filtered_graph = self.linker.dag.subgraph(to_run)
+        selected_nodes = select_nodes(filtered_graph, include, exclude,
+                                      self.index)
 
-            matched_resource = node.get('resource_type') in resource_types
-            matched_tags = (len(tags) == 0 or
-                            bool(set(node.get('tags', [])) & set(tags)))
+        filtered_nodes = selected_nodes & \
+            self.index.get_nodes_by_resource_types(resource_types)
 
-            if matched_resource and matched_tags:
-                filtered_nodes.add(node_name)
+        if len(tags) > 0:
+            filtered_nodes &= self.index.get_nodes_by_tags(tags)
 
         return filtered_nodes
 
@@ -220,7 +328,8 @@ class NodeSelector(object):
             for node in selected_nodes if node in node_names
         ]
 
-        all_ancestors = select_nodes(self.linker.graph, include_spec, [])
+        all_ancestors = select_nodes(self.linker.dag, include_spec, [],
+                                     self.index)
 
         res = []
         for ancestor in all_ancestors:
@@ -250,14 +359,25 @@ class NodeSelector(object):
         concurrent_dependency_list = []
         for level in dependency_list:
             node_level = [
-                ParsedNode(**self.linker.get_node(node)) for node in level
+                ParsedNode.from_trusted(**self.linker.get_node(node))
+                for node in level
             ]
             concurrent_dependency_list.append(node_level)
 
         return concurrent_dependency_list
 
+    def as_node_dependencies(self, selected_nodes, ephemeral_only=False):
+        return self.linker.get_blocking_parents(
+            selected_nodes,
+            ephemeral_only=ephemeral_only)
+
 
 class FlatNodeSelector(NodeSelector):
     def as_node_list(self, selected_nodes):
         return super(FlatNodeSelector, self).as_node_list(selected_nodes,
                                                           ephemeral_only=True)
+
+    def as_node_dependencies(self, selected_nodes):
+        return super(FlatNodeSelector, self).as_node_dependencies(
+            selected_nodes,
+            ephemeral_only=True)
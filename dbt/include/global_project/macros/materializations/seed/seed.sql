@@ -49,6 +49,13 @@
 
 {% macro default__load_csv_rows(model) %}
     {% set agate_table = model['agate_table'] %}
+
+    {# Use the database's bulk loading path if it has one #}
+    {% set bulk_sql = adapter.bulk_load_csv_rows(this, agate_table) %}
+    {% if bulk_sql is not none %}
+        {{ return(bulk_sql) }}
+    {% endif %}
+
     {% set cols_sql = ", ".join(agate_table.column_names) %}
     {% set bindings = [] %}
 
@@ -3,16 +3,22 @@ from collections import defaultdict
 
 import dbt.utils
 
+from dbt.graph.dag import CompactDAG
 
-GRAPH_SERIALIZE_BLACKLIST = [
-    'agate_table'
-]
 
-
-def from_file(graph_file):
+def from_file(graph_file, nodes=None):
+    """Read a Linker from a graph file. The file only has the structure of
+    the graph, so the data of its nodes is looked up in nodes, a dict of
+    unique ids to nodes (like the 'nodes' of a manifest).
+    """
     linker = Linker()
     linker.read_graph(graph_file)
 
+    if nodes is not None:
+        for node in linker.nodes():
+            if node in nodes:
+                linker.update_node_data(node, nodes[node])
+
     return linker
 
 
@@ -21,30 +27,132 @@ class Linker(object):
         if data is None:
             data = {}
         self.graph = nx.DiGraph(**data)
+        # node data, by unique id. These are the nodes themselves (usually
+        # from the manifest), not copies of them.
+        self.node_data = {}
+        self._dag = None
+
+    @property
+    def dag(self):
+        """A CompactDAG of the graph, for reachability queries. It's built
+        on first use, and again after the graph changes.
+        """
+        if self._dag is None:
+            self._dag = CompactDAG.from_graph(self.graph)
+        return self._dag
 
     def edges(self):
         return self.graph.edges()
 
-    def nodes(self):
+    def nodes(self, data=False):
+        if data:
+            return [(node, self.get_node(node)) for node in self.graph]
         return self.graph.nodes()
 
     def get_node(self, node):
+        if node in self.node_data:
+            return self.node_data[node]
         return self.graph.node[node]
 
     def find_cycles(self):
-        # There's a networkx find_cycle function, but there's a bug in the
-        # nx 1.11 release that prevents us from using it. We should use that
-        # function when we upgrade to 2.X. More info:
-        #     https://github.com/networkx/networkx/pull/2473
-        cycles = list(nx.simple_cycles(self.graph))
-
-        if len(cycles) > 0:
-            cycle_nodes = cycles[0]
+        cycle_nodes = self.dag.find_cycle()
+
+        if cycle_nodes is not None:
             cycle_nodes.append(cycle_nodes[0])
             return " --> ".join(cycle_nodes)
 
         return None
 
+    def _is_blocking(self, node, ephemeral_only):
+        node_data = self.get_node(node)
+        return (dbt.utils.is_blocking_dependency(node_data) and
+                (ephemeral_only is False or
+                 dbt.utils.get_materialization(node_data) == 'ephemeral'))
+
+    def get_depths(self, ephemeral_only=False):
+        """Return a dict mapping each node in the graph to its depth: the
+        number of blocking nodes among its ancestors. Every blocking ancestor
+        of a node has a smaller depth than the node itself.
+
+        This is computed in a single pass over the graph in topological
+        order. Each node's blocking ancestors are kept as a bitset (an int
+        with one bit per blocking node) that's the union of its parents'
+        bitsets, and it's dropped once all of the node's children have used
+        it.
+        """
+        dag = self.dag
+        depths = [0] * len(dag)
+        ancestors = [0] * len(dag)
+        children_left = [len(dag.child_ids(i)) for i in range(len(dag))]
+        num_blocking = 0
+
+        for i in dag.topological_order():
+            bits = 0
+            for parent in dag.parent_ids(i):
+                bits |= ancestors[parent]
+                children_left[parent] -= 1
+                if children_left[parent] == 0:
+                    ancestors[parent] = 0
+
+            depths[i] = bin(bits).count('1')
+
+            if self._is_blocking(dag.unique_ids[i], ephemeral_only):
+                bits |= 1 << num_blocking
+                num_blocking += 1
+
+            if children_left[i] > 0:
+                ancestors[i] = bits
+
+        return dict(zip(dag.unique_ids, depths))
+
+    def _get_graph_nodes(self, limit_to=None):
+        if limit_to is None:
+            return self.graph.nodes()
+
+        for node in limit_to:
+            if node not in self.graph:
+                raise RuntimeError(
+                    "Couldn't find model '{}' -- does it exist or is "
+                    "it disabled?".format(node)
+                )
+
+        return limit_to
+
+    def get_blocking_parents(self, limit_to=None, ephemeral_only=False):
+        """Return a dict mapping each node in limit_to (or in the graph) to
+        the set of nodes in limit_to that have to finish before it can run.
+        Those are its nearest blocking ancestors: paths through nodes that
+        don't block or aren't in limit_to are followed up to the next blocking
+        node in limit_to.
+        """
+        graph_nodes = self._get_graph_nodes(limit_to)
+        selected = set(graph_nodes)
+
+        dag = self.dag
+        # for every node, the parents its own children would have to wait on
+        # if it isn't something they wait on directly
+        inherited = [None] * len(dag)
+        blocking = bytearray(len(dag))
+        blocking_parents = {}
+
+        for i in dag.topological_order():
+            node = dag.unique_ids[i]
+            parents = set()
+            for parent in dag.parent_ids(i):
+                if blocking[parent]:
+                    parents.add(dag.unique_ids[parent])
+                else:
+                    parents.update(inherited[parent])
+
+            inherited[i] = parents
+            blocking[i] = (node in selected and
+                           self._is_blocking(node, ephemeral_only))
+
+            if node in selected:
+                blocking_parents[node] = parents
+
+        return blocking_parents
+
     def as_dependency_list(self, limit_to=None, ephemeral_only=False):
         """returns a list of list of nodes, eg. [[0,1], [2], [4,5,6]]. Each
         element contains nodes whose dependenices are subsumed by the union of
@@ -53,30 +161,11 @@ class Linker(object):
         completed"""
 
         depth_nodes = defaultdict(list)
-
-        if limit_to is None:
-            graph_nodes = self.graph.nodes()
-        else:
-            graph_nodes = limit_to
+        graph_nodes = self._get_graph_nodes(limit_to)
+        depths = self.get_depths(ephemeral_only)
 
         for node in graph_nodes:
-            if node not in self.graph:
-                raise RuntimeError(
-                    "Couldn't find model '{}' -- does it exist or is "
-                    "it disabled?".format(node)
-                )
-
-            num_ancestors = len([
-                ancestor for ancestor in
-                nx.ancestors(self.graph, node)
-                if (dbt.utils.is_blocking_dependency(
-                        self.get_node(ancestor)) and
-                    (ephemeral_only is False or
-                     dbt.utils.get_materialization(
-                         self.get_node(ancestor)) == 'ephemeral'))
-            ])
-
-            depth_nodes[num_ancestors].append(node)
+            depth_nodes[depths[node]].append(node)
 
         dependency_list = []
         for depth in sorted(depth_nodes.keys()):
@@ -85,40 +174,44 @@ class Linker(object):
         return dependency_list
 
     def get_dependent_nodes(self, node):
-        return nx.descendants(self.graph, node)
+        return self.dag.get_descendants(node)
 
     def dependency(self, node1, node2):
         "indicate that node1 depends on node2"
         self.graph.add_node(node1)
         self.graph.add_node(node2)
         self.graph.add_edge(node2, node1)
+        self._dag = None
 
     def add_node(self, node):
         self.graph.add_node(node)
+        self._dag = None
 
     def remove_node(self, node):
-        children = nx.descendants(self.graph, node)
+        children = self.dag.get_descendants(node)
         self.graph.remove_node(node)
+        self.node_data.pop(node, None)
+        self._dag = None
         return children
 
     def update_node_data(self, node, data):
-        self.graph.add_node(node, data)
+        """Set the data of a node, which is kept as given rather than
+        copied.
+        """
+        if node not in self.graph:
+            self.add_node(node)
+        self.node_data[node] = data
 
     def write_graph(self, outfile):
-        out_graph = self.remove_blacklisted_attributes_from_nodes(self.graph)
+        """Write the structure of the graph, its unique ids and edges, to
+        outfile. Node data isn't written: it's all in the manifest.
+        """
+        out_graph = nx.DiGraph()
+        out_graph.add_nodes_from(self.graph.nodes())
+        out_graph.add_edges_from(self.graph.edges())
         nx.write_gpickle(out_graph, outfile)
 
     def read_graph(self, infile):
         self.graph = nx.read_gpickle(infile)
-
-    @classmethod
-    def remove_blacklisted_attributes_from_nodes(cls, graph):
-        graph = graph.copy()
-        for node_name, node in graph.node.items():
-            slim_node = node.copy()
-            for key in GRAPH_SERIALIZE_BLACKLIST:
-                if key in slim_node:
-                    del slim_node[key]
-
-            graph.node[node_name] = slim_node
-        return graph
+        self.node_data = {}
+        self._dag = None
@@ -4,7 +4,9 @@ from dbt.node_types import NodeType
 from dbt.contracts.graph.manifest import Manifest
 from dbt.utils import timestring
 
+import dbt.flags
 import dbt.parser
+import dbt.parser.cache
 
 
 class GraphLoader(object):
@@ -16,12 +18,25 @@ class GraphLoader(object):
         root_project = project_obj.cfg
         macros = MacroLoader.load_all(root_project, all_projects)
         macros.update(OperationLoader.load_all(root_project, all_projects))
-        nodes = {}
-        for loader in cls._LOADERS:
-            nodes.update(loader.load_all(root_project, all_projects, macros))
-        docs = DocumentationLoader.load_all(root_project, all_projects)
 
-        tests, patches = SchemaTestLoader.load_all(root_project, all_projects)
+        if dbt.flags.PARTIAL_PARSE:
+            dbt.parser.cache.initialize_cache(root_project, all_projects,
+                                              macros)
+
+        try:
+            nodes = {}
+            for loader in cls._LOADERS:
+                nodes.update(loader.load_all(root_project, all_projects,
+                                             macros))
+            docs = DocumentationLoader.load_all(root_project, all_projects)
+
+            tests, patches = SchemaTestLoader.load_all(root_project,
+                                                       all_projects)
+        except Exception:
+            dbt.parser.cache.reset_cache()
+            raise
+
+        dbt.parser.cache.write_cache(root_project)
 
         manifest = Manifest(nodes=nodes, macros=macros, docs=docs,
                             generated_at=timestring(), project=project_obj)
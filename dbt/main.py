@@ -263,6 +263,9 @@ def invoke_dbt(parsed):
             return None
 
     flags.NON_DESTRUCTIVE = getattr(proj.args, 'non_destructive', False)
+    flags.PARTIAL_PARSE = getattr(proj.args, 'partial_parse', False)
+    flags.USE_RELATIONS_CACHE = getattr(proj.args, 'use_relations_cache',
+                                        True)
 
     arg_drop_existing = getattr(proj.args, 'drop_existing', False)
     arg_full_refresh = getattr(proj.args, 'full_refresh', False)
@@ -280,6 +283,32 @@ def invoke_dbt(parsed):
     return task, proj
 
 
+def add_scheduler_arguments(sub):
+    sub.add_argument(
+        '--scheduler',
+        choices=['levels', 'dag', 'critical-path'],
+        default=None,
+        help="""
+        How to order execution. 'levels' (the default) runs one dependency
+        level at a time. 'dag' runs each node as soon as everything it depends
+        on has finished. 'critical-path' does the same, but when more nodes
+        are ready than there are threads, it starts the ones with the longest
+        chain of work behind them first, using the execution times from the
+        previous run.
+        """
+    )
+    sub.add_argument(
+        '--default-execution-time',
+        type=float,
+        default=None,
+        help="""
+        The execution time, in seconds, to assume for nodes that have no
+        timing from the previous run. Only used with --scheduler
+        critical-path.
+        """
+    )
+
+
 def parse_args(args):
     p = DBTArgumentParser(
         prog='dbt: data build tool',
@@ -304,6 +333,21 @@ def parse_args(args):
         help='''Run schema validations at runtime. This will surface
         bugs in dbt, but may incur a performance penalty.''')
 
+    p.add_argument(
+        '--partial-parse',
+        action='store_true',
+        help='''Cache parse results in the target directory and only re-parse
+        files whose contents or parse inputs changed since the last run.''')
+
+    p.add_argument(
+        '--no-relations-cache',
+        action='store_false',
+        dest='use_relations_cache',
+        help='''Query the database for existing relations and their columns
+        every time they are needed during a run, instead of caching them. Use
+        this if other processes create, drop or alter relations while dbt is
+        running.''')
+
     subs = p.add_subparsers()
 
     base_subparser = argparse.ArgumentParser(add_help=False)
@@ -373,6 +417,7 @@ def parse_args(args):
         settings in profiles.yml.
         """
     )
+    add_scheduler_arguments(sub)
     sub.set_defaults(cls=archive_task.ArchiveTask, which='archive')
 
     run_sub = subs.add_parser('run', parents=[base_subparser])
@@ -421,6 +466,7 @@ def parse_args(args):
             settings in profiles.yml.
             """
         )
+        add_scheduler_arguments(sub)
         sub.add_argument(
             '--non-destructive',
             action='store_true',
@@ -470,6 +516,15 @@ def parse_args(args):
         action='store_true',
         help='Run constraint validations from schema.yml files'
     )
+    sub.add_argument(
+        '--fuse-tests',
+        action='store_true',
+        help="""
+        Run the not_null, unique and accepted_values tests on each model
+        together, in a single query per model. Results are still reported
+        for each test.
+        """
+    )
     sub.add_argument(
         '--threads',
         type=int,
@@ -479,6 +534,7 @@ def parse_args(args):
         settings in profiles.yml
         """
     )
+    add_scheduler_arguments(sub)
     sub.add_argument(
         '--models',
         required=False,
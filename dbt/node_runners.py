@@ -8,6 +8,9 @@ from dbt.contracts.results import RunModelResult
 
 import dbt.clients.jinja
 import dbt.context.runtime
+import dbt.fused_tests
+import dbt.parser.seeds
+import dbt.seed_state
 import dbt.utils
 import dbt.tracking
 import dbt.ui.printer
@@ -42,6 +45,7 @@ def track_model_run(index, num_nodes, run_model_result):
 
 class BaseRunner(object):
     print_header = True
+    uses_connections = True
 
     def __init__(self, project, adapter, node, node_index, num_nodes):
         self.project = project
@@ -72,7 +76,7 @@ class BaseRunner(object):
         catchable_errors = (dbt.exceptions.CompilationException,
                             dbt.exceptions.RuntimeException)
 
-        result = RunModelResult(self.node)
+        result = RunModelResult.from_trusted(self.node)
         started = time.time()
 
         try:
@@ -143,7 +147,7 @@ class BaseRunner(object):
             dbt.ui.printer.print_skip_line(self.node, schema_name, node_name,
                                            self.node_index, self.num_nodes)
 
-        node_result = RunModelResult(self.node, skip=True)
+        node_result = RunModelResult.from_trusted(self.node, skip=True)
         return node_result
 
     def do_skip(self):
@@ -162,6 +166,10 @@ class BaseRunner(object):
     def before_hooks(self, project, adapter, manifest):
         pass
 
+    @classmethod
+    def register_nodes(self, project, adapter, manifest, nodes):
+        pass
+
     @classmethod
     def before_run(self, project, adapter, manifest):
         pass
@@ -177,6 +185,7 @@ class BaseRunner(object):
 
 class CompileRunner(BaseRunner):
     print_header = False
+    uses_connections = False
 
     def raise_on_first_error(self):
         return True
@@ -188,7 +197,7 @@ class CompileRunner(BaseRunner):
         pass
 
     def execute(self, compiled_node, manifest):
-        return RunModelResult(compiled_node)
+        return RunModelResult.from_trusted(compiled_node)
 
     def compile(self, manifest):
         return self._compile_node(self.adapter, self.project, self.node,
@@ -254,12 +263,11 @@ class CompileRunner(BaseRunner):
     def create_schemas(cls, project, adapter, manifest):
         profile = project.run_environment()
         required_schemas = cls.get_model_schemas(manifest)
-        existing_schemas = set(adapter.get_existing_schemas(profile, project))
-        for schema in (required_schemas - existing_schemas):
-            adapter.create_schema(profile, project, schema)
+        adapter.create_schemas(profile, project, required_schemas)
 
 
 class ModelRunner(CompileRunner):
+    uses_connections = True
 
     def raise_on_first_error(self):
         return False
@@ -321,15 +329,20 @@ class ModelRunner(CompileRunner):
         # dbt expects that this schema will exist anyway.
         required_schemas.add(adapter.get_default_schema(profile, project))
 
-        existing_schemas = set(adapter.get_existing_schemas(profile, project))
+        created_schemas = adapter.create_schemas(profile, project,
+                                                 required_schemas)
 
-        for schema in (required_schemas - existing_schemas):
-            adapter.create_schema(profile, project, schema)
+        return required_schemas, created_schemas
 
     @classmethod
     def before_run(cls, project, adapter, manifest):
         cls.safe_run_hooks(project, adapter, manifest, RunHookType.Start)
-        cls.create_schemas(project, adapter, manifest)
+        schemas, created_schemas = cls.create_schemas(project, adapter,
+                                                      manifest)
+
+        profile = project.run_environment()
+        adapter.populate_relations_cache(profile, project, schemas,
+                                         created_schemas)
 
     @classmethod
     def print_results_line(cls, results, execution_time):
@@ -381,6 +394,13 @@ class ModelRunner(CompileRunner):
         self.print_result_line(result)
 
     def execute(self, model, manifest):
+        status = self.materialize(model, manifest)
+        return RunModelResult.from_trusted(model, status=status)
+
+    def materialize(self, model, manifest):
+        """Run the model's materialization and return the status of its main
+        statement.
+        """
         context = dbt.context.runtime.generate(
             model, self.project.cfg, manifest)
 
@@ -393,14 +413,38 @@ class ModelRunner(CompileRunner):
                 model,
                 self.adapter.type())
 
-        materialization_macro.generator(context)()
+        try:
+            materialization_macro.generator(context)()
+        except Exception:
+            # we don't know what the materialization got done
+            self.adapter.invalidate_relations_cache(model.schema)
+            raise
+
+        self.adapter.cache_new_relation(self.profile, self.project,
+                                        self.get_created_relation(model))
 
-        result = context['load_result']('main')
+        return context['load_result']('main').status
 
-        return RunModelResult(model, status=result.status)
+    def get_created_relation(self, model):
+        """Return the relation the materialization created or replaced. Its
+        type is None if it isn't known.
+        """
+        relation_types = {
+            'view': self.adapter.Relation.View,
+            'table': self.adapter.Relation.Table,
+            'incremental': self.adapter.Relation.Table,
+            'seed': self.adapter.Relation.Table,
+        }
+        relation_type = relation_types.get(model.get_materialization())
+
+        return self.adapter.Relation.create(schema=model.schema,
+                                            identifier=model.alias,
+                                            type=relation_type)
 
 
 class TestRunner(CompileRunner):
+    uses_connections = True
+    fused_tests = None
 
     def raise_on_first_error(self):
         return False
@@ -421,6 +465,29 @@ class TestRunner(CompileRunner):
         dbt.ui.printer.print_start_line(description, self.node_index,
                                         self.num_nodes)
 
+    @classmethod
+    def register_nodes(cls, project, adapter, manifest, nodes):
+        cls.fused_tests = None
+
+        if getattr(project.args, 'fuse_tests', False) and \
+           adapter.SUPPORTS_FUSED_TESTS:
+            profile = project.run_environment()
+            cls.fused_tests = dbt.fused_tests.FusedTests(adapter, profile,
+                                                         manifest, nodes)
+
+    @classmethod
+    def after_run(cls, project, adapter, results, manifest):
+        cls.fused_tests = None
+
+    def execute_fused_tests(self, sql):
+        res, table = self.adapter.execute_and_fetch(
+            self.profile,
+            sql,
+            self.node.name,
+            auto_begin=True)
+
+        return table[0]
+
     def execute_test(self, test):
         res, table = self.adapter.execute_and_fetch(
             self.profile,
@@ -441,8 +508,15 @@ class TestRunner(CompileRunner):
         self.print_start_line()
 
     def execute(self, test, manifest):
-        status = self.execute_test(test)
-        return RunModelResult(test, status=status)
+        status = None
+        if self.fused_tests is not None:
+            status = self.fused_tests.get_status(test.unique_id,
+                                                 self.execute_fused_tests)
+
+        if status is None:
+            status = self.execute_test(test)
+
+        return RunModelResult.from_trusted(test, status=status)
 
     def after_execute(self, result):
         self.print_result_line(result)
@@ -462,6 +536,13 @@ class ArchiveRunner(ModelRunner):
         dbt.ui.printer.print_archive_result_line(result, self.node_index,
                                                  self.num_nodes)
 
+    def get_created_relation(self, model):
+        cfg = model.get('config', {})
+        return self.adapter.Relation.create(
+            schema=cfg.get('target_schema'),
+            identifier=cfg.get('target_table'),
+            type=self.adapter.Relation.Table)
+
 
 class SeedRunner(ModelRunner):
 
@@ -474,12 +555,73 @@ class SeedRunner(ModelRunner):
         dbt.ui.printer.print_start_line(description, self.node_index,
                                         self.num_nodes)
 
+    seed_state = None
+
+    # the number of rows in the seed's table, once it's been loaded
+    num_rows = None
+
+    @classmethod
+    def register_nodes(cls, project, adapter, manifest, nodes):
+        path = dbt.seed_state.get_state_path(project)
+        cls.seed_state = dbt.seed_state.SeedState.load(path)
+
+    @classmethod
+    def after_run(cls, project, adapter, results, manifest):
+        super(SeedRunner, cls).after_run(project, adapter, results, manifest)
+
+        if cls.seed_state is not None:
+            cls.seed_state.write()
+            cls.seed_state = None
+
     def compile(self, manifest):
         return self.node
 
+    def is_up_to_date(self, relation):
+        if dbt.flags.FULL_REFRESH or self.seed_state is None or \
+           not self.seed_state.is_current(self.profile, self.node, relation):
+            return False
+
+        existing = self.adapter.get_relation(
+            self.profile, self.project, schema=relation.schema,
+            identifier=relation.identifier, model_name=self.node.name)
+        return existing is not None and existing.is_table
+
+    def load_agate_table(self, model):
+        # seeds are parsed without their tables, so the csv is only loaded
+        # here, into a copy of the node that's dropped once it's been
+        # materialized
+        if model.agate_table is not None:
+            return model
+
+        agate_table = dbt.parser.seeds.SeedParser.load_agate_table(model)
+        return type(model)(agate_table=agate_table, **model.serialize())
+
+    def execute(self, model, manifest):
+        relation = self.adapter.Relation.create_from_node(self.profile,
+                                                          model)
+
+        if self.is_up_to_date(relation):
+            return RunModelResult.from_trusted(model, status='UP TO DATE')
+
+        try:
+            seed = self.load_agate_table(model)
+            self.num_rows = len(seed.agate_table.rows)
+            status = self.materialize(seed, manifest)
+        except Exception:
+            if self.seed_state is not None:
+                self.seed_state.forget(self.profile, model, relation)
+            raise
+
+        if self.seed_state is not None:
+            self.seed_state.record(self.profile, model, relation)
+
+        # the result keeps the node, but not the table
+        return RunModelResult.from_trusted(model, status=status)
+
     def print_result_line(self, result):
         schema_name = self.node.schema
         dbt.ui.printer.print_seed_result_line(result,
                                               schema_name,
                                               self.node_index,
-                                              self.num_nodes)
+                                              self.num_nodes,
+                                              self.num_rows)
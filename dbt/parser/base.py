@@ -1,3 +1,4 @@
+import copy
 import os
 
 import dbt.exceptions
@@ -7,6 +8,7 @@ import dbt.utils
 import dbt.hooks
 import dbt.clients.jinja
 import dbt.context.parser
+import dbt.parser.cache
 
 from dbt.utils import coalesce
 from dbt.logger import GLOBAL_LOGGER as logger
@@ -52,13 +54,26 @@ class BaseParser(object):
         logger.debug("Parsing {}".format(node_path))
 
         node = node.serialize()
-
-        if agate_table is not None:
-            node['agate_table'] = agate_table
         tags = coalesce(tags, [])
         fqn_extra = coalesce(fqn_extra, [])
         macros = coalesce(macros, {})
 
+        # the agate table is not an input to parsing, so it is left out of
+        # the cache entry and attached to whatever we return
+        cache = dbt.parser.cache.active_cache
+        if cache is not None:
+            cache_key = dbt.parser.cache.hash_inputs(
+                node, node_path, package_project_config.get('name'), tags,
+                fqn_extra, fqn, archive_config, column_name)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                if agate_table is not None:
+                    cached['agate_table'] = agate_table
+                return ParsedNode(**cached)
+
+        if agate_table is not None:
+            node['agate_table'] = agate_table
+
         node.update({
             'refs': [],
             'depends_on': {
@@ -139,4 +154,9 @@ class BaseParser(object):
 
         parsed_node.validate()
 
+        if cache is not None:
+            cache.set(cache_key, copy.deepcopy({
+                k: v for k, v in parsed_node.items() if k != 'agate_table'
+            }))
+
         return parsed_node
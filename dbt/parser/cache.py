@@ -0,0 +1,135 @@
+"""A persistent cache of parse results.
+
+Parsing a node means rendering its jinja with a parse-time context, which is
+by far the most expensive part of loading a project. The results only depend
+on the node's own source plus a handful of project-wide inputs (the project
+configs, the active target and cli vars, the dbt version, and the available
+macros), so we can key each parse result on a hash of its inputs and reuse it
+across invocations.
+"""
+import copy
+import json
+import os
+import pickle
+
+import dbt.clients.system
+import dbt.utils
+import dbt.version
+
+from dbt.logger import GLOBAL_LOGGER as logger
+
+
+PARSE_CACHE_FILE_NAME = 'partial_parse.pickle'
+
+active_cache = None
+
+
+def hash_inputs(*inputs):
+    """Hash the given json-serializable inputs into a stable hex digest."""
+    serialized = json.dumps(inputs, sort_keys=True, default=str)
+    return dbt.utils.md5(serialized)
+
+
+def get_cache_key(all_projects, macros):
+    """Build the key shared by every entry in the cache. Any change to the
+    project configs (which include the active target, profile outputs and cli
+    vars), the dbt version, or any macro will invalidate every cached result,
+    as any of them can change the outcome of rendering a node.
+    """
+    macro_sources = sorted(
+        (unique_id, macro.get('raw_sql'))
+        for unique_id, macro in macros.items()
+    )
+    return hash_inputs(dbt.version.__version__, all_projects, macro_sources)
+
+
+def get_cache_path(root_project):
+    return os.path.join(root_project.get('target-path'), PARSE_CACHE_FILE_NAME)
+
+
+class ParseCache(object):
+    """A mapping of entry hashes to serialized parse results.
+
+    Entries that are read or written during a parse are carried forward to
+    the next invocation, and everything else is dropped when the cache is
+    written. That keeps the file from growing as resources are renamed or
+    deleted.
+    """
+    def __init__(self, key, entries=None):
+        self.key = key
+        self._previous = {} if entries is None else entries
+        self._current = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path, key):
+        entries = None
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as handle:
+                    saved = pickle.load(handle)
+            except Exception as e:
+                logger.debug('Could not read the parse cache at {}: {}'
+                             .format(path, e))
+                saved = {}
+
+            if saved.get('key') == key:
+                entries = saved.get('entries')
+            else:
+                logger.debug('Parse cache inputs changed, ignoring {}'
+                             .format(path))
+
+        return cls(key, entries)
+
+    def get(self, entry_key):
+        value = self._previous.get(entry_key)
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._current[entry_key] = value
+        return copy.deepcopy(value)
+
+    def set(self, entry_key, value):
+        self._current[entry_key] = value
+
+    def write(self, path):
+        to_write = {
+            'key': self.key,
+            'entries': self._current,
+        }
+
+        with open(path, 'wb') as handle:
+            pickle.dump(to_write, handle, pickle.HIGHEST_PROTOCOL)
+
+
+def initialize_cache(root_project, all_projects, macros):
+    global active_cache
+
+    key = get_cache_key(all_projects, macros)
+    active_cache = ParseCache.load(get_cache_path(root_project), key)
+
+    return active_cache
+
+
+def write_cache(root_project):
+    global active_cache
+
+    if active_cache is None:
+        return
+
+    logger.debug('Parse cache: {} hits, {} misses'
+                 .format(active_cache.hits, active_cache.misses))
+
+    dbt.clients.system.make_directory(root_project.get('target-path'))
+    active_cache.write(get_cache_path(root_project))
+    active_cache = None
+
+
+def reset_cache():
+    global active_cache
+    active_cache = None
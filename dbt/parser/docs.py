@@ -1,4 +1,5 @@
 import dbt.exceptions
+import dbt.parser.cache
 from dbt.node_types import NodeType
 from dbt.parser.base import BaseParser
 from dbt.contracts.graph.unparsed import UnparsedDocumentationFile
@@ -43,7 +44,7 @@ class DocumentationParser(BaseParser):
             )
 
     @classmethod
-    def parse(cls, all_projects, root_project_config, docfile):
+    def _parse(cls, all_projects, root_project_config, docfile):
         try:
             template = dbt.clients.jinja.get_template(docfile.file_contents,
                                                       {})
@@ -79,6 +80,28 @@ class DocumentationParser(BaseParser):
             )
             yield ParsedDocumentation(**merged)
 
+    @classmethod
+    def parse(cls, all_projects, root_project_config, docfile):
+        cache = dbt.parser.cache.active_cache
+        if cache is None:
+            for parsed in cls._parse(all_projects, root_project_config,
+                                     docfile):
+                yield parsed
+            return
+
+        cache_key = dbt.parser.cache.hash_inputs(docfile.serialize())
+        cached = cache.get(cache_key)
+
+        if cached is None:
+            cached = [
+                parsed.serialize() for parsed in
+                cls._parse(all_projects, root_project_config, docfile)
+            ]
+            cache.set(cache_key, cached)
+
+        for contents in cached:
+            yield ParsedDocumentation(**contents)
+
     @classmethod
     def load_and_parse(cls, package_name, root_project, all_projects, root_dir,
                        relative_dirs):
@@ -1,3 +1,4 @@
+import hashlib
 import os
 
 import dbt.flags
@@ -14,10 +15,19 @@ from dbt.parser.base import BaseParser
 
 
 class SeedParser(BaseParser):
+    @classmethod
+    def get_seed_hash(cls, abspath):
+        sha = hashlib.sha256()
+        with open(abspath, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(64 * 1024), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
     @classmethod
     def parse_seed_file(cls, file_match, root_dir, package_name):
-        """Parse the given seed file, returning an UnparsedNode and the agate
-        table.
+        """Parse the given seed file, returning an UnparsedNode and the hash
+        of its contents. The csv itself isn't loaded until the seed is run
+        (see load_agate_table).
         """
         abspath = file_match['absolute_path']
         logger.debug("Parsing {}".format(abspath))
@@ -34,12 +44,20 @@ class SeedParser(BaseParser):
             original_file_path=os.path.join(file_match.get('searched_path'),
                                             file_match.get('relative_path')),
         )
+        return node, cls.get_seed_hash(abspath)
+
+    @classmethod
+    def load_agate_table(cls, node):
+        """Load the csv file of the given seed node as an agate table."""
+        abspath = os.path.join(node.get('root_path'),
+                               node.get('original_file_path'))
         try:
-            table = dbt.clients.agate_helper.from_csv(abspath)
+            table = dbt.clients.agate_helper.from_csv(
+                abspath, node.get('config', {}).get('column_types'))
         except ValueError as e:
             dbt.exceptions.raise_compiler_error(str(e), node)
         table.original_abspath = abspath
-        return node, table
+        return table
 
     @classmethod
     def load_and_parse(cls, package_name, root_project, all_projects, root_dir,
@@ -58,13 +76,13 @@ class SeedParser(BaseParser):
 
         result = {}
         for file_match in file_matches:
-            node, agate_table = cls.parse_seed_file(file_match, root_dir,
-                                                    package_name)
+            node, seed_hash = cls.parse_seed_file(file_match, root_dir,
+                                                  package_name)
             node_path = cls.get_path(NodeType.Seed, package_name, node.name)
             parsed = cls.parse_node(node, node_path, root_project,
                                     all_projects.get(package_name),
-                                    all_projects, tags=tags, macros=macros,
-                                    agate_table=agate_table)
+                                    all_projects, tags=tags, macros=macros)
+            parsed.set('seed_hash', seed_hash)
             result[node_path] = parsed
 
         return result
@@ -1,4 +1,8 @@
+import heapq
+import itertools
+import json
 import os
+import threading
 import time
 
 from dbt.adapters.factory import get_adapter
@@ -10,20 +14,69 @@ from dbt.contracts.results import ExecutionResult
 import dbt.clients.jinja
 import dbt.compilation
 import dbt.exceptions
+import dbt.flags
 import dbt.linker
 import dbt.tracking
 import dbt.model
 import dbt.ui.printer
 import dbt.utils
-from dbt.clients.system import write_json
+from dbt.clients.system import write_json, load_file_contents
 
 import dbt.graph.selector
 
+from dbt.compat import queue
 from multiprocessing.dummy import Pool as ThreadPool
 
 
 RESULT_FILE_NAME = 'run_results.json'
 
+# run the nodes one dependency level at a time
+SCHEDULER_LEVELS = 'levels'
+# run each node as soon as everything it depends on has finished
+SCHEDULER_DAG = 'dag'
+# like SCHEDULER_DAG, but start the ready nodes with the longest chain of work
+# behind them first
+SCHEDULER_CRITICAL_PATH = 'critical-path'
+
+# the execution time (in seconds) assumed for nodes that weren't in the
+# previous run
+DEFAULT_EXECUTION_TIME = 1.0
+
+
+def get_critical_path_priorities(dependencies, execution_times,
+                                 default_execution_time):
+    """Given a dict mapping unique IDs to the set of unique IDs they depend
+    on, return a dict mapping each unique ID to the expected execution time of
+    the longest path from the start of that node to the end of the run.
+    """
+    children = {unique_id: [] for unique_id in dependencies}
+    num_children = {unique_id: 0 for unique_id in dependencies}
+    for unique_id, parents in dependencies.items():
+        for parent in parents:
+            children[parent].append(unique_id)
+            num_children[parent] += 1
+
+    # walk up from the leaves, so every node's children are done first
+    to_visit = [
+        unique_id for unique_id, count in num_children.items() if count == 0
+    ]
+    priorities = {}
+
+    while to_visit:
+        unique_id = to_visit.pop()
+        downstream = max(
+            [priorities[child] for child in children[unique_id]] or [0]
+        )
+        own_time = execution_times.get(unique_id, default_execution_time)
+        priorities[unique_id] = own_time + downstream
+
+        for parent in dependencies[unique_id]:
+            num_children[parent] -= 1
+            if num_children[parent] == 0:
+                to_visit.append(parent)
+
+    return priorities
+
 
 class RunManager(object):
     def __init__(self, project, target_path, args):
@@ -39,6 +92,17 @@ class RunManager(object):
         else:
             self.threads = self.args.threads
 
+        self.scheduler = getattr(self.args, 'scheduler', None)
+        if self.scheduler is None:
+            self.scheduler = SCHEDULER_LEVELS
+
+        self.default_execution_time = getattr(
+            self.args, 'default_execution_time', None)
+        if self.default_execution_time is None:
+            self.default_execution_time = DEFAULT_EXECUTION_TIME
+
+        self.connection_warm_up_time = None
+
     def deserialize_graph(self):
         logger.info("Loading dependency graph file.")
 
@@ -47,8 +111,16 @@ class RunManager(object):
             base_target_path,
             dbt.compilation.graph_file_name
         )
+        manifest_file = os.path.join(
+            base_target_path,
+            dbt.compilation.manifest_file_name
+        )
 
-        return dbt.linker.from_file(graph_file)
+        # the graph file only has unique ids and edges, so the node data
+        # comes from the manifest written alongside it
+        manifest = json.loads(load_file_contents(manifest_file))
+
+        return dbt.linker.from_file(graph_file, manifest['nodes'])
 
     def get_dependent(self, linker, node_id):
         dependent_nodes = linker.get_dependent_nodes(node_id)
@@ -104,23 +176,25 @@ class RunManager(object):
                 runners.append(node_runners[unique_id])
         return runners
 
-    def execute_nodes(self, linker, Runner, manifest, node_dependency_list):
-        profile = self.project.run_environment()
-        adapter = get_adapter(profile)
+    def handle_result(self, linker, Runner, manifest, node_runners,
+                      node_results, result):
+        if not Runner.is_ephemeral_model(result.node):
+            node_results.append(result)
 
-        num_threads = self.threads
-        target_name = self.project.get_target().get('name')
+        node = CompileResultNode.from_trusted(**result.node)
+        node_id = node.unique_id
+        manifest.nodes[node_id] = node
 
-        text = "Concurrency: {} threads (target='{}')"
-        concurrency_line = text.format(num_threads, target_name)
-        dbt.ui.printer.print_timestamped_line(concurrency_line)
-        dbt.ui.printer.print_timestamped_line("")
+        if result.errored:
+            for dep_node_id in self.get_dependent(linker, node_id):
+                runner = node_runners.get(dep_node_id)
+                if runner:
+                    runner.do_skip()
 
-        schemas = list(Runner.get_model_schemas(manifest))
-        node_runners = self.get_runners(Runner, adapter, node_dependency_list)
+        return node_id
 
-        pool = ThreadPool(num_threads)
-        node_results = []
+    def execute_levels(self, pool, linker, Runner, manifest, node_runners,
+                       node_dependency_list, node_results):
         for node_list in node_dependency_list:
             runners = self.get_relevant_runners(node_runners, node_list)
 
@@ -131,51 +205,205 @@ class RunManager(object):
                     'runner': runner
                 })
 
+            for result in pool.imap_unordered(self.call_runner, args_list):
+                self.handle_result(linker, Runner, manifest, node_runners,
+                                   node_results, result)
+
+    def execute_dag(self, pool, linker, Runner, manifest, node_runners,
+                    node_dependency_list, dependencies, node_results,
+                    priorities=None):
+        """Run every node as soon as all of the nodes it depends on have
+        finished, instead of waiting for the whole previous level.
+        dependencies maps each unique ID to the set of unique IDs that have to
+        finish before it can start. If priorities is given, it maps unique IDs
+        to numbers, and when more nodes are ready than there are threads the
+        ones with the highest priority start first. Otherwise they start in
+        the order they became ready.
+        """
+        if priorities is None:
+            priorities = {}
+
+        finished = queue.Queue()
+
+        def run_node(unique_id):
+            data = {
+                'manifest': manifest,
+                'runner': node_runners[unique_id],
+            }
             try:
-                for result in pool.imap_unordered(self.call_runner, args_list):
-                    if not Runner.is_ephemeral_model(result.node):
-                        node_results.append(result)
+                finished.put((self.call_runner(data), None))
+            except Exception as e:
+                finished.put((None, e))
+
+        # a heap of (-priority, sequence, unique_id). Nodes are only handed
+        # to the pool when a thread is free, so the heap decides the order.
+        ready = []
+        sequence = itertools.count()
+
+        def make_ready(unique_id):
+            priority = priorities.get(unique_id, 0)
+            heapq.heappush(ready, (-priority, next(sequence), unique_id))
+
+        remaining = {}
+        children = {unique_id: [] for unique_id in node_runners}
+        for unique_id in node_runners:
+            parents = dependencies.get(unique_id, ())
+            remaining[unique_id] = len(parents)
+            for parent in parents:
+                children[parent].append(unique_id)
+
+        # start with the nodes that don't depend on anything, in the same
+        # order the level scheduler would have started them
+        for node in dbt.utils.flatten_nodes(node_dependency_list):
+            unique_id = node.get('unique_id')
+            if remaining.get(unique_id) == 0:
+                make_ready(unique_id)
+
+        running = 0
+        for _ in range(len(remaining)):
+            while ready and running < self.threads:
+                _, _, unique_id = heapq.heappop(ready)
+                pool.apply_async(run_node, (unique_id,))
+                running += 1
+
+            result, error = self.wait_for_result(finished)
+            running -= 1
+            if error is not None:
+                raise error
+
+            node_id = self.handle_result(linker, Runner, manifest,
+                                         node_runners, node_results, result)
+
+            for child in children[node_id]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    make_ready(child)
+
+    def wait_for_result(self, finished):
+        # wait with a timeout, so KeyboardInterrupt is delivered on python 2
+        while True:
+            try:
+                return finished.get(timeout=1)
+            except queue.Empty:
+                pass
+
+    def load_execution_times(self):
+        """Return a dict mapping unique IDs to how long each node took to
+        execute in the previous run, according to its run_results.json.
+        Skipped and errored nodes are left out.
+        """
+        filepath = os.path.join(self.project['target-path'], RESULT_FILE_NAME)
+        if not os.path.exists(filepath):
+            return {}
 
-                    node = CompileResultNode(**result.node)
-                    node_id = node.unique_id
-                    manifest.nodes[node_id] = node
+        try:
+            previous = json.loads(load_file_contents(filepath))
+            results = previous['results']
+        except (IOError, OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug('Could not read execution times from {}: {}'
+                         .format(filepath, e))
+            return {}
+
+        execution_times = {}
+        for result in results:
+            if result.get('skip') or result.get('error') is not None:
+                continue
+            unique_id = result.get('node', {}).get('unique_id')
+            execution_time = result.get('execution_time')
+            if unique_id is not None and execution_time is not None:
+                execution_times[unique_id] = execution_time
+
+        return execution_times
+
+    def get_priorities(self, dependencies):
+        if self.scheduler != SCHEDULER_CRITICAL_PATH:
+            return None
+
+        execution_times = self.load_execution_times()
+        logger.debug('Found previous execution times for {} of {} nodes'
+                     .format(len(set(execution_times) & set(dependencies)),
+                             len(dependencies)))
+
+        return get_critical_path_priorities(dependencies, execution_times,
+                                            self.default_execution_time)
+
+    def execute_nodes(self, linker, Runner, manifest, node_dependency_list,
+                      dependencies=None):
+        profile = self.project.run_environment()
+        adapter = get_adapter(profile)
 
-                    if result.errored:
-                        for dep_node_id in self.get_dependent(linker, node_id):
-                            runner = node_runners.get(dep_node_id)
-                            if runner:
-                                runner.do_skip()
+        num_threads = self.threads
+        target_name = self.project.get_target().get('name')
 
-            except KeyboardInterrupt:
-                pool.close()
-                pool.terminate()
+        text = "Concurrency: {} threads (target='{}')"
+        concurrency_line = text.format(num_threads, target_name)
+        dbt.ui.printer.print_timestamped_line(concurrency_line)
+        dbt.ui.printer.print_timestamped_line("")
 
-                profile = self.project.run_environment()
-                adapter = get_adapter(profile)
+        schemas = list(Runner.get_model_schemas(manifest))
+        node_runners = self.get_runners(Runner, adapter, node_dependency_list)
 
-                if not adapter.is_cancelable():
-                    msg = ("The {} adapter does not support query "
-                           "cancellation. Some queries may still be "
-                           "running!".format(adapter.type()))
+        pool = ThreadPool(num_threads)
+        node_results = []
 
-                    yellow = dbt.ui.printer.COLOR_FG_YELLOW
-                    dbt.ui.printer.print_timestamped_line(msg, yellow)
-                    raise
+        try:
+            if dependencies is None:
+                self.execute_levels(pool, linker, Runner, manifest,
+                                    node_runners, node_dependency_list,
+                                    node_results)
+            else:
+                self.execute_dag(pool, linker, Runner, manifest, node_runners,
+                                 node_dependency_list, dependencies,
+                                 node_results,
+                                 self.get_priorities(dependencies))
 
-                for conn_name in adapter.cancel_open_connections(profile):
-                    dbt.ui.printer.print_cancel_line(conn_name)
+        except KeyboardInterrupt:
+            pool.close()
+            pool.terminate()
 
-                dbt.ui.printer.print_run_end_messages(node_results,
-                                                      early_exit=True)
+            profile = self.project.run_environment()
+            adapter = get_adapter(profile)
 
-                pool.join()
+            if not adapter.is_cancelable():
+                msg = ("The {} adapter does not support query "
+                       "cancellation. Some queries may still be "
+                       "running!".format(adapter.type()))
+
+                yellow = dbt.ui.printer.COLOR_FG_YELLOW
+                dbt.ui.printer.print_timestamped_line(msg, yellow)
                 raise
 
+            for conn_name in adapter.cancel_open_connections(profile):
+                dbt.ui.printer.print_cancel_line(conn_name)
+
+            dbt.ui.printer.print_run_end_messages(node_results,
+                                                  early_exit=True)
+
+            pool.join()
+            raise
+
         pool.close()
         pool.join()
 
         return node_results
 
+    def start_connection_warm_up(self, adapter, profile):
+        """Open a connection for each thread in the background, while the
+        on-run-start hooks run and schemas are created, so the first nodes
+        don't all wait on opening one. Returns the thread doing it.
+        """
+        def warm_up():
+            try:
+                self.connection_warm_up_time = adapter.warm_up_connections(
+                    profile, self.threads)
+            except Exception as e:
+                logger.debug('Connection warm-up failed: {}'.format(e))
+
+        thread = threading.Thread(target=warm_up)
+        thread.daemon = True
+        thread.start()
+        return thread
+
     def write_results(self, execution_result):
         filepath = os.path.join(self.project['target-path'], RESULT_FILE_NAME)
         write_json(filepath, execution_result.serialize())
@@ -200,6 +428,10 @@ class RunManager(object):
         selected_nodes = selector.select(query)
         dep_list = selector.as_node_list(selected_nodes)
 
+        dependencies = None
+        if self.scheduler in (SCHEDULER_DAG, SCHEDULER_CRITICAL_PATH):
+            dependencies = selector.as_node_dependencies(selected_nodes)
+
         profile = self.project.run_environment()
         adapter = get_adapter(profile)
 
@@ -216,16 +448,32 @@ class RunManager(object):
         else:
             logger.info("")
 
+        if dbt.flags.USE_RELATIONS_CACHE:
+            adapter.enable_relations_cache()
+            adapter.enable_columns_cache()
+
+        warm_up = None
+        if Runner.uses_connections:
+            warm_up = self.start_connection_warm_up(adapter, profile)
+
         try:
+            Runner.register_nodes(self.project, adapter, manifest, flat_nodes)
             Runner.before_hooks(self.project, adapter, manifest)
             started = time.time()
             Runner.before_run(self.project, adapter, manifest)
-            res = self.execute_nodes(linker, Runner, manifest, dep_list)
+            if warm_up is not None:
+                warm_up.join()
+            res = self.execute_nodes(linker, Runner, manifest, dep_list,
+                                     dependencies)
             Runner.after_run(self.project, adapter, res, manifest)
             elapsed = time.time() - started
             Runner.after_hooks(self.project, adapter, res, manifest, elapsed)
 
         finally:
+            if warm_up is not None:
+                warm_up.join()
+            adapter.clear_relations_cache()
+            adapter.clear_columns_cache()
             adapter.cleanup_connections()
 
         result = ExecutionResult(
@@ -0,0 +1,83 @@
+"""A record of the seeds loaded by previous runs.
+
+Each loaded seed is recorded under a key for the relation it was loaded into
+(and the target it was loaded with), along with a fingerprint of what was
+loaded: the hash of the csv file and its column_types config. If neither has
+changed since the last load, and the relation still exists, the seed doesn't
+need to be loaded again.
+"""
+import json
+import os
+import threading
+
+import dbt.clients.system
+import dbt.utils
+
+from dbt.logger import GLOBAL_LOGGER as logger
+
+
+SEED_STATE_FILE_NAME = 'seed_state.json'
+
+
+def _hash(*inputs):
+    return dbt.utils.md5(json.dumps(inputs, sort_keys=True, default=str))
+
+
+def get_state_path(project):
+    return os.path.join(project['target-path'], SEED_STATE_FILE_NAME)
+
+
+class SeedState(object):
+    def __init__(self, path, entries=None):
+        self.path = path
+        self.entries = {} if entries is None else entries
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        entries = None
+
+        if os.path.exists(path):
+            try:
+                with open(path) as handle:
+                    entries = json.load(handle)
+            except Exception as e:
+                logger.debug('Could not read the seed state at {}: {}'
+                             .format(path, e))
+
+        return cls(path, entries)
+
+    @staticmethod
+    def get_key(profile, node, relation):
+        profile = {k: v for (k, v) in profile.items() if k != 'threads'}
+        return _hash(node.get('unique_id'), str(relation), profile)
+
+    @staticmethod
+    def get_fingerprint(node):
+        return _hash(node.get('seed_hash'),
+                     node.get('config', {}).get('column_types', {}))
+
+    def is_current(self, profile, node, relation):
+        if node.get('seed_hash') is None:
+            return False
+
+        key = self.get_key(profile, node, relation)
+        with self.lock:
+            return self.entries.get(key) == self.get_fingerprint(node)
+
+    def record(self, profile, node, relation):
+        key = self.get_key(profile, node, relation)
+        with self.lock:
+            self.entries[key] = self.get_fingerprint(node)
+
+    def forget(self, profile, node, relation):
+        key = self.get_key(profile, node, relation)
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def write(self):
+        dbt.clients.system.make_directory(os.path.dirname(self.path))
+
+        with self.lock:
+            with open(self.path, 'w') as handle:
+                json.dump(self.entries, handle, sort_keys=True)
@@ -2,6 +2,7 @@ import random
 from dbt.logger import GLOBAL_LOGGER as logger
 from dbt.node_runners import SeedRunner
 from dbt.node_types import NodeType
+from dbt.parser.seeds import SeedParser
 from dbt.runner import RunManager
 from dbt.task.base_task import RunnableTask
 import dbt.ui.printer
@@ -28,7 +29,9 @@ class SeedTask(RunnableTask):
         return results
 
     def show_table(self, result):
-        table = result.node['agate_table']
+        table = result.node.agate_table
+        if table is None:
+            table = SeedParser.load_agate_table(result.node)
         rand_table = table.order_by(lambda x: random.random())
 
         schema = result.node['schema']
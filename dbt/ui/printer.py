@@ -178,11 +178,17 @@ def print_archive_result_line(result, index, total):
         result.execution_time)
 
 
-def print_seed_result_line(result, schema_name, index, total):
+def print_seed_result_line(result, schema_name, index, total,
+                           num_rows=None):
     model = result.node
 
     info, status = get_printable_result(result, 'loaded', 'loading')
 
+    if not result.errored and num_rows is not None and \
+       result.execution_time:
+        status = '{} at {:0.0f} rows/s'.format(
+            status, num_rows / result.execution_time)
+
     print_fancy_output_line(
         "{info} seed file {schema}.{relation}".format(
             info=info,
@@ -8,6 +8,11 @@ import collections
 import copy
 import functools
 
+try:
+    import simplejson
+except ImportError:
+    simplejson = None
+
 import dbt.exceptions
 import dbt.flags
 
@@ -436,3 +441,23 @@ class JSONEncoder(json.JSONEncoder):
         if isinstance(obj, Decimal):
             return float(obj)
         return super(JSONEncoder, self).default(obj)
+
+
+def _json_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError('{!r} is not JSON serializable'.format(obj))
+
+
+def get_json_encoder():
+    """Return a function that encodes a value as json exactly like
+    json.dumps(value, cls=JSONEncoder) does. If simplejson is installed, its C
+    encoder is used instead, with its options set to match the json module.
+    """
+    if simplejson is not None:
+        return functools.partial(simplejson.dumps,
+                                 default=_json_default,
+                                 use_decimal=False,
+                                 namedtuple_as_object=False)
+
+    return JSONEncoder().encode
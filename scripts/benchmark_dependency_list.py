@@ -0,0 +1,93 @@
+#! /usr/bin/env python
+"""Time Linker.as_dependency_list on a large synthetic DAG.
+
+Each node depends on a few randomly chosen recent nodes, which makes for long
+chains of dependencies like real projects have. A fraction of the nodes are
+tests, which don't block their children. Pass --legacy to also time the
+previous implementation, which counted each node's blocking ancestors with
+one nx.ancestors call per node. It is quadratic, so it takes a while.
+"""
+from __future__ import print_function
+from argparse import ArgumentParser
+from collections import defaultdict
+import random
+import time
+
+import networkx as nx
+
+import dbt.utils
+from dbt.linker import Linker
+
+
+def build_linker(num_nodes, max_parents, window, seed):
+    rng = random.Random(seed)
+    linker = Linker()
+
+    for i in range(num_nodes):
+        node = 'model.bench.node_{}'.format(i)
+        resource_type = 'test' if rng.random() < 0.2 else 'model'
+        linker.add_node(node)
+        linker.update_node_data(node, {
+            'resource_type': resource_type,
+            'config': {'materialized': 'view'},
+        })
+
+        if i == 0:
+            continue
+
+        for _ in range(rng.randint(0, max_parents)):
+            parent = 'model.bench.node_{}'.format(
+                rng.randrange(max(0, i - window), i))
+            if linker.get_node(parent)['resource_type'] == 'model':
+                linker.dependency(node, parent)
+
+    return linker
+
+
+def legacy_dependency_list(linker):
+    depth_nodes = defaultdict(list)
+
+    for node in linker.nodes():
+        num_ancestors = len([
+            ancestor for ancestor in nx.ancestors(linker.graph, node)
+            if dbt.utils.is_blocking_dependency(linker.get_node(ancestor))
+        ])
+        depth_nodes[num_ancestors].append(node)
+
+    return [depth_nodes[depth] for depth in sorted(depth_nodes)]
+
+
+def timed(label, func):
+    start = time.time()
+    result = func()
+    print('{:<8} {:>8.2f}s  {} levels'.format(
+        label, time.time() - start, len(result)))
+    return result
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--nodes', type=int, default=50000)
+    parser.add_argument('--max-parents', type=int, default=3)
+    parser.add_argument('--window', type=int, default=200,
+                        help='How far back a node can pick its parents from')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--legacy', action='store_true',
+                        help='Also time the previous implementation')
+    args = parser.parse_args()
+
+    linker = build_linker(args.nodes, args.max_parents, args.window,
+                          args.seed)
+    print('{} nodes, {} edges'.format(len(linker.nodes()),
+                                      len(linker.edges())))
+
+    current = timed('current', linker.as_dependency_list)
+    if args.legacy:
+        legacy = timed('legacy', lambda: legacy_dependency_list(linker))
+        print('same levels: {}'.format(
+            [sorted(level) for level in current] ==
+            [sorted(level) for level in legacy]))
+
+
+if __name__ == '__main__':
+    main()
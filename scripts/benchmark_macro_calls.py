@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+"""Measure the overhead of calling a macro bound to a node context.
+
+Compares dbt's macro_generator against the previous behavior, which rebuilt
+the macro's template module (re-running the macro file and copying the
+context into it) on every call.
+"""
+from __future__ import print_function
+from argparse import ArgumentParser
+import timeit
+
+import dbt.clients.jinja
+import dbt.utils
+from dbt.node_types import NodeType
+
+
+MACRO_SQL = '''
+{% macro bench_macro(x) %}
+  {%- for i in range(3) -%}
+    {{ x + i }}{% if not loop.last %}, {% endif %}
+  {%- endfor -%}
+{% endmacro %}
+'''
+
+
+def build_context(size):
+    # a realistic node context has a few hundred entries once every package's
+    # macros and the adapter methods are in it
+    context = dbt.clients.jinja.MacroContext(
+        ('var_{}'.format(i), i) for i in range(size))
+    context['range'] = range
+    return context
+
+
+def legacy_call(template, context, name):
+    def call(*args, **kwargs):
+        module = template.make_module(context, False, context)
+        macro = module.__dict__[name]
+        module.__dict__.update(context)
+        return macro(*args, **kwargs)
+    return call
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=10000,
+                        help='Number of macro calls per measurement')
+    parser.add_argument('--context-size', type=int, default=300,
+                        help='Number of entries in the node context')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of measurements to take the best of')
+    args = parser.parse_args()
+
+    context = build_context(args.context_size)
+    template = dbt.clients.jinja.get_template(MACRO_SQL, context)
+    node = {'name': 'bench_macro', 'resource_type': NodeType.Macro}
+    macro_name = dbt.utils.get_dbt_macro_name('bench_macro')
+
+    candidates = [
+        ('per-call module', legacy_call(template, context, macro_name)),
+        ('cached module',
+         dbt.clients.jinja.macro_generator(template, node)(context)),
+    ]
+
+    for label, call in candidates:
+        best = min(timeit.repeat(lambda: call(1), number=args.calls,
+                                 repeat=args.repeat))
+        print('{:<16} {:>8.2f} us/call'.format(
+            label, best / args.calls * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+import mock
+import unittest
+
+from dbt.adapters.cache import ColumnsCache, get_ddl_targets
+from dbt.adapters.postgres import PostgresAdapter
+from dbt.adapters.snowflake import SnowflakeAdapter
+
+
+def relation(identifier, schema='analytics', type='table'):
+    return PostgresAdapter.Relation.create(schema=schema,
+                                           identifier=identifier,
+                                           type=type)
+
+
+class TestRelationsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.profile = {}
+        self.project_cfg = {'quoting': {}}
+
+        patcher = mock.patch.object(PostgresAdapter, 'add_query')
+        self.add_query = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.add_query.return_value = (mock.MagicMock(), mock.MagicMock())
+
+        patcher = mock.patch.object(PostgresAdapter, '_list_relations')
+        self.list_relations = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.list_relations.return_value = [relation('a'), relation('b')]
+
+        PostgresAdapter.enable_relations_cache()
+        self.addCleanup(PostgresAdapter.clear_relations_cache)
+
+    def list_identifiers(self, schema='analytics'):
+        relations = PostgresAdapter.list_relations(self.profile,
+                                                   self.project_cfg, schema)
+        return sorted(r.identifier for r in relations)
+
+    def test__lists_each_schema_once(self):
+        self.assertEqual(self.list_identifiers(), ['a', 'b'])
+        self.assertEqual(self.list_identifiers('ANALYTICS'), ['a', 'b'])
+        self.assertEqual(self.list_relations.call_count, 1)
+
+    def test__disabled(self):
+        PostgresAdapter.clear_relations_cache()
+        self.list_identifiers()
+        self.list_identifiers()
+        self.assertEqual(self.list_relations.call_count, 2)
+
+    @mock.patch.object(PostgresAdapter, 'DROP_CASCADES', False)
+    def test__drop_rename_and_create(self):
+        self.list_identifiers()
+
+        PostgresAdapter.drop_relation(self.profile, self.project_cfg,
+                                      relation('a'))
+        self.assertEqual(self.list_identifiers(), ['b'])
+
+        PostgresAdapter.rename_relation(self.profile, self.project_cfg,
+                                        relation('b'),
+                                        relation('c', schema=None, type=None))
+        self.assertEqual(self.list_identifiers(), ['c'])
+        renamed = PostgresAdapter.get_relation(
+            self.profile, self.project_cfg, schema='analytics',
+            identifier='c')
+        self.assertEqual(renamed.type, 'table')
+        self.assertEqual(renamed.schema, 'analytics')
+
+        PostgresAdapter.cache_new_relation(self.profile, self.project_cfg,
+                                           relation('d', type='view'))
+        self.assertEqual(self.list_identifiers(), ['c', 'd'])
+        self.assertEqual(self.list_relations.call_count, 1)
+
+        PostgresAdapter.cache_new_relation(self.profile, self.project_cfg,
+                                           relation('e', type=None))
+        self.assertEqual(self.list_identifiers(), ['a', 'b'])
+        self.assertEqual(self.list_relations.call_count, 2)
+
+    def test__cascading_drop_forgets_dependent_views(self):
+        # a table model with a view on top of it in another schema, on the
+        # second run
+        schemas = {
+            'analytics': [relation('model')],
+            'reporting': [relation('model_view', 'reporting', 'view')],
+        }
+        self.list_relations.side_effect = \
+            lambda profile, project_cfg, schema, model_name=None: \
+            schemas[schema]
+        self.assertEqual(self.list_identifiers(), ['model'])
+        self.assertEqual(self.list_identifiers('reporting'), ['model_view'])
+
+        # table.sql moves the old table out of the way, builds the new one
+        # and drops the old one, which drops the view too
+        PostgresAdapter.rename_relation(
+            self.profile, self.project_cfg, relation('model'),
+            relation('model__dbt_backup', schema=None, type=None))
+        PostgresAdapter.cache_new_relation(self.profile, self.project_cfg,
+                                           relation('model'))
+        schemas['reporting'] = []
+        PostgresAdapter.drop_relation(self.profile, self.project_cfg,
+                                      relation('model__dbt_backup'))
+
+        # so view.sql has to create the view, not rename it
+        self.assertIsNone(PostgresAdapter.get_relation(
+            self.profile, self.project_cfg, schema='reporting',
+            identifier='model_view'))
+        self.assertEqual(self.list_identifiers(), ['model'])
+        self.assertEqual(self.list_relations.call_count, 4)
+
+    def test__dropping_a_missing_relation_keeps_the_cache(self):
+        self.list_identifiers()
+
+        PostgresAdapter.drop_relation(self.profile, self.project_cfg,
+                                      relation('missing'))
+        self.assertEqual(self.list_identifiers(), ['a', 'b'])
+        self.assertEqual(self.list_relations.call_count, 1)
+
+    def test__unquoted_names_are_folded(self):
+        self.list_identifiers()
+        self.project_cfg['quoting']['identifier'] = False
+
+        PostgresAdapter.cache_new_relation(self.profile, self.project_cfg,
+                                           relation('MyModel'))
+        self.assertEqual(self.list_identifiers(), ['a', 'b', 'mymodel'])
+
+    def test__populate(self):
+        PostgresAdapter.populate_relations_cache(
+            self.profile, self.project_cfg, ['analytics', 'new'], ['new'])
+
+        self.assertEqual(self.list_identifiers(), ['a', 'b'])
+        self.assertEqual(self.list_identifiers('new'), [])
+        self.assertEqual(self.list_relations.call_count, 1)
+
+
+class TestSchemasCache(unittest.TestCase):
+
+    def setUp(self):
+        self.profile = {'threads': 4}
+        self.project_cfg = {'quoting': {}}
+
+        patcher = mock.patch.object(PostgresAdapter, 'add_query')
+        self.add_query = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.add_query.return_value = (mock.MagicMock(), mock.MagicMock())
+
+        patcher = mock.patch.object(PostgresAdapter, 'get_existing_schemas')
+        self.get_existing_schemas = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.get_existing_schemas.return_value = ['analytics']
+
+        patcher = mock.patch.object(PostgresAdapter, '_check_schema_exists')
+        self.check_schema_exists = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(PostgresAdapter,
+                                    'commit_if_has_connection')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        PostgresAdapter.enable_relations_cache()
+        self.addCleanup(PostgresAdapter.clear_relations_cache)
+
+    def test__create_schemas_in_one_query(self):
+        created = PostgresAdapter.create_schemas(
+            self.profile, self.project_cfg, {'analytics', 'a', 'b'})
+
+        self.assertEqual(created, {'a', 'b'})
+        self.add_query.assert_called_once_with(
+            self.profile,
+            'create schema if not exists "a";\n'
+            'create schema if not exists "b"')
+
+        for schema in ('analytics', 'a', 'b'):
+            PostgresAdapter.create_schema(self.profile, self.project_cfg,
+                                          schema)
+            self.assertTrue(PostgresAdapter.check_schema_exists(
+                self.profile, self.project_cfg, schema))
+
+        self.assertEqual(self.add_query.call_count, 1)
+        self.assertFalse(self.check_schema_exists.called)
+
+    def test__drop_schema_invalidates(self):
+        PostgresAdapter.create_schemas(self.profile, self.project_cfg,
+                                       {'analytics'})
+        PostgresAdapter.drop_schema(self.profile, self.project_cfg,
+                                    'analytics')
+
+        PostgresAdapter.check_schema_exists(self.profile, self.project_cfg,
+                                            'analytics')
+        self.assertTrue(self.check_schema_exists.called)
+
+    def test__unquoted_names_are_folded(self):
+        with mock.patch.object(SnowflakeAdapter, 'get_existing_schemas',
+                               return_value=['ANALYTICS']), \
+                mock.patch.object(SnowflakeAdapter, '_create_schema') as \
+                create_schema, \
+                mock.patch.object(SnowflakeAdapter, 'release_connection'):
+            created = SnowflakeAdapter.create_schemas(
+                self.profile, self.project_cfg, {'analytics', 'a', 'b'})
+
+        # snowflake creates each schema on its own connection
+        self.assertEqual(created, {'a', 'b'})
+        self.assertEqual(
+            sorted(call[0][2] for call in create_schema.call_args_list),
+            ['a', 'b'])
+
+
+class TestDDLTargets(unittest.TestCase):
+
+    def test__not_ddl(self):
+        self.assertEqual(get_ddl_targets('select created_at from x'), set())
+        self.assertEqual(get_ddl_targets('insert into x (select 1)'), set())
+
+    def test__targets(self):
+        self.assertEqual(
+            get_ddl_targets('create temporary table "Model__dbt_tmp" as ('
+                            'select 1)'),
+            {'model__dbt_tmp'})
+        self.assertEqual(
+            get_ddl_targets('create or replace transient table '
+                            'db."analytics".model as (select 1)'),
+            {'model'})
+        self.assertEqual(
+            get_ddl_targets('alter table "analytics"."a" rename to "b"'),
+            {'a', 'b'})
+        self.assertEqual(
+            get_ddl_targets('alter table analytics.a add column "c" text'),
+            {'a'})
+
+    def test__unknown_targets(self):
+        self.assertIsNone(get_ddl_targets('drop table a cascade'))
+        self.assertIsNone(get_ddl_targets('drop schema analytics'))
+
+
+class TestColumnsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.profile = {}
+        self.project_cfg = {'quoting': {}}
+
+        patcher = mock.patch.object(PostgresAdapter, '_get_columns_in_table')
+        self.get_columns = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.get_columns.side_effect = lambda *args: [
+            PostgresAdapter.Column(args[3], 'text', None, None)
+        ]
+
+        PostgresAdapter.enable_columns_cache()
+        self.addCleanup(PostgresAdapter.clear_columns_cache)
+
+    def get_column_names(self, schema, table):
+        columns = PostgresAdapter.get_columns_in_table(
+            self.profile, self.project_cfg, schema, table)
+        return [c.name for c in columns]
+
+    def test__describes_each_table_once(self):
+        PostgresAdapter.get_missing_columns(
+            self.profile, self.project_cfg, 'analytics', 'a',
+            'analytics', 'b')
+        self.assertEqual(self.get_column_names('analytics', 'a'), ['a'])
+        self.assertEqual(self.get_column_names('analytics', 'b'), ['b'])
+        self.assertEqual(self.get_columns.call_count, 2)
+
+    def test__ddl_invalidates(self):
+        from dbt.adapters.default.impl import columns_cache
+
+        self.get_column_names('analytics', 'a')
+        self.get_column_names('analytics', 'b')
+
+        columns_cache.invalidate_for_sql('alter table "analytics"."A" '
+                                         'add column "c" text')
+        self.get_column_names('analytics', 'a')
+        self.get_column_names('analytics', 'b')
+        self.assertEqual(self.get_columns.call_count, 3)
+
+        columns_cache.invalidate_for_sql('drop schema x')
+        self.get_column_names('analytics', 'b')
+        self.assertEqual(self.get_columns.call_count, 4)
+
+
+class TestColumnsCacheTransactions(unittest.TestCase):
+
+    def test__invalidated_again_when_transaction_ends(self):
+        cache = ColumnsCache()
+        cache.enable()
+
+        cache.invalidate_for_sql('create table a as (select 1)', 'model_a',
+                                 in_transaction=True)
+
+        # another connection can't see the new table yet
+        cache.set_columns(None, 'analytics', 'a', [], cache.get_version('a'))
+        cache.set_columns(None, 'analytics', 'b', [], cache.get_version('b'))
+        self.assertEqual(cache.get_columns(None, 'analytics', 'a'), [])
+
+        cache.end_transaction('model_a')
+        self.assertIsNone(cache.get_columns(None, 'analytics', 'a'))
+        self.assertEqual(cache.get_columns(None, 'analytics', 'b'), [])
+
+    def test__stale_description_not_cached(self):
+        cache = ColumnsCache()
+        cache.enable()
+
+        version = cache.get_version('a')
+        cache.invalidate_for_sql('drop table a')
+        cache.set_columns(None, 'analytics', 'a', [], version)
+        self.assertIsNone(cache.get_columns(None, 'analytics', 'a'))
+
+    def test__ddl_on_other_tables_does_not_race(self):
+        cache = ColumnsCache()
+        cache.enable()
+
+        # another thread creates a different table while "a" is described
+        version = cache.get_version('a')
+        cache.invalidate_for_sql('create table "B" as (select 1)')
+        cache.set_columns(None, 'analytics', 'a', [], version)
+        self.assertEqual(cache.get_columns(None, 'analytics', 'a'), [])
+
+        # unless it isn't clear which tables the DDL changed
+        version = cache.get_version('c')
+        cache.invalidate_for_sql('drop schema analytics cascade')
+        cache.set_columns(None, 'analytics', 'c', [], version)
+        self.assertIsNone(cache.get_columns(None, 'analytics', 'c'))
+        self.assertIsNone(cache.get_columns(None, 'analytics', 'a'))
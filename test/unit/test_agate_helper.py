@@ -53,3 +53,58 @@ class TestAgateHelper(unittest.TestCase):
         self.assertEqual(len(tbl), len(EXPECTED))
         for idx, row in enumerate(tbl):
             self.assertEqual(list(row), EXPECTED[idx])
+
+    def test_csv_rows_reader(self):
+        path = os.path.join(self.tempdir, 'input.csv')
+        with open(path, 'wb') as fp:
+            fp.write(SAMPLE_CSV_DATA.encode('utf-8'))
+        tbl = agate_helper.from_csv(path)
+
+        expected = (
+            '"1","n","test","3.2","2018-08-06 11:33:29.320000+00:00",'
+            '"True",\n'
+            '"2","y","asdf","900","2018-08-06 11:35:29.320000+00:00",'
+            '"False","a string"\n'
+        )
+        self.assertEqual(agate_helper.CsvRowsReader(tbl).read(), expected)
+
+        reader = agate_helper.CsvRowsReader(tbl)
+        chunks = []
+        while True:
+            chunk = reader.read(16)
+            if not chunk:
+                break
+            self.assertLessEqual(len(chunk), 16)
+            chunks.append(chunk)
+        self.assertEqual(''.join(chunks), expected)
+
+    def test_infer_column_type(self):
+        columns = [
+            ['1', '2.5', '-1e5', 'null'],
+            ['1', '$5', '1,000'],
+            ['true', 'False', 'NULL'],
+            ['2016-02-29', '2018-12-31'],
+            ['2018-02-29', '2018-01-01'],
+            ['2018-01-01 10:00:00', '2018-01-01'],
+            ['1:00', '10:00:00'],
+            ['1', '2', 'three'],
+            ['1', '2\n3'],
+            ['1', ''],
+            ['null'],
+        ]
+        for values in columns:
+            expected = agate_helper.DEFAULT_TYPE_TESTER.run(
+                [[v] for v in values], ['a'])[0]
+            for sample_size in (0, 1, 1000):
+                inferred = agate_helper.infer_column_type(values, sample_size)
+                self.assertIs(type(inferred), type(expected), values)
+
+    def test_from_csv_column_types(self):
+        path = os.path.join(self.tempdir, 'input.csv')
+        with open(path, 'wb') as fp:
+            fp.write(SAMPLE_CSV_DATA.encode('utf-8'))
+
+        tbl = agate_helper.from_csv(path, column_types={'a': 'varchar'})
+        self.assertEqual([row['a'] for row in tbl], ['1', '2'])
+        self.assertEqual([row['d'] for row in tbl],
+                         [Decimal('3.2'), Decimal('900')])
@@ -0,0 +1,106 @@
+import unittest
+
+import dbt.flags
+from dbt.api.object import APIObject
+from dbt.contracts.graph.parsed import ParsedNode
+from dbt.contracts.results import RunModelResult
+from dbt.exceptions import JSONValidationException
+
+
+class Thing(APIObject):
+    SCHEMA = {
+        'type': 'object',
+        'properties': {
+            'name': {'type': 'string'},
+            'tags': {'type': 'array'},
+        },
+        'required': ['name'],
+    }
+
+
+class OtherThing(Thing):
+    SCHEMA = {
+        'type': 'object',
+        'properties': {'count': {'type': 'integer'}},
+    }
+
+
+class TestAPIObject(unittest.TestCase):
+
+    def setUp(self):
+        dbt.flags.STRICT_MODE = False
+
+    def tearDown(self):
+        dbt.flags.STRICT_MODE = False
+
+    def test__validator_cached_per_class(self):
+        validator = Thing.get_validator()
+        self.assertIs(Thing.get_validator(), validator)
+        self.assertIsNot(OtherThing.get_validator(), validator)
+        self.assertIs(OtherThing.get_validator().schema, OtherThing.SCHEMA)
+
+    def test__constructor_validates_and_copies(self):
+        with self.assertRaises(JSONValidationException):
+            Thing(tags=[])
+
+        tags = ['a']
+        thing = Thing(name='a', tags=tags)
+        self.assertIsNot(thing.tags, tags)
+
+    def test__from_trusted(self):
+        # top-level containers are copied, but not validated
+        tags = [['a']]
+        thing = Thing.from_trusted(name='a', tags=tags)
+        self.assertIsNot(thing.tags, tags)
+        self.assertEqual(thing.tags, tags)
+        self.assertIs(thing.tags[0], tags[0])
+
+        Thing.from_trusted(tags=[])
+        with self.assertRaises(JSONValidationException):
+            Thing(tags=[])
+
+    def test__from_trusted_node(self):
+        node = ParsedNode.from_trusted(agate_table='table', name='a',
+                                       config={'materialized': 'view'})
+        self.assertEqual(node.agate_table, 'table')
+        self.assertEqual(node.columns, {})
+        self.assertEqual(node.description, '')
+
+        copied = ParsedNode.from_trusted(**node)
+        copied.config['materialized'] = 'table'
+        self.assertEqual(node.config['materialized'], 'view')
+
+    def test__from_trusted_result_shares_node(self):
+        table = object()
+        node = ParsedNode.from_trusted(agate_table=table, name='a')
+
+        result = RunModelResult.from_trusted(node)
+        self.assertIs(result.node, node)
+        self.assertIs(result.node.agate_table, table)
+
+    def test__validate_doesnt_serialize(self):
+        thing = Thing(name='a')
+        thing.serialize = None
+        thing.validate()
+
+    def test__from_trusted_strict(self):
+        dbt.flags.STRICT_MODE = True
+
+        with self.assertRaises(JSONValidationException):
+            Thing.from_trusted(tags=[])
+
+        tags = ['a']
+        self.assertIsNot(Thing.from_trusted(name='a', tags=tags).tags, tags)
+
+    def test__named_property_validated_in_strict_mode(self):
+        node = Thing(name='a')
+        result = RunModelResult.from_trusted(node, failed=True)
+        self.assertEqual(result.node, node)
+        self.assertTrue(result.fail)
+
+        result.execution_time = 'slow'
+        self.assertEqual(result.execution_time, 'slow')
+
+        dbt.flags.STRICT_MODE = True
+        with self.assertRaises(JSONValidationException):
+            result.execution_time = 'slower'
@@ -0,0 +1,71 @@
+import unittest
+
+import networkx as nx
+
+import dbt.exceptions
+from dbt.graph.dag import CompactDAG
+
+
+class CompactDAGTest(unittest.TestCase):
+
+    def setUp(self):
+        # a -> b -> d, a -> c -> d, d -> e, and f on its own
+        self.graph = nx.DiGraph()
+        self.graph.add_nodes_from('abcdef')
+        self.graph.add_edges_from([('a', 'b'), ('a', 'c'), ('b', 'd'),
+                                   ('c', 'd'), ('d', 'e')])
+        self.dag = CompactDAG.from_graph(self.graph)
+
+    def test__structure(self):
+        self.assertEqual(len(self.dag), 6)
+        self.assertIn('f', self.dag)
+        self.assertNotIn('g', self.dag)
+        self.assertEqual(sorted(self.dag.edges()),
+                         sorted(self.graph.edges()))
+
+    def test__closures(self):
+        for node in self.graph.nodes():
+            self.assertEqual(self.dag.get_ancestors(node),
+                             nx.ancestors(self.graph, node))
+            self.assertEqual(self.dag.get_descendants(node),
+                             nx.descendants(self.graph, node))
+
+        # memoized results can't be changed by callers
+        self.dag.get_descendants('a').clear()
+        self.assertEqual(self.dag.get_descendants('a'), set('bcde'))
+
+    def test__closures_of_many(self):
+        self.assertEqual(self.dag.get_all_ancestors(['b', 'd']),
+                         set('abc'))
+        self.assertEqual(self.dag.get_all_descendants(['b', 'c', 'f']),
+                         set('de'))
+        self.assertEqual(self.dag.get_all_children(['a', 'd']),
+                         set('bce'))
+
+    def test__topological_order(self):
+        order = [self.dag.unique_ids[i]
+                 for i in self.dag.topological_order()]
+        self.assertEqual(sorted(order), list('abcdef'))
+        for parent, child in self.graph.edges():
+            self.assertLess(order.index(parent), order.index(child))
+
+        cyclic = CompactDAG(['a', 'b'], [('a', 'b'), ('b', 'a')])
+        with self.assertRaises(dbt.exceptions.InternalException):
+            cyclic.topological_order()
+
+    def test__find_cycle(self):
+        self.assertIsNone(self.dag.find_cycle())
+
+        edges = self.graph.edges() + [('e', 'b')]
+        cyclic = CompactDAG(self.graph.nodes(), edges)
+        self.assertEqual(cyclic.find_cycle(), ['b', 'd', 'e'])
+
+        looped = CompactDAG(['a'], [('a', 'a')])
+        self.assertEqual(looped.find_cycle(), ['a'])
+
+    def test__subgraph(self):
+        subgraph = self.dag.subgraph(['a', 'b', 'd', 'e'])
+        self.assertEqual(sorted(subgraph.nodes()), list('abde'))
+        self.assertEqual(sorted(subgraph.edges()),
+                         [('a', 'b'), ('b', 'd'), ('d', 'e')])
+        self.assertEqual(subgraph.get_ancestors('d'), {'a', 'b'})
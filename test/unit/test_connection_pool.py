@@ -0,0 +1,215 @@
+import mock
+import threading
+import unittest
+
+import dbt.exceptions
+import dbt.flags as flags
+from dbt.adapters.pool import ConnectionPool
+from dbt.adapters.postgres import PostgresAdapter
+
+
+def open_connection(name):
+    return {'name': name, 'state': 'open', 'transaction_open': False}
+
+
+def is_alive(connection):
+    return connection['state'] == 'open'
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ConnectionPool(2)
+        self.close = mock.MagicMock()
+
+    def acquire(self, name):
+        connection = self.pool.acquire(name, open_connection, is_alive,
+                                       self.close)
+        return self.pool.put(name, connection)
+
+    def acquire_in_thread(self, name):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(
+            self.acquire(name)))
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test__reuses_connection_in_same_thread(self):
+        first = self.acquire('model_a')
+        self.pool.release('model_a')
+        second = self.acquire('model_b')
+
+        self.assertIs(first, second)
+        self.assertEqual(second['name'], 'model_b')
+        self.assertIs(self.pool.get('model_b'), second)
+        self.assertIsNone(self.pool.get('model_a'))
+
+        stats = self.pool.stats()
+        self.assertEqual(stats['opens'], 1)
+        self.assertEqual(stats['reuses'], 1)
+        self.assertEqual(stats['acquires'], 2)
+
+    def test__connections_pinned_to_threads(self):
+        first = self.acquire('model_a')
+        self.pool.release('model_a')
+
+        # another thread opens its own connection while it can
+        second = self.acquire_in_thread('model_b')
+        self.assertIsNot(first, second)
+
+        # and only takes over an idle one once the pool is full
+        third = self.acquire_in_thread('model_c')
+        self.assertIs(first, third)
+
+        with self.assertRaises(dbt.exceptions.InternalException):
+            self.acquire('model_d')
+
+    def test__dead_connections_discarded(self):
+        first = self.acquire('model_a')
+        self.pool.release('model_a')
+        first['state'] = 'fail'
+
+        second = self.acquire('model_b')
+        self.assertIsNot(first, second)
+        self.close.assert_called_once_with(first)
+
+        stats = self.pool.stats()
+        self.assertEqual(stats['opens'], 2)
+        self.assertEqual(stats['closes'], 1)
+        self.assertEqual(stats['allocated'], 1)
+
+    def test__put_existing_name(self):
+        first = self.acquire('master')
+        spare = self.pool.acquire('master', open_connection, is_alive,
+                                  self.close)
+
+        self.assertIs(self.pool.put('master', spare), first)
+        self.assertIs(self.acquire('model_a'), spare)
+
+    def test__warm_up(self):
+        self.acquire('model_a')
+        self.pool.release('model_a')
+
+        # one connection is already idle, so only one more is opened
+        self.assertEqual(self.pool.warm_up(2, open_connection), 1)
+        self.assertEqual(self.pool.warm_up(2, open_connection), 0)
+
+        # the warm connection goes to the first thread that asks
+        self.acquire_in_thread('model_b')
+        stats = self.pool.stats()
+        self.assertEqual(stats['opens'], 2)
+        self.assertEqual(stats['reuses'], 1)
+
+    def test__warm_up_respects_limit_and_errors(self):
+        self.assertEqual(self.pool.warm_up(5, open_connection), 2)
+
+        pool = ConnectionPool(2)
+        failing = mock.MagicMock(side_effect=RuntimeError('bad credentials'))
+        self.assertEqual(pool.warm_up(2, failing), 0)
+        self.assertEqual(pool.stats()['allocated'], 0)
+
+    def test__waits_for_warm_up(self):
+        self.acquire('master')
+        opening = threading.Event()
+        proceed = threading.Event()
+
+        def slow_open(name):
+            opening.set()
+            proceed.wait()
+            return open_connection(name)
+
+        warm_up = threading.Thread(target=self.pool.warm_up,
+                                   args=(1, slow_open))
+        warm_up.start()
+        opening.wait()
+
+        # the pool is full, but the connection being warmed up is on its way
+        threading.Timer(0.1, proceed.set).start()
+        connection = self.acquire('model_a')
+        warm_up.join()
+
+        self.assertEqual(connection['name'], 'model_a')
+        self.assertEqual(self.pool.stats()['opens'], 2)
+
+    def test__drain(self):
+        self.acquire('model_a')
+        self.acquire('model_b')
+        self.pool.release('model_b')
+
+        in_use, idle = self.pool.drain()
+        self.assertEqual(list(in_use), ['model_a'])
+        self.assertEqual(len(idle), 1)
+        self.assertEqual(self.pool.stats()['allocated'], 0)
+
+
+class TestAdapterConnections(unittest.TestCase):
+
+    def setUp(self):
+        flags.STRICT_MODE = False
+
+        self.profile = {
+            'dbname': 'pool',
+            'user': 'root',
+            'host': 'database',
+            'pass': 'password',
+            'port': 5432,
+            'schema': 'public',
+            'threads': 1,
+        }
+
+        def open_connection(connection):
+            result = connection.copy()
+            result['handle'] = mock.MagicMock(closed=0)
+            result['state'] = 'open'
+            return result
+
+        patcher = mock.patch.object(PostgresAdapter, 'open_connection',
+                                    side_effect=open_connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        PostgresAdapter.cleanup_connections()
+        self.addCleanup(PostgresAdapter.cleanup_connections)
+
+    def test__get_and_release(self):
+        connection = PostgresAdapter.get_connection(self.profile, 'model_a')
+        self.assertIs(PostgresAdapter.get_connection(self.profile, 'model_a'),
+                      connection)
+        self.assertIs(PostgresAdapter.reload(connection), connection)
+
+        PostgresAdapter.release_connection(self.profile, 'model_a')
+        self.assertIs(PostgresAdapter.get_connection(self.profile, 'model_b'),
+                      connection)
+
+        stats = PostgresAdapter.get_connection_stats()
+        self.assertEqual(stats['opens'], 1)
+        self.assertEqual(stats['reuses'], 1)
+        self.assertEqual(PostgresAdapter.total_connections_allocated(), 1)
+
+    def test__equal_profiles_share_a_pool(self):
+        # every runner gets its own copy of the profile
+        connection = PostgresAdapter.get_connection(self.profile, 'model_a')
+        PostgresAdapter.release_connection(dict(self.profile), 'model_a')
+        self.assertIs(
+            PostgresAdapter.get_connection(dict(self.profile), 'model_b'),
+            connection)
+
+        profile = dict(self.profile, threads=2)
+        self.assertIs(PostgresAdapter.get_connection(profile, 'model_b'),
+                      connection)
+
+        profile = dict(self.profile, keyfile_json={'key': ['value']})
+        self.assertIsNot(PostgresAdapter.get_connection(profile, 'model_c'),
+                         connection)
+        self.assertEqual(len(PostgresAdapter.get_connection_pools()), 2)
+
+    def test__closed_handle_not_reused(self):
+        connection = PostgresAdapter.get_connection(self.profile, 'model_a')
+        PostgresAdapter.release_connection(self.profile, 'model_a')
+        connection['handle'].closed = 1
+
+        self.assertIsNot(
+            PostgresAdapter.get_connection(self.profile, 'model_b'),
+            connection)
+        self.assertEqual(PostgresAdapter.get_connection_stats()['closes'], 1)
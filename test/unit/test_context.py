@@ -1,8 +1,10 @@
 import mock
 import unittest
 
+from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.graph.parsed import ParsedNode
 from dbt.context.common import Var
+import dbt.context.common
 import dbt.exceptions
 
 class TestVar(unittest.TestCase):
@@ -51,3 +53,67 @@ class TestVar(unittest.TestCase):
         var.assert_var_defined('foo', 'bar')
         with self.assertRaises(dbt.exceptions.CompilationException):
             var.assert_var_defined('foo', None)
+
+
+class TestAddMacros(unittest.TestCase):
+    def _macro(self, package_name, name):
+        macro = mock.MagicMock(resource_type='macro',
+                               package_name=package_name)
+        macro.name = name
+        macro.generator.return_value = mock.MagicMock(
+            return_value='{}.{}'.format(package_name, name))
+        return macro
+
+    def setUp(self):
+        self.macros = {
+            'macro.dbt.shared': self._macro('dbt', 'shared'),
+            'macro.dbt.only_global': self._macro('dbt', 'only_global'),
+            'macro.root.shared': self._macro('root', 'shared'),
+            'macro.other.shared': self._macro('other', 'shared'),
+        }
+        # the macros are mocks, so they can't be validated
+        patcher = mock.patch.object(Manifest, 'validate')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.manifest = Manifest(macros=self.macros, nodes={}, docs={},
+                                 generated_at='2018-01-01T00:00:00Z')
+        self.model = mock.MagicMock(package_name='root')
+
+    def test_precedence(self):
+        context = dbt.context.common._add_macros({}, self.model,
+                                                 self.manifest)
+
+        self.assertEqual(context['shared'](), 'root.shared')
+        self.assertEqual(context['only_global'](), 'dbt.only_global')
+        self.assertEqual(context['other']['shared'](), 'other.shared')
+        self.assertEqual(context['dbt']['shared'](), 'dbt.shared')
+        self.assertNotIn('other', context['root'])
+
+    def test_lazy_and_memoized(self):
+        context = dbt.context.common._add_macros({}, self.model,
+                                                 self.manifest)
+
+        for macro in self.macros.values():
+            self.assertFalse(macro.generator.called)
+
+        context['shared']()
+        context['shared']()
+        context['root']['shared']()
+
+        root_shared = self.macros['macro.root.shared']
+        root_shared.generator.assert_called_once_with(context)
+        self.assertFalse(self.macros['macro.dbt.shared'].generator.called)
+
+    def test_grouped_per_manifest(self):
+        self.assertIs(self.manifest.get_macros_by_package(),
+                      self.manifest.get_macros_by_package())
+
+        # a new manifest with the same macros dict, changed in place, sees
+        # the change
+        self.macros['macro.root.shared'] = self._macro('root', 'replaced')
+        manifest = Manifest(macros=self.macros, nodes={}, docs={},
+                            generated_at='2018-01-01T00:00:00Z')
+        context = dbt.context.common._add_macros({}, self.model, manifest)
+        self.assertEqual(context['replaced'](), 'root.replaced')
+        self.assertNotIn('shared', context['root'])
@@ -0,0 +1,149 @@
+import mock
+import unittest
+
+import dbt.exceptions
+
+from dbt.adapters.postgres import PostgresAdapter
+from dbt.fused_tests import FusedTests, get_fusable_test, get_fused_sql, \
+    parse_schema_test
+from dbt.parser.schemas import build_test_raw_sql
+
+
+def make_test(unique_id, test_type, test_args, model='model_one',
+              tags=('schema',), namespace=None):
+    return {
+        'unique_id': unique_id,
+        'resource_type': 'test',
+        'tags': list(tags),
+        'raw_sql': build_test_raw_sql(namespace, model, test_type,
+                                      test_args),
+        'depends_on': {'nodes': ['model.root.{}'.format(model)]},
+    }
+
+
+class TestParseSchemaTests(unittest.TestCase):
+
+    def test__parse(self):
+        raw_sql = build_test_raw_sql(None, 'model_one', 'accepted_values',
+                                     {'column_name': 'id',
+                                      'values': ['a', 'b']})
+        self.assertEqual(
+            parse_schema_test(raw_sql),
+            ('accepted_values', {'column_name': 'id', 'values': ['a', 'b']}))
+
+    def test__not_fusable(self):
+        # data tests, namespaced tests, relationships, and tests with
+        # arguments that aren't literals are run on their own
+        self.assertIsNone(get_fusable_test(make_test(
+            'a', 'not_null', {'column_name': 'id'}, tags=['data'])))
+        self.assertIsNone(get_fusable_test(make_test(
+            'b', 'not_null', {'column_name': 'id'}, namespace='other')))
+        self.assertIsNone(get_fusable_test(make_test(
+            'c', 'relationships', {'column_name': 'id', 'field': 'id',
+                                   'to': "ref('model_two')"})))
+        self.assertIsNone(get_fusable_test(make_test(
+            'd', 'accepted_values', {'column_name': 'id',
+                                     'values': "var('ids')"})))
+
+    def test__v1_arguments(self):
+        self.assertEqual(
+            get_fusable_test(make_test('a', 'unique', {'arg': 'id'})),
+            {'test_type': 'unique', 'model_id': 'model.root.model_one',
+             'column_name': 'id', 'values': None})
+        self.assertEqual(
+            get_fusable_test(make_test('b', 'accepted_values',
+                                       {'field': 'id', 'values': [1, 2]})),
+            {'test_type': 'accepted_values',
+             'model_id': 'model.root.model_one',
+             'column_name': 'id', 'values': [1, 2]})
+
+    def test__fused_sql(self):
+        tests = [
+            {'test_type': 'not_null', 'column_name': 'id'},
+            {'test_type': 'accepted_values', 'column_name': 'status',
+             'values': ['a', 'b']},
+            {'test_type': 'unique', 'column_name': 'id'},
+        ]
+
+        self.assertEqual(
+            get_fused_sql(tests, '"analytics"."model_one"'),
+            'select\n'
+            '    count(case when id is null then 1 end) as dbt_test_0,\n'
+            "    count(distinct case when status not in ('a', 'b') "
+            'then status end) as dbt_test_1,\n'
+            '    (select count(*) from (select id from '
+            '"analytics"."model_one" where id is not null group by id '
+            'having count(*) > 1) validation_errors) as dbt_test_2\n'
+            'from "analytics"."model_one"')
+
+        self.assertNotIn('\nfrom', get_fused_sql(tests[2:], 'model_one'))
+
+
+class TestFusedTests(unittest.TestCase):
+
+    def setUp(self):
+        self.profile = {'dbname': 'postgres'}
+        self.manifest = mock.MagicMock()
+        self.manifest.macros = {
+            'macro.dbt.test_unique': {'name': 'test_unique',
+                                      'package_name': 'dbt'},
+        }
+        self.manifest.nodes = {
+            'model.root.model_one': {'schema': 'analytics',
+                                     'alias': 'model_one',
+                                     'config': {'materialized': 'table'}},
+            'model.root.model_two': {'schema': 'analytics',
+                                     'alias': 'model_two',
+                                     'config': {'materialized': 'ephemeral'}},
+        }
+
+        self.nodes = [
+            make_test('test.not_null', 'not_null', {'column_name': 'id'}),
+            make_test('test.unique', 'unique', {'column_name': 'id'}),
+            make_test('test.alone', 'not_null', {'column_name': 'id'},
+                      model='model_three'),
+            make_test('test.ephemeral_a', 'not_null', {'column_name': 'a'},
+                      model='model_two'),
+            make_test('test.ephemeral_b', 'not_null', {'column_name': 'b'},
+                      model='model_two'),
+        ]
+
+    def fused_tests(self):
+        return FusedTests(PostgresAdapter, self.profile, self.manifest,
+                          self.nodes)
+
+    def test__groups(self):
+        fused = self.fused_tests()
+        self.assertEqual(fused.groups, {
+            'model.root.model_one': ['test.not_null', 'test.unique'],
+        })
+
+    def test__overridden_macros_not_fused(self):
+        self.manifest.macros['macro.root.test_unique'] = {
+            'name': 'test_unique', 'package_name': 'root'}
+        self.nodes.append(make_test('test.not_null_2', 'not_null',
+                                    {'column_name': 'name'}))
+
+        fused = self.fused_tests()
+        self.assertEqual(fused.groups, {
+            'model.root.model_one': ['test.not_null', 'test.not_null_2'],
+        })
+
+    def test__status(self):
+        fused = self.fused_tests()
+        execute = mock.MagicMock(return_value=[0, 3])
+
+        self.assertEqual(fused.get_status('test.unique', execute), 3)
+        self.assertEqual(fused.get_status('test.not_null', execute), 0)
+        self.assertIsNone(fused.get_status('test.alone', execute))
+        execute.assert_called_once_with(
+            fused.get_fused_sql('model.root.model_one'))
+
+    def test__fused_query_fails(self):
+        fused = self.fused_tests()
+        execute = mock.MagicMock(
+            side_effect=dbt.exceptions.DatabaseException('no column "id"'))
+
+        self.assertIsNone(fused.get_status('test.unique', execute))
+        self.assertIsNone(fused.get_status('test.not_null', execute))
+        self.assertEqual(execute.call_count, 1)
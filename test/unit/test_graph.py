@@ -182,7 +182,7 @@ class GraphTest(unittest.TestCase):
             "model_four": "table"
         }
 
-        nodes = linker.graph.node
+        nodes = dict(linker.nodes(data=True))
 
         for model, expected in expected_materialization.items():
             key = 'model.test_models_compile.{}'.format(model)
@@ -216,7 +216,7 @@ class GraphTest(unittest.TestCase):
         self.assertEqual(linker.edges(), [])
 
         self.assertEqual(
-                linker.graph.node[node].get('config', {}).get('materialized'),
+                linker.get_node(node).get('config', {}).get('materialized'),
                 'incremental')
 
     def test__dependency_list(self):
@@ -157,3 +157,52 @@ class GraphSelectionTest(unittest.TestCase):
         test(('X', 'a'), ('X', 'b'), False)
         test(('X', 'a'), ('X', 'a', 'b'), False)
         test(('X', 'a'), ('Y', '*'), False)
+
+    def test__index_qualified_names(self):
+        graph = nx.DiGraph()
+        fqns = [
+            ('X', 'a'),
+            ('X', 'a', 'b', 'c'),
+            ('X', 'staging', 'a'),
+            ('Y', 'a', 'd'),
+        ]
+        for i, fqn in enumerate(fqns):
+            graph.add_node('m.{}.{}'.format(fqn[0], i), fqn=list(fqn))
+
+        index = graph_selector.SelectionIndex(graph)
+        package_names = index.get_package_names()
+        self.assertEqual(package_names, {'X', 'Y'})
+
+        cases = [
+            (['a'], {0, 1, 2, 3}),
+            (['*'], {0, 1, 2, 3}),
+            (['X', 'a'], {0, 1, 2}),
+            (['X', 'a', 'c'], {1}),
+            (['X', 'a', '*'], {0, 1}),
+            (['staging', '*'], {2}),
+            (['a', 'd'], {3}),
+            (['Y', '*'], {3}),
+            (['b'], set()),
+        ]
+        for selector, expected in cases:
+            self.assertEqual(
+                index.get_nodes_by_qualified_name(selector, package_names),
+                set('m.{}.{}'.format(fqns[i][0], i) for i in expected),
+                selector)
+
+    def test__index_tags_and_resource_types(self):
+        graph = nx.DiGraph()
+        graph.add_node('model.X.a', fqn=['X', 'a'], resource_type='model',
+                       tags=['nightly'])
+        graph.add_node('model.X.b', fqn=['X', 'b'], resource_type='model',
+                       tags=['nightly', 'hourly'])
+        graph.add_node('test.X.c', fqn=['X', 'c'], resource_type='test',
+                       tags=['schema'])
+
+        index = graph_selector.SelectionIndex(graph)
+        self.assertEqual(index.get_nodes_by_tags(['hourly', 'schema']),
+                         {'model.X.b', 'test.X.c'})
+        self.assertEqual(index.get_nodes_by_resource_types(['model']),
+                         {'model.X.a', 'model.X.b'})
+        self.assertEqual(index.get_package_names({'test.X.c'}), {'X'})
+        self.assertEqual(index.get_package_names({'model.Y.z'}), set())
@@ -0,0 +1,138 @@
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+import dbt.clients.jinja
+from dbt.clients.jinja import MacroFuzzEnvironment
+
+
+class TestTemplateCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.real_compile = MacroFuzzEnvironment.compile
+        dbt.clients.jinja._compiled_code.clear()
+
+    def tearDown(self):
+        dbt.clients.jinja._bytecode_cache = None
+        dbt.clients.jinja._compiled_code.clear()
+        shutil.rmtree(self.tempdir)
+
+    def test__environment_is_shared(self):
+        self.assertIs(dbt.clients.jinja.get_environment(),
+                      dbt.clients.jinja.get_environment())
+        self.assertIsNot(dbt.clients.jinja.get_environment(),
+                         dbt.clients.jinja.get_environment(True))
+
+    def test__identical_source_compiles_once(self):
+        source = '{% for x in [value] %}{{ x }}{% endfor %}'
+
+        with mock.patch.object(MacroFuzzEnvironment, 'compile',
+                               autospec=True,
+                               side_effect=self.real_compile) as compile:
+            first = dbt.clients.jinja.get_rendered(source, {'value': 1})
+            second = dbt.clients.jinja.get_rendered(source, {'value': 2})
+
+        self.assertEqual(first, '1')
+        self.assertEqual(second, '2')
+        self.assertEqual(compile.call_count, 1)
+
+    def test__bytecode_cache_survives_process(self):
+        cache_dir = os.path.join(self.tempdir, 'jinja_cache')
+        dbt.clients.jinja.initialize_bytecode_cache(cache_dir)
+
+        source = 'select {{ 1 + 1 }}'
+        self.assertEqual(dbt.clients.jinja.get_rendered(source, {}),
+                         'select 2')
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        # simulate a new invocation: nothing in memory, only what's on disk
+        dbt.clients.jinja._compiled_code.clear()
+        with mock.patch.object(MacroFuzzEnvironment, 'compile') as compile:
+            self.assertEqual(dbt.clients.jinja.get_rendered(source, {}),
+                             'select 2')
+            self.assertFalse(compile.called)
+
+    def test__bytecode_cache_pruned(self):
+        cache_dir = os.path.join(self.tempdir, 'jinja_cache')
+        dbt.clients.jinja.initialize_bytecode_cache(cache_dir)
+        dbt.clients.jinja.get_rendered('select 1', {})
+        current = os.listdir(cache_dir)
+
+        # an entry from another version of dbt or jinja, and an old one
+        other_version = os.path.join(cache_dir, '__jinja2_other_key.cache')
+        open(other_version, 'w').close()
+        unused = os.path.join(cache_dir,
+                              current[0].replace('.cache', 'x.cache'))
+        open(unused, 'w').close()
+        os.utime(unused, (0, 0))
+
+        dbt.clients.jinja.initialize_bytecode_cache(cache_dir)
+        self.assertEqual(os.listdir(cache_dir), current)
+
+    def test__bytecode_name_includes_versions(self):
+        env = dbt.clients.jinja.get_environment()
+        name = dbt.clients.jinja._get_bytecode_name(env, 'select 1', False)
+
+        with mock.patch.object(dbt.clients.jinja, '_VERSIONS_HASH', 'other'):
+            self.assertNotEqual(
+                dbt.clients.jinja._get_bytecode_name(env, 'select 1', False),
+                name)
+
+    def test__compiled_code_bounded(self):
+        cache = dbt.clients.jinja.CompiledCodeCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+
+        # b is the least recently used
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+
+class TestMacroGenerator(unittest.TestCase):
+
+    def test__module_built_once_per_context(self):
+        source = '{% macro my_macro(x) %}{{ x }}{% endmacro %}'
+        template = dbt.clients.jinja.get_template(source, {})
+        node = {'name': 'my_macro', 'resource_type': 'macro'}
+        generator = dbt.clients.jinja.macro_generator(template, node)
+
+        with mock.patch.object(template, 'make_module',
+                               wraps=template.make_module) as make_module:
+            call = generator(dbt.clients.jinja.MacroContext())
+            self.assertEqual(call(1), '1')
+            self.assertEqual(call(2), '2')
+            self.assertEqual(make_module.call_count, 1)
+
+            generator(dbt.clients.jinja.MacroContext())(3)
+            self.assertEqual(make_module.call_count, 2)
+
+            # plain dicts can't tell when they change
+            call = generator({})
+            call(4)
+            call(5)
+            self.assertEqual(make_module.call_count, 4)
+
+    def test__module_sees_context_changes(self):
+        source = '{% macro my_macro() %}{{ value }}{% endmacro %}'
+        template = dbt.clients.jinja.get_template(source, {})
+        node = {'name': 'my_macro', 'resource_type': 'macro'}
+        generator = dbt.clients.jinja.macro_generator(template, node)
+
+        context = dbt.clients.jinja.MacroContext({'value': 1})
+        call = generator(context)
+        self.assertEqual(call(), '1')
+
+        context.update({'value': 2})
+        self.assertEqual(call(), '2')
+
+        context['value'] = 3
+        self.assertEqual(call(), '3')
+
+        context.pop('value')
+        self.assertEqual(call(), '')
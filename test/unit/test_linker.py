@@ -1,8 +1,13 @@
 import mock
+import os
+import shutil
+import tempfile
+import time
 import unittest
 
 import dbt.utils
 
+import dbt.linker
 from dbt.compilation import Linker
 
 
@@ -73,6 +78,53 @@ class LinkerTest(unittest.TestCase):
         expected_limit_2 = [['B'], ['A']]
         self.assertEqual(expected_limit_2, actual_limit_2)
 
+    def test_linker_dependencies_through_non_blocking_nodes(self):
+        actual_deps = [('A', 'B'), ('B', 'C'), ('D', 'C')]
+
+        for (l, r) in actual_deps:
+            self.linker.dependency(l, r)
+
+        for node in self.linker.nodes():
+            self.linker.update_node_data(node, {'name': node})
+
+        # B doesn't block, but A still has to wait for C
+        dbt.utils.is_blocking_dependency.side_effect = \
+            lambda node: node['name'] != 'B'
+
+        actual = self.linker.as_dependency_list(['A', 'C', 'D'])
+        self.assertEqual(actual, [['C'], ['A', 'D']])
+
+    def test_linker_blocking_parents(self):
+        actual_deps = [('A', 'B'), ('B', 'C'), ('D', 'C'), ('E', 'D')]
+
+        for (l, r) in actual_deps:
+            self.linker.dependency(l, r)
+
+        for node in self.linker.nodes():
+            self.linker.update_node_data(node, {'name': node})
+
+        # B doesn't block, and D isn't selected
+        dbt.utils.is_blocking_dependency.side_effect = \
+            lambda node: node['name'] != 'B'
+
+        actual = self.linker.get_blocking_parents(['A', 'B', 'C', 'E'])
+        self.assertEqual(actual, {
+            'A': {'C'},
+            'B': {'C'},
+            'C': set(),
+            'E': {'C'},
+        })
+
+    def test_linker_dependency_list_counts_ancestors(self):
+        # C has two blocking ancestors and D only one, so D goes first even
+        # though neither is on a longer path than the other
+        for (l, r) in [('C', 'A'), ('C', 'B'), ('D', 'A')]:
+            self.linker.dependency(l, r)
+
+        actual = self.linker.as_dependency_list()
+        self.assertEqual([sorted(level) for level in actual],
+                         [['A', 'B'], ['D'], ['C']])
+
     def test_linker_bad_limit_throws_runtime_error(self):
         actual_deps = [('A', 'B'), ('B', 'C'), ('C', 'D')]
 
@@ -90,6 +142,35 @@ class LinkerTest(unittest.TestCase):
 
         self.assertIsNotNone(self.linker.find_cycles())
 
+    def test__find_cycles__format(self):
+        self.linker.dependency('A', 'B')
+        self.linker.dependency('B', 'A')
+        self.linker.dependency('C', 'A')
+
+        self.assertIn(self.linker.find_cycles(),
+                      ['A --> B --> A', 'B --> A --> B'])
+
+    def test__find_cycles__dense(self):
+        # every node depends on every node before it, except that the first
+        # depends on the last. Enumerating every elementary cycle of this
+        # graph never finishes; finding one should be instant.
+        nodes = ['node_{}'.format(i) for i in range(300)]
+        for i, node in enumerate(nodes):
+            for parent in nodes[:i]:
+                self.linker.dependency(node, parent)
+
+        start = time.time()
+        self.assertIsNone(self.linker.find_cycles())
+
+        self.linker.dependency(nodes[0], nodes[-1])
+        cycle = self.linker.find_cycles().split(' --> ')
+        self.assertLess(time.time() - start, 5)
+
+        edges = set(self.linker.edges())
+        self.assertEqual(cycle[0], cycle[-1])
+        for parent, child in zip(cycle, cycle[1:]):
+            self.assertIn((parent, child), edges)
+
     def test__find_cycles__no_cycles(self):
         actual_deps = [('A', 'B'), ('B', 'C'), ('C', 'D')]
 
@@ -97,3 +178,50 @@ class LinkerTest(unittest.TestCase):
             self.linker.dependency(l, r)
 
         self.assertIsNone(self.linker.find_cycles())
+
+    def test_linker_node_data_not_copied(self):
+        data = {'resource_type': 'model'}
+        self.linker.dependency('A', 'B')
+        self.linker.update_node_data('A', data)
+
+        self.assertIs(self.linker.get_node('A'), data)
+        self.assertEqual(self.linker.get_node('B'), {})
+        self.assertEqual(dict(self.linker.nodes(data=True)),
+                         {'A': data, 'B': {}})
+
+    def test_linker_dependent_nodes(self):
+        for (l, r) in [('A', 'B'), ('B', 'C'), ('D', 'C')]:
+            self.linker.dependency(l, r)
+
+        self.assertEqual(self.linker.get_dependent_nodes('C'),
+                         {'A', 'B', 'D'})
+
+        # the compact graph is rebuilt once the graph changes
+        self.linker.dependency('E', 'A')
+        self.assertEqual(self.linker.get_dependent_nodes('C'),
+                         {'A', 'B', 'D', 'E'})
+        self.assertEqual(self.linker.remove_node('B'), {'A', 'E'})
+        self.assertEqual(self.linker.get_dependent_nodes('C'), {'D'})
+
+    def test_linker_write_and_read_graph(self):
+        nodes = {
+            'A': {'unique_id': 'A', 'resource_type': 'model'},
+            'B': {'unique_id': 'B', 'resource_type': 'model'},
+        }
+        self.linker.dependency('A', 'B')
+        for node, data in nodes.items():
+            self.linker.update_node_data(node, data)
+
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        graph_file = os.path.join(tmpdir, 'graph.gpickle')
+        self.linker.write_graph(graph_file)
+
+        # only the structure of the graph is written
+        read = dbt.linker.from_file(graph_file)
+        self.assertEqual(read.edges(), [('B', 'A')])
+        self.assertEqual(read.get_node('A'), {})
+
+        read = dbt.linker.from_file(graph_file, nodes)
+        self.assertEqual(read.get_node('A'), nodes['A'])
+        self.assertEqual(read.as_dependency_list(), [['B'], ['A']])
@@ -2,9 +2,11 @@ import unittest
 import mock
 
 import copy
+import json
 import os
 
 import dbt.flags
+import dbt.utils
 from dbt import tracking
 from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.graph.parsed import ParsedNode
@@ -242,6 +244,16 @@ class ManifestTest(unittest.TestCase):
             []
         )
 
+    @freezegun.freeze_time('2018-02-14T09:15:13Z')
+    def test__serialize_chunks(self):
+        for nodes in ({}, copy.copy(self.nested_nodes)):
+            manifest = Manifest(nodes=nodes, macros={}, docs={},
+                                generated_at=timestring())
+            expected = json.dumps(manifest.serialize(),
+                                  cls=dbt.utils.JSONEncoder)
+            chunks = manifest.serialize_chunks(dbt.utils.get_json_encoder())
+            self.assertEqual(''.join(chunks), expected)
+
     def test__to_flat_graph(self):
         nodes = copy.copy(self.nested_nodes)
         manifest = Manifest(nodes=nodes, macros={}, docs={},
@@ -255,6 +267,31 @@ class ManifestTest(unittest.TestCase):
         for node in flat_nodes.values():
             self.assertEqual(set(node), expected_keys)
 
+    def test__find_refable_by_name(self):
+        nodes = copy.copy(self.nested_nodes)
+        manifest = Manifest(nodes=nodes, macros={}, docs={},
+                            generated_at=timestring())
+
+        self.assertIs(manifest.find_refable_by_name('events', 'root'),
+                      nodes['model.root.events'])
+        self.assertIs(manifest.find_refable_by_name('events', 'snowplow'),
+                      nodes['model.snowplow.events'])
+        self.assertIn(manifest.find_refable_by_name('events', None),
+                      [nodes['model.root.events'],
+                       nodes['model.snowplow.events']])
+        self.assertIsNone(manifest.find_refable_by_name('dep', 'snowplow'))
+        self.assertIsNone(manifest.find_refable_by_name('missing', None))
+
+    def test__add_nodes_updates_index(self):
+        nodes = copy.copy(self.nested_nodes)
+        added = nodes.pop('model.root.multi')
+        manifest = Manifest(nodes=nodes, macros={}, docs={},
+                            generated_at=timestring())
+
+        self.assertIsNone(manifest.find_refable_by_name('multi', None))
+        manifest.add_nodes({'model.root.multi': added})
+        self.assertIs(manifest.find_refable_by_name('multi', 'root'), added)
+
     @mock.patch.object(tracking, 'active_user')
     def test_get_metadata(self, mock_user):
         mock_user.id = 'cfc9500f-dc7f-4c83-9ea7-2c581c1b38cf'
@@ -1,12 +1,17 @@
 import unittest
 import mock
 
+import hashlib
 import os
+import shutil
+import tempfile
 import yaml
 
 import dbt.flags
 import dbt.parser
+import dbt.parser.cache
 from dbt.parser import ModelParser, MacroParser, DataTestParser, SchemaParser, ParserUtils
+from dbt.parser.seeds import SeedParser
 from dbt.utils import timestring
 
 from dbt.node_types import NodeType
@@ -1769,3 +1774,74 @@ class ParserTest(unittest.TestCase):
                 )
             }
         )
+
+    def test__parse_cache(self):
+        models = [{
+            'name': 'model_one',
+            'resource_type': 'model',
+            'package_name': 'root',
+            'original_file_path': 'model_one.sql',
+            'root_path': get_os_path('/usr/src/app'),
+            'path': 'model_one.sql',
+            'raw_sql': ("{{ config(materialized='table') }}"
+                        "select * from {{ ref('events') }}"),
+        }]
+        all_projects = {'root': self.root_project_config,
+                        'snowplow': self.snowplow_project_config}
+
+        cache = dbt.parser.cache.ParseCache('key')
+        dbt.parser.cache.active_cache = cache
+        try:
+            first = ModelParser.parse_sql_nodes(
+                models, self.root_project_config, all_projects)
+            self.assertEqual(cache.misses, 1)
+
+            # a warm cache must not render anything
+            with mock.patch('dbt.clients.jinja.get_rendered') as rendered:
+                cache = dbt.parser.cache.ParseCache('key', cache._current)
+                dbt.parser.cache.active_cache = cache
+                second = ModelParser.parse_sql_nodes(
+                    models, self.root_project_config, all_projects)
+                self.assertFalse(rendered.called)
+
+            self.assertEqual(cache.hits, 1)
+            self.assertEqual(first, second)
+            self.assertEqual(second['model.root.model_one'].refs,
+                             [['events']])
+            self.assertEqual(
+                second['model.root.model_one'].config['materialized'],
+                'table')
+
+            # changing the file contents misses the cache
+            models[0]['raw_sql'] = 'select 1 as id'
+            third = ModelParser.parse_sql_nodes(
+                models, self.root_project_config, all_projects)
+            self.assertEqual(cache.misses, 1)
+            self.assertEqual(third['model.root.model_one'].refs, [])
+        finally:
+            dbt.parser.cache.reset_cache()
+
+    def test__seeds_parsed_without_tables(self):
+        root_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root_dir)
+        os.mkdir(os.path.join(root_dir, 'data'))
+        contents = b'id,name\n1,a\n2,b\n'
+        with open(os.path.join(root_dir, 'data', 'seed.csv'), 'wb') as fp:
+            fp.write(contents)
+
+        all_projects = {'root': self.root_project_config}
+
+        with mock.patch('dbt.clients.agate_helper.from_csv') as from_csv:
+            nodes = SeedParser.load_and_parse(
+                'root', self.root_project_config, all_projects, root_dir,
+                ['data'])
+            self.assertFalse(from_csv.called)
+
+        node = nodes['seed.root.seed']
+        self.assertIsNone(node.agate_table)
+        self.assertEqual(node.seed_hash,
+                         hashlib.sha256(contents).hexdigest())
+
+        table = SeedParser.load_agate_table(node)
+        self.assertEqual(table.column_names, ('id', 'name'))
+        self.assertEqual(len(table.rows), 2)
@@ -1,4 +1,6 @@
+import agate
 import mock
+import psycopg2
 import unittest
 
 import dbt.flags as flags
@@ -79,3 +81,46 @@ class TestPostgresAdapter(unittest.TestCase):
             port=5432,
             connect_timeout=10)
 
+
+class TestPostgresBulkLoad(unittest.TestCase):
+
+    def setUp(self):
+        flags.STRICT_MODE = False
+
+        self.profile = {}
+        self.handle = mock.MagicMock()
+        self.cursor = self.handle.cursor.return_value
+        self.relation = PostgresAdapter.Relation.create(
+            schema='analytics', identifier='seed')
+        self.table = agate.Table([(1, 'a'), (2, None)], ['id', 'name'])
+
+        patcher = mock.patch.object(PostgresAdapter, 'get_connection')
+        get_connection = patcher.start()
+        self.addCleanup(patcher.stop)
+        get_connection.return_value = {
+            'name': 'seed',
+            'handle': self.handle,
+            'transaction_open': True,
+        }
+
+    def bulk_load(self):
+        return PostgresAdapter.bulk_load_csv_rows(
+            self.profile, {}, self.relation, self.table, 'seed')
+
+    def test_copy(self):
+        sql = self.bulk_load()
+
+        self.assertEqual(
+            sql, 'copy "analytics"."seed" (id, name) from stdin with csv')
+        copy_sql, reader = self.cursor.copy_expert.call_args[0]
+        self.assertEqual(copy_sql, sql)
+        self.assertEqual(reader.read(), '"1","a"\n"2",\n')
+        self.cursor.execute.assert_called_with(
+            'release savepoint dbt_copy_csv_rows')
+
+    def test_copy_falls_back(self):
+        self.cursor.copy_expert.side_effect = psycopg2.DataError('bad value')
+
+        self.assertIsNone(self.bulk_load())
+        self.cursor.execute.assert_called_with(
+            'rollback to savepoint dbt_copy_csv_rows')
@@ -1,5 +1,7 @@
 import unittest
 import mock
+import agate
+import psycopg2
 
 import dbt.adapters
 import dbt.flags as flags
@@ -110,3 +112,57 @@ class TestRedshiftAdapter(unittest.TestCase):
             password='password',
             port=5439,
             connect_timeout=10)
+
+
+class TestRedshiftBulkLoad(unittest.TestCase):
+
+    def setUp(self):
+        cursor = mock.MagicMock()
+        cursor.mogrify.side_effect = \
+            lambda sql, row: "({}, '{}')".format(*row).encode('utf-8')
+        self.cursor = cursor
+
+        patcher = mock.patch.object(RedshiftAdapter, 'get_connection')
+        get_connection = patcher.start()
+        self.addCleanup(patcher.stop)
+        get_connection.return_value = {
+            'name': 'seed',
+            'handle': mock.MagicMock(**{'cursor.return_value': cursor}),
+        }
+
+        patcher = mock.patch.object(RedshiftAdapter, 'add_query')
+        self.add_query = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_inserts_sized_by_bytes(self):
+        relation = RedshiftAdapter.Relation.create(schema='analytics',
+                                                   identifier='seed')
+        table = agate.Table([(i, 'a' * i) for i in range(1, 6)],
+                            ['id', 'name'])
+
+        with mock.patch.object(RedshiftAdapter, 'MAX_INSERT_BYTES', 75):
+            sql = RedshiftAdapter.bulk_load_csv_rows(
+                {}, {}, relation, table, 'seed')
+
+        prefix = 'insert into "analytics"."seed" (id, name) values\n'
+        self.assertEqual(sql, prefix + '(%s, %s)')
+        self.assertEqual(
+            [call[0][1] for call in self.add_query.call_args_list],
+            [prefix + "(1, 'a'),\n(2, 'aa')",
+             prefix + "(3, 'aaa'),\n(4, 'aaaa')",
+             prefix + "(5, 'aaaaa')"])
+
+    def test_bad_value_falls_back_to_inserts(self):
+        relation = RedshiftAdapter.Relation.create(schema='analytics',
+                                                   identifier='seed')
+        table = agate.Table([(i, 'a' * i) for i in range(1, 6)],
+                            ['id', 'name'])
+        self.cursor.mogrify.side_effect = [
+            b"(1, 'a')", psycopg2.ProgrammingError("can't adapt type")]
+
+        with mock.patch.object(RedshiftAdapter, 'MAX_INSERT_BYTES', 10):
+            sql = RedshiftAdapter.bulk_load_csv_rows(
+                {}, {}, relation, table, 'seed')
+
+        self.assertIsNone(sql)
+        self.assertFalse(self.add_query.called)
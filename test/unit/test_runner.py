@@ -0,0 +1,132 @@
+import mock
+import threading
+import unittest
+
+from multiprocessing.dummy import Pool as ThreadPool
+
+import dbt.runner
+from dbt.linker import Linker
+
+
+class FakeRunner(object):
+    def __init__(self, unique_id, errored=False):
+        self.node = {'unique_id': unique_id}
+        self.errored = errored
+        self.skip = False
+
+    def do_skip(self):
+        self.skip = True
+
+
+class RunManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.linker = Linker()
+        # a is slow, and only d depends on it. b -> c shouldn't wait on it.
+        self.linker.dependency('d', 'a')
+        self.linker.dependency('c', 'b')
+        self.linker.add_node('e')
+        self.linker.dependency('e', 'd')
+
+        self.manager = dbt.runner.RunManager.__new__(dbt.runner.RunManager)
+        self.manager.threads = 2
+        self.manager.handle_result = self.handle_result
+        self.manager.call_runner = self.call_runner
+
+        self.order = []
+        self.a_running = threading.Event()
+        self.c_finished = threading.Event()
+
+    def call_runner(self, data):
+        runner = data['runner']
+        unique_id = runner.node['unique_id']
+
+        if unique_id == 'a':
+            self.a_running.set()
+            self.c_finished.wait(5)
+        elif unique_id == 'b':
+            self.a_running.wait(5)
+        elif unique_id == 'c':
+            self.c_finished.set()
+
+        if not runner.skip:
+            self.order.append(unique_id)
+        return runner
+
+    def record_runner(self, data):
+        runner = data['runner']
+        self.order.append(runner.node['unique_id'])
+        return runner
+
+    def handle_result(self, linker, Runner, manifest, node_runners,
+                      node_results, result):
+        node_results.append(result)
+        if result.errored:
+            unique_id = result.node['unique_id']
+            for node_id in linker.get_dependent_nodes(unique_id):
+                node_runners[node_id].do_skip()
+        return result.node['unique_id']
+
+    def execute(self, node_runners, priorities=None):
+        levels = [[{'unique_id': n} for n in ('a', 'b')],
+                  [{'unique_id': n} for n in ('c', 'd')],
+                  [{'unique_id': 'e'}]]
+        pool = ThreadPool(self.manager.threads)
+        results = []
+        try:
+            with mock.patch('dbt.utils.is_blocking_dependency',
+                            return_value=True):
+                dependencies = self.linker.get_blocking_parents()
+            self.manager.execute_dag(pool, self.linker, FakeRunner, {},
+                                     node_runners, levels, dependencies,
+                                     results, priorities)
+        finally:
+            pool.close()
+            pool.join()
+        return results
+
+    def test__execute_dag_doesnt_wait_for_levels(self):
+        node_runners = {n: FakeRunner(n) for n in 'abcde'}
+        results = self.execute(node_runners)
+
+        self.assertEqual(len(results), 5)
+        # c finished while a was still running
+        self.assertLess(self.order.index('c'), self.order.index('a'))
+        self.assertLess(self.order.index('a'), self.order.index('d'))
+        self.assertLess(self.order.index('d'), self.order.index('e'))
+
+    def test__execute_dag_skips_children_of_errors(self):
+        node_runners = {n: FakeRunner(n) for n in 'abcde'}
+        node_runners['a'].errored = True
+        results = self.execute(node_runners)
+
+        self.assertEqual(len(results), 5)
+        self.assertTrue(node_runners['d'].skip)
+        self.assertTrue(node_runners['e'].skip)
+        self.assertFalse(node_runners['c'].skip)
+        self.assertNotIn('d', self.order)
+
+    def test__critical_path_priorities(self):
+        with mock.patch('dbt.utils.is_blocking_dependency',
+                        return_value=True):
+            dependencies = self.linker.get_blocking_parents()
+
+        priorities = dbt.runner.get_critical_path_priorities(
+            dependencies, {'a': 10, 'c': 3, 'e': 2}, 1)
+
+        self.assertEqual(priorities, {
+            'a': 10 + 1 + 2,
+            'b': 1 + 3,
+            'c': 3,
+            'd': 1 + 2,
+            'e': 2,
+        })
+
+    def test__execute_dag_starts_highest_priority_first(self):
+        self.manager.threads = 1
+        # with a single thread, a and b can't wait on each other
+        self.manager.call_runner = self.record_runner
+
+        node_runners = {n: FakeRunner(n) for n in 'abcde'}
+        self.execute(node_runners, {'a': 1, 'b': 2, 'c': 5, 'd': 4, 'e': 3})
+        self.assertEqual(self.order, ['b', 'c', 'a', 'd', 'e'])
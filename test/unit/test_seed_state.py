@@ -0,0 +1,161 @@
+import agate
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+import dbt.flags
+
+from dbt.adapters.postgres import PostgresAdapter
+from dbt.contracts.graph.parsed import ParsedNode
+from dbt.node_runners import ModelRunner, SeedRunner
+from dbt.seed_state import SeedState
+
+
+def make_seed(seed_hash='abc', column_types=None):
+    return ParsedNode(
+        name='seed',
+        resource_type='seed',
+        unique_id='seed.root.seed',
+        fqn=['root', 'seed'],
+        package_name='root',
+        root_path='/usr/src/app',
+        path='seed.csv',
+        original_file_path='data/seed.csv',
+        raw_sql='-- csv --',
+        schema='analytics',
+        alias='seed',
+        refs=[],
+        depends_on={'nodes': [], 'macros': []},
+        empty=False,
+        tags=[],
+        config={
+            'enabled': True,
+            'materialized': 'seed',
+            'post-hook': [],
+            'pre-hook': [],
+            'vars': {},
+            'quoting': {},
+            'column_types': column_types or {},
+        },
+        seed_hash=seed_hash)
+
+
+class TestSeedState(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        self.path = os.path.join(self.tempdir, 'target', 'seed_state.json')
+
+        self.profile = {'dbname': 'db', 'schema': 'analytics', 'threads': 1}
+        self.relation = PostgresAdapter.Relation.create(
+            schema='analytics', identifier='seed')
+
+    def test__round_trip(self):
+        state = SeedState.load(self.path)
+        self.assertFalse(state.is_current(self.profile, make_seed(),
+                                          self.relation))
+
+        state.record(self.profile, make_seed(), self.relation)
+        state.write()
+
+        state = SeedState.load(self.path)
+        self.assertTrue(state.is_current(self.profile, make_seed(),
+                                         self.relation))
+
+        # the thread count doesn't matter, but the rest of the target does
+        self.profile['threads'] = 4
+        self.assertTrue(state.is_current(self.profile, make_seed(),
+                                         self.relation))
+        self.assertFalse(state.is_current(dict(self.profile, dbname='prod'),
+                                          make_seed(), self.relation))
+
+    def test__changes(self):
+        state = SeedState(self.path)
+        state.record(self.profile, make_seed(), self.relation)
+
+        self.assertFalse(state.is_current(
+            self.profile, make_seed(seed_hash='def'), self.relation))
+        self.assertFalse(state.is_current(
+            self.profile, make_seed(column_types={'id': 'bigint'}),
+            self.relation))
+        self.assertFalse(state.is_current(
+            self.profile, make_seed(),
+            PostgresAdapter.Relation.create(schema='other',
+                                            identifier='seed')))
+
+        state.forget(self.profile, make_seed(), self.relation)
+        self.assertFalse(state.is_current(self.profile, make_seed(),
+                                          self.relation))
+
+
+class TestSeedRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.project = mock.MagicMock()
+        self.project.run_environment.return_value = {'dbname': 'db'}
+        self.node = make_seed()
+
+        SeedRunner.seed_state = SeedState('seed_state.json')
+        self.addCleanup(setattr, SeedRunner, 'seed_state', None)
+
+        self.adapter = mock.MagicMock(Relation=PostgresAdapter.Relation)
+        self.adapter.get_relation.return_value = \
+            PostgresAdapter.Relation.create(schema='analytics',
+                                            identifier='seed', type='table')
+
+        patcher = mock.patch.object(ModelRunner, 'materialize')
+        self.execute = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.execute.return_value = 'INSERT 2'
+
+        self.table = agate.Table([(1,), (2,)], ['id'])
+        patcher = mock.patch.object(
+            SeedRunner, 'load_agate_table',
+            side_effect=lambda model: ParsedNode(agate_table=self.table,
+                                                 **model.serialize()))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_seed(self):
+        runner = SeedRunner(self.project, self.adapter, self.node, 1, 1)
+        return runner.execute(self.node, None).status
+
+    def test__result_doesnt_keep_the_table(self):
+        runner = SeedRunner(self.project, self.adapter, self.node, 1, 1)
+        result = runner.execute(self.node, None)
+
+        self.assertIs(self.execute.call_args[0][0].agate_table, self.table)
+        self.assertIsNone(result.node.agate_table)
+        self.assertEqual(runner.num_rows, 2)
+
+    def test__skips_unchanged_seeds(self):
+        self.assertEqual(self.run_seed(), 'INSERT 2')
+        self.assertEqual(self.run_seed(), 'UP TO DATE')
+        self.assertEqual(self.execute.call_count, 1)
+
+        # the seed is loaded again if the relation is gone
+        self.adapter.get_relation.return_value = None
+        self.assertEqual(self.run_seed(), 'INSERT 2')
+
+    def test__full_refresh(self):
+        self.run_seed()
+
+        with mock.patch.object(dbt.flags, 'FULL_REFRESH', True):
+            self.assertEqual(self.run_seed(), 'INSERT 2')
+        self.assertEqual(self.execute.call_count, 2)
+
+    def test__failed_load_forgotten(self):
+        self.run_seed()
+
+        with mock.patch.object(dbt.flags, 'FULL_REFRESH', True):
+            self.execute.side_effect = RuntimeError('load failed')
+            with self.assertRaises(RuntimeError):
+                self.run_seed()
+
+        self.assertFalse(SeedRunner.seed_state.is_current(
+            {'dbname': 'db'}, self.node,
+            PostgresAdapter.Relation.create_from_node({'dbname': 'db'},
+                                                      self.node)))
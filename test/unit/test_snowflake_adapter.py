@@ -0,0 +1,70 @@
+import agate
+import mock
+import os
+import unittest
+
+import snowflake.connector.errors
+
+import dbt.flags as flags
+
+from dbt.adapters.snowflake import SnowflakeAdapter
+
+
+class TestSnowflakeBulkLoad(unittest.TestCase):
+
+    def setUp(self):
+        flags.STRICT_MODE = False
+
+        self.staged = []
+        self.cursor = mock.MagicMock()
+        self.cursor.execute.side_effect = self.execute
+
+        patcher = mock.patch.object(SnowflakeAdapter, 'get_connection')
+        get_connection = patcher.start()
+        self.addCleanup(patcher.stop)
+        get_connection.return_value = {
+            'name': 'seed',
+            'handle': mock.MagicMock(**{'cursor.return_value': self.cursor}),
+            'transaction_open': True,
+        }
+
+        self.relation = SnowflakeAdapter.Relation.create(
+            schema='analytics', identifier='seed')
+        self.table = agate.Table([(1, 'a'), (2, None)], ['id', 'name'])
+
+    def execute(self, sql):
+        if sql.startswith('put'):
+            path = sql.split("'")[1][len('file://'):]
+            with open(path, 'rb') as fp:
+                self.staged.append(fp.read())
+
+    def bulk_load(self):
+        return SnowflakeAdapter.bulk_load_csv_rows(
+            {}, {}, self.relation, self.table, 'seed')
+
+    def test_put_and_copy(self):
+        sql = self.bulk_load()
+
+        executed = [call[0][0] for call in self.cursor.execute.call_args_list]
+        self.assertEqual(len(executed), 2)
+        self.assertTrue(executed[0].startswith("put 'file://"))
+        self.assertTrue(executed[0].endswith(
+            "' @analytics.%seed auto_compress = true overwrite = true"))
+        self.assertEqual(executed[1], sql)
+        self.assertTrue(sql.startswith(
+            'copy into analytics.seed (id, name) from @analytics.%seed'))
+
+        self.assertEqual(self.staged, [b'"1","a"\n"2",\n'])
+
+        # the local file is cleaned up
+        path = executed[0].split("'")[1][len('file://'):]
+        self.assertFalse(os.path.exists(os.path.dirname(path)))
+
+    def test_copy_falls_back(self):
+        def execute(sql):
+            if sql.startswith('copy'):
+                raise snowflake.connector.errors.ProgrammingError('bad value')
+        self.cursor.execute.side_effect = execute
+
+        self.assertIsNone(self.bulk_load())
+        self.cursor.execute.assert_called_with('remove @analytics.%seed')